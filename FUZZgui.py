@@ -1,362 +1,543 @@
-import tkinter as tk
-import math
-import time  # <--- NEW IMPORT
-
-# ==========================================
-# 1. CONFIGURATION & MAP DATA
-# ==========================================
-GOAL = (200, 40)
-START_POSE = (360, 460, 3.14)
-
-OBS_COMPLEX = [
-    (0, 0, 400, 10), (0, 490, 400, 500), (0, 0, 10, 500), (390, 0, 400, 500),
-    (80, 400, 400, 410), (0, 300, 320, 310), (80, 200, 400, 210),
-    (0, 120, 150, 130), (250, 120, 400, 130),
-    (180, 410, 190, 440), (240, 250, 250, 300), (100, 150, 120, 180),
-    (200, 210, 210, 240), (80, 210, 90, 240), (150, 310, 160, 350)
-]
-
-# ==========================================
-# 2. FUZZY LOGIC BRAIN
-# ==========================================
-class FuzzyLogicBrain:
-    def __init__(self):
-        # --- INPUTS ---
-        self.d_close = [0, 0, 40]      
-        self.d_med   = [10, 40, 50]     
-        self.d_far   = [40, 100, 500] 
-
-        self.a_right    = [-3.14, -1.0, -0.1]
-        self.a_straight = [-0.3, 0.0, 0.3]
-        self.a_left     = [0.1, 1.0, 3.14]
-
-        # --- OUTPUTS ---
-        self.turn_out = {"Hard_Right": -0.8, "Soft_Right": -0.3, "Straight": 0.0, "Soft_Left": 0.3, "Hard_Left": 0.8}
-        self.speed_out = {"Stop": 0.0, "Slow": 2.0, "Medium": 4.0, "Fast": 7.0}
-
-    def trimf(self, x, params):
-        a, b, c = params
-        if x <= a or x >= c: return 0.0
-        if a < x <= b: return (x - a) / (b - a)
-        return (c - x) / (c - b)
-
-    def compute(self, sensors, goal_angle):
-        # --- 1. FUZZIFICATION ---
-        debug_data = {} 
-        
-        def get_dist_mfs(val):
-            return {
-                "C": self.trimf(val, self.d_close),
-                "M": self.trimf(val, self.d_med),
-                "F": self.trimf(val, self.d_far)
-            }
-        
-        s_mfs = []
-        for i, d in enumerate(sensors):
-            mfs = get_dist_mfs(d)
-            s_mfs.append(mfs)
-            debug_data[f"S{i}"] = {"val": d, "mfs": mfs, "type": "dist"}
-
-        g_Right = self.trimf(goal_angle, self.a_right)
-        g_Str   = self.trimf(goal_angle, self.a_straight)
-        g_Left  = self.trimf(goal_angle, self.a_left)
-        
-        debug_data["Angle"] = {
-            "val": goal_angle, 
-            "mfs": {"R": g_Right, "S": g_Str, "L": g_Left},
-            "type": "angle"
-        }
-
-        # --- 2. RULE EVALUATION ---
-        turn_rules  = {k: 0.0 for k in self.turn_out}
-        speed_rules = {k: 0.0 for k in self.speed_out}
-
-        def fire(strength, turn_action, speed_action):
-            turn_rules[turn_action]   = max(turn_rules[turn_action], strength)
-            speed_rules[speed_action] = max(speed_rules[speed_action], strength)
-
-        # RULES
-        front_danger = s_mfs[0]["C"]
-        if sensors[1] < sensors[2]: fire(front_danger, "Hard_Right", "Slow")
-        else: fire(front_danger, "Hard_Left", "Slow")
-
-        in_corridor = min(s_mfs[3]["C"], s_mfs[4]["C"])
-        fire(in_corridor, "Straight", "Medium")
-
-        fire(min(s_mfs[3]["C"], s_mfs[4]["F"]), "Soft_Right", "Medium") 
-        fire(min(s_mfs[4]["C"], s_mfs[3]["F"]), "Soft_Left", "Medium")
-
-        fire(s_mfs[1]["C"], "Soft_Right", "Slow") 
-        fire(s_mfs[2]["C"], "Soft_Left",  "Slow")
-
-        safe_front = max(s_mfs[0]["F"], s_mfs[0]["M"])
-        safe_left  = max(s_mfs[1]["F"], s_mfs[1]["M"])
-        safe_right = max(s_mfs[2]["F"], s_mfs[2]["M"])
-        is_safe = min(safe_front, safe_left, safe_right)
-        speed_level = "Fast" if min(s_mfs[0]["F"], s_mfs[1]["F"]) > 0.5 else "Medium"
-        fire(min(is_safe, g_Left),  "Soft_Left",  speed_level)
-        fire(min(is_safe, g_Right), "Soft_Right", speed_level)
-        fire(min(is_safe, g_Str),   "Straight",   speed_level)
-
-        fire(min(s_mfs[4]["C"], s_mfs[2]["C"], s_mfs[0]["M"]), "Soft_Left", "Slow")
-        fire(min(s_mfs[3]["C"], s_mfs[1]["C"], s_mfs[0]["M"]), "Soft_Right", "Slow")
-
-        # --- 3. DEFUZZIFICATION ---
-        t_num, t_den = 0.0, 0.0
-        for action, strength in turn_rules.items():
-            t_num += strength * self.turn_out[action]
-            t_den += strength
-        final_turn = t_num / t_den if t_den != 0 else 0.0
-
-        s_num, s_den = 0.0, 0.0
-        for action, strength in speed_rules.items():
-            s_num += strength * self.speed_out[action]
-            s_den += strength
-
-        final_speed = 2.0 if s_den == 0 else s_num / s_den
-        return final_speed, final_turn, debug_data
-
-# ==========================================
-# 3. GUI GRAPH HELPER
-# ==========================================
-class FuzzyGraph:
-    def __init__(self, parent, title, w=200, h=60, type="dist"):
-        self.w, self.h = w, h
-        self.type = type # 'dist' or 'angle'
-        
-        self.frame = tk.Frame(parent, bg="#f0f0f0", bd=1, relief=tk.RAISED)
-        self.frame.pack(pady=2, fill=tk.X)
-        
-        tk.Label(self.frame, text=title, font=("Arial", 8, "bold"), bg="#f0f0f0").pack(side=tk.TOP, anchor="w", padx=5)
-        
-        self.canvas = tk.Canvas(self.frame, width=w, height=h, bg="white")
-        self.canvas.pack(padx=5, pady=2)
-        
-        self.lbl_val = tk.Label(self.frame, text="Val: 0.0", font=("Consolas", 8), bg="#f0f0f0")
-        self.lbl_val.pack(side=tk.BOTTOM, anchor="e", padx=5)
-
-    def draw_bg(self, params):
-        self.canvas.delete("all")
-        self.canvas.create_line(0, self.h-10, self.w, self.h-10, fill="gray")
-        
-        if self.type == "dist":
-            def to_x(v): return (v / 150.0) * self.w
-            p_close, p_med, p_far = params
-            self.tri([0, 0, p_close[2]], "red", "C")
-            self.tri(p_med, "green", "M")
-            self.tri([p_far[0], 100, 150], "blue", "F")
-        else:
-            def to_x(v): return ((v + 3.14) / 6.28) * self.w
-            p_right, p_str, p_left = params
-            self.tri(p_right, "blue", "R", to_x)
-            self.tri(p_str, "green", "S", to_x)
-            self.tri(p_left, "red", "L", to_x)
-
-    def tri(self, pts, col, tag, mapper=None):
-        if mapper is None: mapper = lambda v: (v / 150.0) * self.w
-        x1, x2, x3 = mapper(pts[0]), mapper(pts[1]), mapper(pts[2])
-        base_y = self.h - 10
-        top_y = 10
-        self.canvas.create_polygon(x1, base_y, x2, top_y, x3, base_y, 
-                                   fill=col, outline=col, stipple="gray25", tags=tag)
-        self.canvas.create_line(x1, base_y, x2, top_y, x3, base_y, fill=col)
-
-    def update(self, val, mfs):
-        self.canvas.delete("needle")
-        
-        if self.type == "dist": pos_x = (val / 150.0) * self.w
-        else: pos_x = ((val + 3.14) / 6.28) * self.w
-            
-        self.canvas.create_line(pos_x, 0, pos_x, self.h, fill="black", width=2, tags="needle")
-        
-        txt = f"In: {val:.1f} | "
-        for k, v in mfs.items(): txt += f"{k}:{v:.2f} "
-        self.lbl_val.config(text=txt)
-        
-        self.canvas.itemconfig("C", stipple="gray25"); self.canvas.itemconfig("M", stipple="gray25")
-        self.canvas.itemconfig("F", stipple="gray25"); self.canvas.itemconfig("R", stipple="gray25")
-        self.canvas.itemconfig("S", stipple="gray25"); self.canvas.itemconfig("L", stipple="gray25")
-
-        for k, v in mfs.items():
-            if v > 0.01: self.canvas.itemconfig(k, stipple="")
-
-# ==========================================
-# 4. SIMULATION APP
-# ==========================================
-class FuzzySimApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Fuzzy Robot - Real Time Dashboard")
-        self.root.geometry("1100x700")
-
-        # --- LEFT: SIMULATION ---
-        sim_frame = tk.Frame(root)
-        sim_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        self.canvas = tk.Canvas(sim_frame, width=500, height=500, bg="white")
-        self.canvas.pack()
-        
-        btn_frame = tk.Frame(sim_frame)
-        btn_frame.pack(pady=5)
-        tk.Button(btn_frame, text="RESET", command=self.reset_robot, bg="red", fg="white", width=10).pack(side=tk.LEFT, padx=5)
-        self.btn_pause = tk.Button(btn_frame, text="STOP", command=self.toggle_pause, bg="orange", fg="black", width=10)
-        self.btn_pause.pack(side=tk.LEFT, padx=5)
-
-        # --- RIGHT: FUZZY DASHBOARD (Split Columns) ---
-        dash_frame = tk.Frame(root, bg="gray90", bd=2, relief=tk.SUNKEN)
-        dash_frame.pack(side=tk.RIGHT, fill=tk.BOTH, padx=10, pady=10)
-        
-        # Column 1: SENSORS (Distances)
-        col1 = tk.Frame(dash_frame, bg="gray90")
-        col1.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-        tk.Label(col1, text="SENSOR INPUTS", bg="gray90", font=("Arial", 10, "bold")).pack(pady=5)
-        
-        # Column 2: LOGIC & OUTPUT (Angle + Speed/Turn)
-        col2 = tk.Frame(dash_frame, bg="gray90")
-        col2.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
-        tk.Label(col2, text="LOGIC & OUTPUT", bg="gray90", font=("Arial", 10, "bold")).pack(pady=5)
-
-        # --- TIMER LABEL (NEW) ---
-        self.lbl_timer = tk.Label(col2, text="Time: 0.00s", font=("Consolas", 14, "bold"), bg="black", fg="#00FF00")
-        self.lbl_timer.pack(pady=(0, 10), fill=tk.X)
-
-        self.graphs = []
-        labels = ["Front", "Front-Left", "Front-Right", "Left", "Right"]
-        
-        self.brain = FuzzyLogicBrain()
-        
-        # Create 5 Distance Graphs in Column 1
-        for i in range(5):
-            g = FuzzyGraph(col1, labels[i], w=220, h=60, type="dist")
-            g.draw_bg([self.brain.d_close, self.brain.d_med, self.brain.d_far])
-            self.graphs.append(g)
-
-        # Create Angle Graph in Column 2 (Top)
-        angle_g = FuzzyGraph(col2, "Angle Error", w=220, h=60, type="angle")
-        angle_g.draw_bg([self.brain.a_right, self.brain.a_straight, self.brain.a_left])
-        self.graphs.append(angle_g) # Index 5 is Angle
-
-        # Create Output Bars in Column 2 (Bottom)
-        self.lbl_speed = tk.Label(col2, text="Speed: 0.0", font=("Consolas", 10, "bold"), bg="gray90")
-        self.lbl_speed.pack(pady=(15, 0))
-        self.bar_speed = tk.Canvas(col2, width=150, height=200, bg="white") # Vertical Bar
-        self.bar_speed.pack(pady=5)
-        
-        self.lbl_turn = tk.Label(col2, text="Turn: 0.0", font=("Consolas", 10, "bold"), bg="gray90")
-        self.lbl_turn.pack(pady=(15, 0))
-        self.bar_turn = tk.Canvas(col2, width=200, height=40, bg="white") # Horizontal Bar
-        self.bar_turn.pack(pady=5)
-
-        # Init Sim Items
-        self.canvas.create_oval(GOAL[0]-10, GOAL[1]-10, GOAL[0]+10, GOAL[1]+10, fill="green")
-        for i, o in enumerate(OBS_COMPLEX):
-            col = "black" if i < 4 else ("gray" if i < 9 else "red")
-            self.canvas.create_rectangle(o, fill=col)
-
-        self.poly = self.canvas.create_polygon(0, 0, 0, 0, fill="blue")
-        self.ray_lines = [self.canvas.create_line(0, 0, 0, 0, fill="red", width=1) for _ in range(5)]
-
-        self.paused = False
-        self.reset_robot()
-        self.run_loop()
-
-    def toggle_pause(self):
-        self.paused = not self.paused
-        self.btn_pause.config(text="RESUME" if self.paused else "STOP", bg="green" if self.paused else "orange")
-
-    def reset_robot(self):
-        self.state = {"x": START_POSE[0], "y": START_POSE[1], "t": START_POSE[2], "active": True}
-        self.start_time = time.time()  # <--- START TIMER
-        self.lbl_timer.config(text="Time: 0.00s")
-        self.canvas.itemconfig(self.poly, fill="blue")
-
-    def get_sensors(self, x, y, t):
-        angles = [0, 0.785, -0.785, 1.57, -1.57]
-        readings = []
-        MAX_RANGE = 150.0
-        for i, offset in enumerate(angles):
-            ray_t = t + offset
-            vx, vy = math.cos(ray_t), math.sin(ray_t)
-            closest_dist = MAX_RANGE
-            for ox1, oy1, ox2, oy2 in OBS_COMPLEX:
-                if abs(vx) > 0.0001:
-                    t1, t2 = (ox1 - x)/vx, (ox2 - x)/vx
-                    if 0 < t1 < closest_dist and oy1 <= y + t1*vy <= oy2: closest_dist = t1
-                    if 0 < t2 < closest_dist and oy1 <= y + t2*vy <= oy2: closest_dist = t2
-                if abs(vy) > 0.0001:
-                    t3, t4 = (oy1 - y)/vy, (oy2 - y)/vy
-                    if 0 < t3 < closest_dist and ox1 <= x + t3*vx <= ox2: closest_dist = t3
-                    if 0 < t4 < closest_dist and ox1 <= x + t4*vx <= ox2: closest_dist = t4
-            readings.append(closest_dist)
-            self.canvas.coords(self.ray_lines[i], x, y, x+closest_dist*vx, y+closest_dist*vy)
-        return readings
-
-    def update_outputs(self, speed, turn):
-        # Vertical Speed Bar
-        self.lbl_speed.config(text=f"Speed: {speed:.1f}")
-        self.bar_speed.delete("all")
-        h = 200
-        h_fill = (speed / 7.0) * h
-        self.bar_speed.create_rectangle(0, h-h_fill, 150, h, fill="blue")
-        
-        # Horizontal Turn Bar
-        self.lbl_turn.config(text=f"Turn: {turn:.2f}")
-        self.bar_turn.delete("all")
-        center = 100
-        w_turn = turn * 100
-        self.bar_turn.create_rectangle(center, 0, center + w_turn, 40, fill="purple")
-        self.bar_turn.create_line(center, 0, center, 40, fill="black", width=2)
-
-    def run_loop(self):
-        if self.paused:
-            self.root.after(100, self.run_loop)
-            return
-        if not self.state["active"]:
-            self.root.after(100, self.run_loop)
-            return
-
-        # UPDATE TIMER
-        elapsed = time.time() - self.start_time
-        self.lbl_timer.config(text=f"Time: {elapsed:.2f}s")
-
-        x, y, t = self.state["x"], self.state["y"], self.state["t"]
-        sensors = self.get_sensors(x, y, t)
-        dx, dy = GOAL[0] - x, GOAL[1] - y
-        goal_heading = math.atan2(dy, dx)
-        angle_err = (goal_heading - t + math.pi) % (2 * math.pi) - math.pi
-
-        speed, turn, debug_info = self.brain.compute(sensors, angle_err)
-        
-        for i in range(5): self.graphs[i].update(debug_info[f"S{i}"]["val"], debug_info[f"S{i}"]["mfs"])
-        self.graphs[5].update(debug_info["Angle"]["val"], debug_info["Angle"]["mfs"])
-        self.update_outputs(speed, turn)
-
-        new_t = t + turn
-        new_x, new_y = x + math.cos(new_t) * speed, y + math.sin(new_t) * speed
-
-        hit = False
-        for ox1, oy1, ox2, oy2 in OBS_COMPLEX:
-            if ox1 < new_x < ox2 and oy1 < new_y < oy2: hit = True; break
-
-        if hit:
-            self.state["active"] = False
-            self.canvas.itemconfig(self.poly, fill="red")
-        elif math.hypot(dx, dy) < 15:
-            self.state["active"] = False
-            self.canvas.itemconfig(self.poly, fill="green")
-        else:
-            self.state["x"], self.state["y"], self.state["t"] = new_x, new_y, new_t
-
-        r = 12
-        pts = [
-            new_x + r * math.cos(new_t), new_y + r * math.sin(new_t),
-            new_x + r * math.cos(new_t + 2.5), new_y + r * math.sin(new_t + 2.5),
-            new_x + r * math.cos(new_t - 2.5), new_y + r * math.sin(new_t - 2.5)
-        ]
-        self.canvas.coords(self.poly, *pts)
-        self.root.after(30, self.run_loop)
-
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = FuzzySimApp(root)
+import tkinter as tk
+import math
+import time
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Latest version"))
+from simCore import RobotState, SweptCollider, cast_rays, goal_angle_error
+from brainTrace import TRACE_WIDTH, SPEED, TURN, TracedBrain, angle_mfs, sensor_mfs
+from simWorker import FRAME_MS
+from realtimeLoop import EXPORT_S, HOLD, RealtimeWorker, add_realtime_arguments, fallback_command
+from paramRegistry import REGISTRY, RELOAD_MS, RegistryWatcher
+from controlSocket import ControlServer, add_control_argument, parse_count, parse_genes
+
+# ==========================================
+# 1. CONFIGURATION & MAP DATA
+# ==========================================
+GOAL = (200, 40)
+START_POSE = (360, 460, 3.14)
+
+OBS_COMPLEX = [
+    (0, 0, 400, 10), (0, 490, 400, 500), (0, 0, 10, 500), (390, 0, 400, 500),
+    (80, 400, 400, 410), (0, 300, 320, 310), (80, 200, 400, 210),
+    (0, 120, 150, 130), (250, 120, 400, 130),
+    (180, 410, 190, 440), (240, 250, 250, 300), (100, 150, 120, 180),
+    (200, 210, 210, 240), (80, 210, 90, 240), (150, 310, 160, 350)
+]
+
+SIM_MS = 30        # one robot step every SIM_MS on the worker thread
+DASHBOARD_MS = 100  # dashboard redraw period
+
+# ==========================================
+# 2. FUZZY LOGIC BRAIN
+# ==========================================
+class FuzzyLogicBrain(TracedBrain):
+    def __init__(self):
+        # --- INPUTS ---
+        self.d_close = [0, 0, 40]      
+        self.d_med   = [10, 40, 50]     
+        self.d_far   = [40, 100, 500] 
+
+        self.a_right    = [-3.14, -1.0, -0.1]
+        self.a_straight = [-0.3, 0.0, 0.3]
+        self.a_left     = [0.1, 1.0, 3.14]
+
+        # --- OUTPUTS ---
+        self.turn_out = {"Hard_Right": -0.8, "Soft_Right": -0.3, "Straight": 0.0, "Soft_Left": 0.3, "Hard_Left": 0.8}
+        self.speed_out = {"Stop": 0.0, "Slow": 2.0, "Medium": 4.0, "Fast": 7.0}
+
+    def set_params(self, genes):
+        # Trained distance memberships (close_max, med_min, med_max, far_min),
+        # shaped as in the trainer's DynamicFuzzyBrain that produced them.
+        # New lists, so a snapshot holding the old ones is unaffected.
+        c_max, m_min, m_max, f_min = genes
+        if m_min >= m_max: m_min = m_max - 1
+        self.d_close = [0, 0, c_max]
+        self.d_med   = [m_min, 40, m_max]
+        self.d_far   = [f_min, 100, 1000]
+
+    def trimf(self, x, params):
+        a, b, c = params
+        if x <= a or x >= c: return 0.0
+        if a < x <= b: return (x - a) / (b - a)
+        return (c - x) / (c - b)
+
+    def compute(self, sensors, goal_angle):
+        # --- 1. FUZZIFICATION ---
+        def get_dist_mfs(val):
+            return {
+                "C": self.trimf(val, self.d_close),
+                "M": self.trimf(val, self.d_med),
+                "F": self.trimf(val, self.d_far)
+            }
+        
+        s_mfs = [get_dist_mfs(d) for d in sensors]
+
+        g_Right = self.trimf(goal_angle, self.a_right)
+        g_Str   = self.trimf(goal_angle, self.a_straight)
+        g_Left  = self.trimf(goal_angle, self.a_left)
+
+        # --- 2. RULE EVALUATION ---
+        turn_rules  = {k: 0.0 for k in self.turn_out}
+        speed_rules = {k: 0.0 for k in self.speed_out}
+
+        def fire(strength, turn_action, speed_action):
+            turn_rules[turn_action]   = max(turn_rules[turn_action], strength)
+            speed_rules[speed_action] = max(speed_rules[speed_action], strength)
+
+        # RULES
+        front_danger = s_mfs[0]["C"]
+        if sensors[1] < sensors[2]: fire(front_danger, "Hard_Right", "Slow")
+        else: fire(front_danger, "Hard_Left", "Slow")
+
+        in_corridor = min(s_mfs[3]["C"], s_mfs[4]["C"])
+        fire(in_corridor, "Straight", "Medium")
+
+        fire(min(s_mfs[3]["C"], s_mfs[4]["F"]), "Soft_Right", "Medium") 
+        fire(min(s_mfs[4]["C"], s_mfs[3]["F"]), "Soft_Left", "Medium")
+
+        fire(s_mfs[1]["C"], "Soft_Right", "Slow") 
+        fire(s_mfs[2]["C"], "Soft_Left",  "Slow")
+
+        safe_front = max(s_mfs[0]["F"], s_mfs[0]["M"])
+        safe_left  = max(s_mfs[1]["F"], s_mfs[1]["M"])
+        safe_right = max(s_mfs[2]["F"], s_mfs[2]["M"])
+        is_safe = min(safe_front, safe_left, safe_right)
+        speed_level = "Fast" if min(s_mfs[0]["F"], s_mfs[1]["F"]) > 0.5 else "Medium"
+        fire(min(is_safe, g_Left),  "Soft_Left",  speed_level)
+        fire(min(is_safe, g_Right), "Soft_Right", speed_level)
+        fire(min(is_safe, g_Str),   "Straight",   speed_level)
+
+        fire(min(s_mfs[4]["C"], s_mfs[2]["C"], s_mfs[0]["M"]), "Soft_Left", "Slow")
+        fire(min(s_mfs[3]["C"], s_mfs[1]["C"], s_mfs[0]["M"]), "Soft_Right", "Slow")
+
+        # --- 3. DEFUZZIFICATION ---
+        t_num, t_den = 0.0, 0.0
+        for action, strength in turn_rules.items():
+            t_num += strength * self.turn_out[action]
+            t_den += strength
+        final_turn = t_num / t_den if t_den != 0 else 0.0
+
+        s_num, s_den = 0.0, 0.0
+        for action, strength in speed_rules.items():
+            s_num += strength * self.speed_out[action]
+            s_den += strength
+
+        final_speed = 2.0 if s_den == 0 else s_num / s_den
+        # Only while a dashboard is subscribed (see brainTrace)
+        if self.trace is not None:
+            self.trace.record(sensors, s_mfs, goal_angle, g_Right, g_Str, g_Left, final_speed, final_turn)
+        return final_speed, final_turn
+
+# ==========================================
+# 3. GUI GRAPH HELPER
+# ==========================================
+class FuzzyGraph:
+    def __init__(self, parent, title, w=200, h=60, type="dist"):
+        self.w, self.h = w, h
+        self.type = type # 'dist' or 'angle'
+        
+        self.frame = tk.Frame(parent, bg="#f0f0f0", bd=1, relief=tk.RAISED)
+        self.frame.pack(pady=2, fill=tk.X)
+        
+        tk.Label(self.frame, text=title, font=("Arial", 8, "bold"), bg="#f0f0f0").pack(side=tk.TOP, anchor="w", padx=5)
+        
+        self.canvas = tk.Canvas(self.frame, width=w, height=h, bg="white")
+        self.canvas.pack(padx=5, pady=2)
+        
+        self.lbl_val = tk.Label(self.frame, text="Val: 0.0", font=("Consolas", 8), bg="#f0f0f0")
+        self.lbl_val.pack(side=tk.BOTTOM, anchor="e", padx=5)
+
+    def draw_bg(self, params):
+        self.canvas.delete("all")
+        self.canvas.create_line(0, self.h-10, self.w, self.h-10, fill="gray")
+        
+        if self.type == "dist":
+            def to_x(v): return (v / 150.0) * self.w
+            p_close, p_med, p_far = params
+            self.tri([0, 0, p_close[2]], "red", "C")
+            self.tri(p_med, "green", "M")
+            self.tri([p_far[0], 100, 150], "blue", "F")
+        else:
+            def to_x(v): return ((v + 3.14) / 6.28) * self.w
+            p_right, p_str, p_left = params
+            self.tri(p_right, "blue", "R", to_x)
+            self.tri(p_str, "green", "S", to_x)
+            self.tri(p_left, "red", "L", to_x)
+
+    def tri(self, pts, col, tag, mapper=None):
+        if mapper is None: mapper = lambda v: (v / 150.0) * self.w
+        x1, x2, x3 = mapper(pts[0]), mapper(pts[1]), mapper(pts[2])
+        base_y = self.h - 10
+        top_y = 10
+        self.canvas.create_polygon(x1, base_y, x2, top_y, x3, base_y, 
+                                   fill=col, outline=col, stipple="gray25", tags=tag)
+        self.canvas.create_line(x1, base_y, x2, top_y, x3, base_y, fill=col)
+
+    def update(self, val, mfs):
+        self.canvas.delete("needle")
+        
+        if self.type == "dist": pos_x = (val / 150.0) * self.w
+        else: pos_x = ((val + 3.14) / 6.28) * self.w
+            
+        self.canvas.create_line(pos_x, 0, pos_x, self.h, fill="black", width=2, tags="needle")
+        
+        txt = f"In: {val:.1f} | "
+        for k, v in mfs.items(): txt += f"{k}:{v:.2f} "
+        self.lbl_val.config(text=txt)
+        
+        self.canvas.itemconfig("C", stipple="gray25"); self.canvas.itemconfig("M", stipple="gray25")
+        self.canvas.itemconfig("F", stipple="gray25"); self.canvas.itemconfig("R", stipple="gray25")
+        self.canvas.itemconfig("S", stipple="gray25"); self.canvas.itemconfig("L", stipple="gray25")
+
+        for k, v in mfs.items():
+            if v > 0.01: self.canvas.itemconfig(k, stipple="")
+
+# ==========================================
+# 4. SIMULATION APP
+# ==========================================
+class FuzzySimApp:
+    def __init__(self, root, nav=None, sim_ms=SIM_MS, registry=REGISTRY, control=None,
+                 budget_ms=None, overrun=HOLD, rt_metrics=None, dashboard=True):
+        self.root = root
+        self.root.title("Fuzzy Robot - Real Time Dashboard")
+        self.root.geometry("1100x700")
+
+        # --- LEFT: SIMULATION ---
+        sim_frame = tk.Frame(root)
+        sim_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        self.canvas = tk.Canvas(sim_frame, width=500, height=500, bg="white")
+        self.canvas.pack()
+        
+        btn_frame = tk.Frame(sim_frame)
+        btn_frame.pack(pady=5)
+        tk.Button(btn_frame, text="RESET", command=lambda: self.worker.call(self.reset_robot), bg="red", fg="white", width=10).pack(side=tk.LEFT, padx=5)
+        self.btn_pause = tk.Button(btn_frame, text="STOP", command=lambda: self.worker.call(self.toggle_pause), bg="orange", fg="black", width=10)
+        self.btn_pause.pack(side=tk.LEFT, padx=5)
+        self.btn_dash = tk.Button(btn_frame, text="DASHBOARD", command=self.toggle_dashboard, width=10)
+        self.btn_dash.pack(side=tk.LEFT, padx=5)
+
+        # --- RIGHT: FUZZY DASHBOARD (Split Columns) ---
+        dash_frame = tk.Frame(root, bg="gray90", bd=2, relief=tk.SUNKEN)
+        dash_frame.pack(side=tk.RIGHT, fill=tk.BOTH, padx=10, pady=10)
+        
+        # Column 1: SENSORS (Distances)
+        col1 = tk.Frame(dash_frame, bg="gray90")
+        col1.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        tk.Label(col1, text="SENSOR INPUTS", bg="gray90", font=("Arial", 10, "bold")).pack(pady=5)
+        
+        # Column 2: LOGIC & OUTPUT (Angle + Speed/Turn)
+        col2 = tk.Frame(dash_frame, bg="gray90")
+        col2.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        tk.Label(col2, text="LOGIC & OUTPUT", bg="gray90", font=("Arial", 10, "bold")).pack(pady=5)
+
+        # --- TIMER LABEL (NEW) ---
+        self.lbl_timer = tk.Label(col2, text="Time: 0.00s", font=("Consolas", 14, "bold"), bg="black", fg="#00FF00")
+        self.lbl_timer.pack(pady=(0, 10), fill=tk.X)
+        # The fuzzy views below the timer; hidden, the brain is not traced
+        col2_trace = tk.Frame(col2, bg="gray90")
+        col2_trace.pack(fill=tk.BOTH, expand=True)
+        self.dash_cols = (col1, col2_trace)
+        self.col2 = col2
+
+        self.graphs = []
+        labels = ["Front", "Front-Left", "Front-Right", "Left", "Right"]
+        
+        self.brain = FuzzyLogicBrain()
+        
+        # Create 5 Distance Graphs in Column 1
+        for i in range(5):
+            g = FuzzyGraph(col1, labels[i], w=220, h=60, type="dist")
+            g.draw_bg([self.brain.d_close, self.brain.d_med, self.brain.d_far])
+            self.graphs.append(g)
+
+        # Create Angle Graph in Column 2 (Top)
+        angle_g = FuzzyGraph(col2_trace, "Angle Error", w=220, h=60, type="angle")
+        angle_g.draw_bg([self.brain.a_right, self.brain.a_straight, self.brain.a_left])
+        self.graphs.append(angle_g) # Index 5 is Angle
+
+        # Create Output Bars in Column 2 (Bottom)
+        self.lbl_speed = tk.Label(col2_trace, text="Speed: 0.0", font=("Consolas", 10, "bold"), bg="gray90")
+        self.lbl_speed.pack(pady=(15, 0))
+        self.bar_speed = tk.Canvas(col2_trace, width=150, height=200, bg="white") # Vertical Bar
+        self.bar_speed.pack(pady=5)
+        
+        self.lbl_turn = tk.Label(col2_trace, text="Turn: 0.0", font=("Consolas", 10, "bold"), bg="gray90")
+        self.lbl_turn.pack(pady=(15, 0))
+        self.bar_turn = tk.Canvas(col2_trace, width=200, height=40, bg="white") # Horizontal Bar
+        self.bar_turn.pack(pady=5)
+
+        # Init Sim Items
+        self.collider = SweptCollider(OBS_COMPLEX)
+        self.canvas.create_oval(GOAL[0]-10, GOAL[1]-10, GOAL[0]+10, GOAL[1]+10, fill="green")
+        for i, o in enumerate(OBS_COMPLEX):
+            col = "black" if i < 4 else ("gray" if i < 9 else "red")
+            self.canvas.create_rectangle(o, fill=col)
+
+        self.poly = self.canvas.create_polygon(0, 0, 0, 0, fill="blue")
+        self.ray_lines = [self.canvas.create_line(0, 0, 0, 0, fill="red", width=1) for _ in range(5)]
+
+        self.paused = False
+        self.nav = nav  # optional navField.NavField for the goal heading
+        self.state = RobotState()
+        self.trace = None  # TraceRing while the dashboard is open (see set_tracing)
+        self.params_version = None  # "v3" (registry entry) or "socket"; None = the built-in memberships
+        self.step_budget = 0  # steps still to run while paused (control socket "step")
+        self.reset_robot()
+
+        # Physics and inference run on a worker thread; Tk only draws snapshots.
+        # Each step is a control cycle with a deadline (realtimeLoop.py).
+        self.view = None
+        self.drawn = {}
+        self.drawn_seq = -1
+        budget = budget_ms / 1000.0 if budget_ms else None
+        self.worker = RealtimeWorker(self.step, self.snapshot, sim_ms / 1000.0, budget, overrun)
+        self.dashboard = True
+        if dashboard: self.set_tracing(True)
+        else: self.toggle_dashboard()
+        self.worker.start()  # after the assignment: step() uses self.worker
+        self.poll()
+        self.draw_dashboard()
+
+        # Parameters published while the app runs replace the built-in ones
+        self.watcher = RegistryWatcher(registry) if registry else None
+        if self.watcher is not None: self.check_params()
+        # Optional JSON commands from other processes (controlSocket.py)
+        self.control = ControlServer(self.worker, self.control_commands(), control).start() if control else None
+        self.rt_metrics = rt_metrics
+        if rt_metrics: self.export_metrics()
+
+    # --- Worker thread: simulation ---
+    def set_tracing(self, on):
+        # The brain records into a ring only while the dashboard reads it
+        if on: self.trace = self.brain.subscribe()
+        else:
+            self.brain.unsubscribe()
+            self.trace = None
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def apply_params(self, genes, version):
+        # Runs between two steps; the robot carries on with the new brain
+        self.brain.set_params(genes)
+        self.params_version = version
+
+    def control_commands(self):
+        def params(msg):
+            self.apply_params(parse_genes(msg), "socket")
+            return {"genes": self.brain_genes()}
+        def pause(msg):
+            self.paused = True
+            return {"paused": True}
+        def resume(msg):
+            self.paused, self.step_budget = False, 0
+            return {"paused": False}
+        def step(msg):
+            self.paused, self.step_budget = True, parse_count(msg)
+            return {"paused": True, "pending": self.step_budget}
+        def reset(msg):
+            self.reset_robot()
+            return {}
+        return {"params": params, "pause": pause, "resume": resume, "step": step, "reset": reset,
+                "metrics": lambda msg: self.metrics()}
+
+    def brain_genes(self):
+        b = self.brain
+        return [b.d_close[2], b.d_med[0], b.d_med[2], b.d_far[0]]
+
+    def metrics(self):
+        state = self.state
+        return {"status": state.status, "steps": state.steps, "elapsed": round(self.elapsed, 3),
+                "pose": [state.x, state.y, state.t], "path_len": state.path_len, "smoothness": state.smoothness,
+                "paused": self.paused, "pending": self.step_budget, "params": self.params_version,
+                "genes": self.brain_genes(), "sim_ms": self.worker.period * 1000, "worker_steps": self.worker.steps,
+                "dropped_frames": self.worker.dropped, "fallback": self.worker.use_fallback(), **self.worker.counters()}
+
+    def reset_robot(self):
+        self.state.reset(*START_POSE)
+        self.start_time = time.time()  # <--- START TIMER
+        self.elapsed = 0.0
+        self.pose = None  # where the robot is drawn (also a refused move's target, as before)
+        self.rays = None
+
+    def get_sensors(self, x, y, t):
+        # OBS_COMPLEX is read at call time: --map rebinds it
+        return cast_rays(x, y, t, OBS_COMPLEX)
+
+    def step(self):
+        if not self.state.active: return False
+        if self.paused:
+            if not self.step_budget: return False
+            self.step_budget -= 1
+
+        # UPDATE TIMER
+        self.elapsed = time.time() - self.start_time
+
+        state, w = self.state, self.worker
+        x, y, t = state.x, state.y, state.t
+        with w.phase("sense"):
+            sensors = self.get_sensors(x, y, t)
+            angle_err, goal_dist = goal_angle_error(x, y, t, GOAL, self.nav)
+
+        with w.phase("compute"):
+            if w.use_fallback(): command = fallback_command(sensors, angle_err)
+            else: command = self.brain.compute(sensors, angle_err)
+        command = w.resolve(command)  # past the cycle's deadline, the overrun policy decides
+        self.rays = (x, y, t, sensors)
+        if command is not None:
+            with w.phase("act"): self.act(x, y, t, command, goal_dist)
+        return True
+
+    def act(self, x, y, t, command, goal_dist):
+        state = self.state
+        speed, turn = command
+        new_t = t + turn
+        new_x, new_y = x + math.cos(new_t) * speed, y + math.sin(new_t) * speed
+
+        hit = self.collider.time_of_impact(x, y, new_x, new_y) is not None
+
+        if hit:
+            state.status = "COLLISION"
+        elif goal_dist < 15:
+            state.status = "GOAL"
+        else:
+            state.x, state.y, state.t = new_x, new_y, new_t
+            state.steps += 1
+            state.path_len += speed
+            state.smoothness += abs(turn)
+
+        self.pose = (new_x, new_y, new_t)
+
+    def snapshot(self):
+        record, seq = None, -1
+        if self.trace is not None:
+            record = [0.0] * TRACE_WIDTH
+            seq = self.trace.latest(record)
+        brain = self.brain
+        return {"pose": self.pose, "rays": self.rays, "status": self.state.status, "paused": self.paused,
+                "elapsed": self.elapsed, "trace": record, "seq": seq,
+                "params": (self.params_version, brain.d_close, brain.d_med, brain.d_far)}
+
+    # --- Tk thread: drawing ---
+    def toggle_dashboard(self):
+        # Hiding the fuzzy views also stops tracing; the timer stays
+        self.dashboard = not self.dashboard
+        col1, col2_trace = self.dash_cols
+        if self.dashboard:
+            col1.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5, before=self.col2)
+            col2_trace.pack(fill=tk.BOTH, expand=True)
+            self.drawn_seq = -1  # a new ring counts from 0 again
+        else:
+            col1.pack_forget()
+            col2_trace.pack_forget()
+        self.worker.call(self.set_tracing, self.dashboard)
+
+    def export_metrics(self):
+        self.worker.export(self.rt_metrics, "FUZZgui")
+        self.root.after(int(EXPORT_S * 1000), self.export_metrics)
+
+    def check_params(self):
+        entry = self.watcher.poll()
+        if entry is not None: self.worker.call(self.apply_params, entry["genes"], f"v{entry['id']}")
+        self.root.after(RELOAD_MS, self.check_params)
+
+    def poll(self):
+        view = self.worker.latest()
+        if view is not None:
+            self.view = view
+            self.draw(view)
+        self.root.after(FRAME_MS, self.poll)
+
+    def changed(self, key, value):
+        # Skips Tk calls for values already on screen
+        if self.drawn.get(key) == value: return False
+        self.drawn[key] = value
+        return True
+
+    def draw(self, view):
+        if self.changed("elapsed", view["elapsed"]):
+            self.lbl_timer.config(text=f"Time: {view['elapsed']:.2f}s")
+        if self.changed("status", view["status"]):
+            self.canvas.itemconfig(self.poly, fill={"COLLISION": "red", "GOAL": "green"}.get(view["status"], "blue"))
+        version, *memberships = view["params"]
+        if self.changed("params", version) and version:
+            # Only the membership plots change
+            for g in self.graphs[:5]: g.draw_bg(memberships)
+            self.drawn_seq = -1  # draw_bg cleared the needles
+            self.root.title(f"Fuzzy Robot - Real Time Dashboard (parameters {version})")
+        if self.changed("paused", view["paused"]):
+            self.btn_pause.config(text="RESUME" if view["paused"] else "STOP", bg="green" if view["paused"] else "orange")
+
+        if view["rays"] is not None:
+            x, y, t, readings = view["rays"]
+            for i, (offset, closest) in enumerate(zip((0, 0.785, -0.785, 1.57, -1.57), readings)):
+                ray_t = t + offset
+                self.canvas.coords(self.ray_lines[i], x, y, x+closest*math.cos(ray_t), y+closest*math.sin(ray_t))
+        if view["pose"] is not None:
+            new_x, new_y, new_t = view["pose"]
+            r = 12
+            pts = [
+                new_x + r * math.cos(new_t), new_y + r * math.sin(new_t),
+                new_x + r * math.cos(new_t + 2.5), new_y + r * math.sin(new_t + 2.5),
+                new_x + r * math.cos(new_t - 2.5), new_y + r * math.sin(new_t - 2.5)
+            ]
+            self.canvas.coords(self.poly, *pts)
+
+    def update_outputs(self, speed, turn):
+        # Vertical Speed Bar
+        self.lbl_speed.config(text=f"Speed: {speed:.1f}")
+        self.bar_speed.delete("all")
+        h = 200
+        h_fill = (speed / 7.0) * h
+        self.bar_speed.create_rectangle(0, h-h_fill, 150, h, fill="blue")
+        
+        # Horizontal Turn Bar
+        self.lbl_turn.config(text=f"Turn: {turn:.2f}")
+        self.bar_turn.delete("all")
+        center = 100
+        w_turn = turn * 100
+        self.bar_turn.create_rectangle(center, 0, center + w_turn, 40, fill="purple")
+        self.bar_turn.create_line(center, 0, center, 40, fill="black", width=2)
+
+    def draw_dashboard(self):
+        # Newest traced step only; nothing to redraw while paused or finished
+        view = self.view
+        if view is not None and view["seq"] >= 0 and view["seq"] != self.drawn_seq:
+            self.drawn_seq = view["seq"]
+            rec = view["trace"]
+            for i in range(5): self.graphs[i].update(*sensor_mfs(rec, i))
+            self.graphs[5].update(*angle_mfs(rec))
+            self.update_outputs(rec[SPEED], rec[TURN])
+        self.root.after(DASHBOARD_MS, self.draw_dashboard)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fuzzy logic robot visualiser")
+    parser.add_argument("--map", help="map file (JSON, see Latest version/mapFile.py) instead of the built-in map")
+    parser.add_argument("--nav", action="store_true", help="steer by a wavefront navigation field (Latest version/navField.py)")
+    parser.add_argument("--sim-ms", type=float, default=SIM_MS, help="ms per robot step (0 = as fast as possible)")
+    parser.add_argument("--registry", default=REGISTRY, help="parameter registry to watch (Latest version/paramRegistry.py); '' to disable")
+    add_control_argument(parser)
+    add_realtime_arguments(parser)
+    parser.add_argument("--no-dashboard", action="store_true", help="start with the fuzzy dashboard hidden (no tracing)")
+    args = parser.parse_args()
+
+    if args.map:
+        # Rebinds the module-level map the app reads
+        from mapFile import load_map
+        game_map = load_map(args.map)
+        OBS_COMPLEX, START_POSE, GOAL = game_map.obstacles, game_map.start, game_map.goal
+
+    nav = None
+    if args.nav:
+        from navField import nav_field
+        nav = nav_field(OBS_COMPLEX, GOAL)
+
+    root = tk.Tk()
+    app = FuzzySimApp(root, nav, args.sim_ms, args.registry, args.control, args.budget_ms, args.overrun, args.rt_metrics,
+                      not args.no_dashboard)
+    if args.map: app.canvas.config(width=max(500, game_map.size[0]), height=max(500, game_map.size[1]))
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,90 @@
+import math
+import time
+import random
+import argparse
+
+from simCore import IncrementalSensor, cast_rays
+from lidar import Lidar, SectorLidar
+from trainFuzzyGA import OBS_COMPLEX, START_POSE
+
+# ==========================================
+# SENSOR BENCHMARKS
+# ==========================================
+# Replays a wandering trajectory and compares per-step sensing cost of the
+# full cast against the incremental sensor and the batched N-ray lidar,
+# checking readings are identical where they should be.
+
+
+def clutter_map(size, count, seed=0):
+    rng = random.Random(seed)
+    obs = [(0, 0, size, 10), (0, size - 10, size, size), (0, 0, 10, size), (size - 10, 0, size, size)]
+    for _ in range(count):
+        x, y = rng.uniform(20, size - 40), rng.uniform(20, size - 40)
+        w, h = rng.uniform(5, 30), rng.uniform(5, 30)
+        obs.append((x, y, x + w, y + h))
+    return obs
+
+
+def wander(start, size, steps, seed=1):
+    # Smooth random walk that bounces off the arena edges (ignores obstacles)
+    rng = random.Random(seed)
+    x, y, t = start
+    poses = []
+    for _ in range(steps):
+        t += rng.uniform(-0.3, 0.3)
+        x, y = x + math.cos(t) * 6, y + math.sin(t) * 6
+        if not 20 < x < size - 20 or not 20 < y < size - 20:
+            t += math.pi
+            x, y = min(max(x, 21), size - 21), min(max(y, 21), size - 21)
+        poses.append((x, y, t))
+    return poses
+
+
+def bench_incremental(obstacles, poses):
+    t0 = time.perf_counter()
+    full = [cast_rays(x, y, t, obstacles) for x, y, t in poses]
+    t_full = time.perf_counter() - t0
+
+    sensor = IncrementalSensor(obstacles)
+    t0 = time.perf_counter()
+    inc = [sensor.sense(x, y, t) for x, y, t in poses]
+    t_inc = time.perf_counter() - t0
+
+    mismatches = sum(a != b for a, b in zip(full, inc))
+    n = len(poses)
+    print(f"  {len(obstacles):>6} obstacles | full {t_full / n * 1e6:8.1f} us/step | incremental {t_inc / n * 1e6:8.1f} us/step"
+          f" | speedup x{t_full / t_inc:5.2f} | rebuilds {sensor.rebuilds} | mismatches {mismatches}")
+
+
+def bench_lidar(obstacles, poses, ray_counts=(5, 16, 64, 256)):
+    t0 = time.perf_counter()
+    ref = [cast_rays(x, y, t, obstacles) for x, y, t in poses]
+    t_ref = (time.perf_counter() - t0) / len(poses)
+    print(f"  {len(obstacles):>6} obstacles | 5-ray Python loop {t_ref * 1e6:8.1f} us/step")
+
+    # The default 5-angle layout must match the Python cast exactly
+    five = SectorLidar(obstacles, Lidar(obstacles))
+    mismatches = sum(five.sense(x, y, t) != r for (x, y, t), r in zip(poses, ref))
+    print(f"  {'':>6}             5-ray lidar layout mismatches: {mismatches}")
+
+    for n in ray_counts:
+        sensor = SectorLidar(obstacles, n_rays=n)
+        t0 = time.perf_counter()
+        for x, y, t in poses: sensor.sense(x, y, t)
+        dt = (time.perf_counter() - t0) / len(poses)
+        print(f"  {'':>6}             {n:>4}-ray lidar + sector reduce {dt * 1e6:8.1f} us/step (x{dt / t_ref:4.2f})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sensor model benchmarks")
+    parser.add_argument("--steps", type=int, default=2000)
+    args = parser.parse_args()
+
+    print("Incremental sensing:")
+    bench_incremental(OBS_COMPLEX, wander(START_POSE, 400, args.steps))
+    for size, count in ((1000, 500), (2000, 2000), (4000, 8000)):
+        bench_incremental(clutter_map(size, count), wander((size / 2, size / 2, 0.0), size, args.steps))
+
+    print("\nBatched N-ray lidar:")
+    bench_lidar(OBS_COMPLEX, wander(START_POSE, 400, args.steps))
+    bench_lidar(clutter_map(2000, 2000), wander((1000, 1000, 0.0), 2000, args.steps // 4))
\ No newline at end of file
@@ -0,0 +1,80 @@
+from array import array
+
+# ==========================================
+# OPT-IN BRAIN TRACING
+# ==========================================
+# A brain traces only while something is subscribed: compute() checks
+# `self.trace is not None` once and otherwise allocates nothing extra.
+# Subscribers pass a TraceRing, a preallocated block of floats holding the
+# last `capacity` records; compute() writes each record in place and the GUI
+# reads the newest one whenever it redraws, at its own frame rate.
+#
+# Record layout (TRACE_WIDTH floats):
+#   sensor i (0..4) at SENSOR_FIELDS * i: value, Close, Medium, Far
+#   ANGLE: goal angle, Right, Straight, Left
+#   SPEED, TURN: defuzzified outputs
+
+SENSOR_FIELDS = 4
+ANGLE = 5 * SENSOR_FIELDS
+SPEED = ANGLE + 4
+TURN = SPEED + 1
+TRACE_WIDTH = TURN + 1
+
+
+class TraceRing:
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.buf = array("d", bytes(8 * TRACE_WIDTH * capacity))
+        self.written = 0  # records ever written; the newest is written - 1
+
+    def record(self, sensors, s_mfs, goal_angle, g_right, g_str, g_left, speed, turn):
+        buf = self.buf
+        base = (self.written % self.capacity) * TRACE_WIDTH
+        for i in range(5):
+            mfs = s_mfs[i]
+            j = base + SENSOR_FIELDS * i
+            buf[j] = sensors[i]
+            buf[j + 1] = mfs["C"]
+            buf[j + 2] = mfs["M"]
+            buf[j + 3] = mfs["F"]
+        j = base + ANGLE
+        buf[j] = goal_angle
+        buf[j + 1] = g_right
+        buf[j + 2] = g_str
+        buf[j + 3] = g_left
+        buf[base + SPEED] = speed
+        buf[base + TURN] = turn
+        self.written += 1
+
+    def latest(self, out):
+        # Copy the newest record into out (a list of TRACE_WIDTH floats);
+        # returns its sequence number, or -1 if nothing was recorded yet
+        seq = self.written - 1
+        if seq < 0: return -1
+        base = (seq % self.capacity) * TRACE_WIDTH
+        out[:] = self.buf[base:base + TRACE_WIDTH]
+        return seq
+
+    def clear(self):
+        self.written = 0
+
+
+class TracedBrain:
+    # Mixin for the fuzzy brains: subscribe(ring) turns tracing on
+    trace = None
+
+    def subscribe(self, ring=None):
+        self.trace = ring if ring is not None else TraceRing()
+        return self.trace
+
+    def unsubscribe(self):
+        self.trace = None
+
+
+def sensor_mfs(record, i):
+    j = SENSOR_FIELDS * i
+    return record[j], {"C": record[j + 1], "M": record[j + 2], "F": record[j + 3]}
+
+
+def angle_mfs(record):
+    return record[ANGLE], {"R": record[ANGLE + 1], "S": record[ANGLE + 2], "L": record[ANGLE + 3]}
\ No newline at end of file
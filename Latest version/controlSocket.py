@@ -0,0 +1,129 @@
+import json
+import socket
+import argparse
+import threading
+import socketserver
+
+# ==========================================
+# LOCAL CONTROL PLANE
+# ==========================================
+# A running FuzzySimApp or ComparisonApp can be driven from another process
+# over a localhost TCP socket, one JSON object per line each way:
+#
+#   -> {"cmd": "pause"}
+#   <- {"ok": true, "paused": true}
+#   -> {"cmd": "params", "genes": [33, 12, 55, 45]}
+#   -> {"cmd": "step", "n": 10}
+#   -> {"cmd": "map", "name": "random"}           (ComparisonApp)
+#   -> {"cmd": "speed", "sim_ms": 5}
+#   -> {"cmd": "metrics"}
+#   <- {"ok": false, "error": "unknown command 'foo'"}
+#
+# Each app lists its commands in control_commands(); every handler runs on the
+# simulation worker through SimWorker.request(), i.e. between two steps, so a
+# command waits at most one step period (or the worker's idle wait) before it
+# is applied. A command the worker has not started within REPLY_TIMEOUT is
+# withdrawn and reported as an error, never applied late. Only 127.0.0.1 is bound.
+
+CONTROL_HOST = "127.0.0.1"
+CONTROL_PORT = 8765
+REPLY_TIMEOUT = 2.0   # s to wait for the simulation worker
+
+
+class ControlError(ValueError):
+    pass
+
+
+def parse_genes(msg):
+    genes = msg.get("genes")
+    if not isinstance(genes, list) or len(genes) != 4:
+        raise ControlError("'genes' must be a list of 4 numbers (close_max, med_min, med_max, far_min)")
+    try:
+        return [float(g) for g in genes]
+    except (TypeError, ValueError):
+        raise ControlError("'genes' must be a list of 4 numbers") from None
+
+
+def parse_count(msg, key="n", default=1):
+    n = msg.get(key, default)
+    if not isinstance(n, int) or isinstance(n, bool) or n < 0: raise ControlError(f"'{key}' must be a non-negative integer")
+    return n
+
+
+class ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip(): continue
+            reply = self.server.dispatch(line)
+            self.wfile.write((json.dumps(reply) + "\n").encode())
+
+
+class ControlServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, worker, commands, port=CONTROL_PORT, host=CONTROL_HOST):
+        # commands: {name: fn(msg) -> dict}, run on the worker thread
+        self.worker = worker
+        self.commands = dict(commands, speed=self.set_speed)
+        super().__init__((host, port), ControlHandler)
+        self.thread = threading.Thread(target=self.serve_forever, name="control-socket", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        host, port = self.server_address
+        print(f"Control socket listening on {host}:{port}")
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def set_speed(self, msg):
+        sim_ms = msg.get("sim_ms")
+        if not isinstance(sim_ms, (int, float)) or isinstance(sim_ms, bool) or sim_ms < 0:
+            raise ControlError("'sim_ms' must be a non-negative number")
+        self.worker.period = sim_ms / 1000.0
+        return {"sim_ms": sim_ms}
+
+    def dispatch(self, line):
+        try:
+            msg = json.loads(line)
+            if not isinstance(msg, dict): raise ControlError("expected a JSON object")
+            fn = self.commands.get(msg.get("cmd"))
+            if fn is None:
+                raise ControlError(f"unknown command {msg.get('cmd')!r}; known: {', '.join(sorted(self.commands))}")
+            return {"ok": True, **(self.worker.request(fn, msg, timeout=REPLY_TIMEOUT) or {})}
+        except (ValueError, KeyError, TypeError, TimeoutError) as e:  # JSONDecodeError, ControlError are ValueErrors
+            return {"ok": False, "error": str(e)}
+        except Exception as e:  # a failing handler must not take the connection down
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+def add_control_argument(parser):
+    parser.add_argument("--control", type=int, nargs="?", const=CONTROL_PORT, metavar="PORT",
+                        help=f"accept JSON commands on localhost (default port {CONTROL_PORT}, see controlSocket.py)")
+
+
+def send(msg, port=CONTROL_PORT, host=CONTROL_HOST, timeout=5.0):
+    with socket.create_connection((host, port), timeout=timeout) as sock, sock.makefile("rwb") as f:
+        f.write((json.dumps(msg) + "\n").encode())
+        f.flush()
+        return json.loads(f.readline())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send one command to a running app's control socket",
+                                     epilog="e.g. pause | step n=10 | params genes=[33,12,55,45] | speed sim_ms=5 | map name=random | metrics")
+    parser.add_argument("cmd")
+    parser.add_argument("args", nargs="*", metavar="KEY=VALUE", help="values are JSON (strings may be bare)")
+    parser.add_argument("--port", type=int, default=CONTROL_PORT)
+    args = parser.parse_args()
+
+    msg = {"cmd": args.cmd}
+    for arg in args.args:
+        key, sep, value = arg.partition("=")
+        if not sep: raise SystemExit(f"expected KEY=VALUE, got {arg!r}")
+        try: msg[key] = json.loads(value)
+        except ValueError: msg[key] = value
+    print(json.dumps(send(msg, args.port), indent=1))
\ No newline at end of file
@@ -0,0 +1,319 @@
+import json
+import time
+import uuid
+import socket
+import argparse
+import threading
+import collections
+import multiprocessing as mp
+
+from simCore import ObstacleWorld, run_episode
+from trainFuzzyGA import DynamicFuzzyBrain, random_genes, breed_population, OBS_COMPLEX, GOAL, START_POSE, MAX_STEPS, POP_SIZE
+
+# ==========================================
+# 1. PROTOCOL
+# ==========================================
+# Newline-delimited JSON over TCP.
+#
+#   worker      -> coordinator  {"type": "hello", "name": str}
+#   coordinator -> worker       {"type": "welcome", "obstacles", "goal", "scenarios", "max_steps"}
+#   coordinator -> worker       {"type": "jobs", "jobs": [{"id", "genes", "scenario"}, ...]}
+#   worker      -> coordinator  {"type": "result", "id", "fitness", "status", "steps", "smoothness", "path_len"}
+#   worker      -> coordinator  {"type": "ready"}        (batch finished, send more)
+#   worker      -> coordinator  {"type": "heartbeat"}    (every HEARTBEAT_INTERVAL s)
+#
+# A worker that goes silent for HEARTBEAT_TIMEOUT s, or whose socket closes,
+# is dropped and its unfinished jobs go back to the front of the queue. So is
+# the old connection of a worker that says hello again under the same name.
+
+HEARTBEAT_INTERVAL = 1.0
+HEARTBEAT_TIMEOUT = 5.0
+BATCH_SIZE = 4
+NO_WORKER_TIMEOUT = 30.0  # s without any worker before wait() gives up
+
+
+def send_msg(sock, msg, lock=None):
+    data = (json.dumps(msg) + "\n").encode()
+    if lock is None: sock.sendall(data)
+    else:
+        with lock: sock.sendall(data)
+
+
+def read_msgs(sock):
+    buf = b""
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk: return
+        buf += chunk
+        while b"\n" in buf:
+            line, buf = buf.split(b"\n", 1)
+            if line: yield json.loads(line)
+
+# ==========================================
+# 2. COORDINATOR
+# ==========================================
+class Coordinator:
+    def __init__(self, host="127.0.0.1", port=0, obstacles=OBS_COMPLEX, goal=GOAL,
+                 scenarios=(START_POSE,), max_steps=MAX_STEPS, batch_size=BATCH_SIZE):
+        self.world_msg = {"type": "welcome", "obstacles": [list(o) for o in obstacles], "goal": list(goal),
+                          "scenarios": [list(s) for s in scenarios], "max_steps": max_steps}
+        self.batch_size = batch_size
+
+        self.lock = threading.Condition()
+        self.pending = collections.deque()   # jobs waiting for a worker
+        self.assigned = {}                   # worker name -> {job id: job}
+        self.idle = set()                    # workers waiting for jobs
+        self.socks = {}
+        self.send_locks = {}
+        self.last_seen = {}
+        self.results = {}
+        self.next_id = 0
+        self.requeued = 0
+        self.running = True
+
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.server.listen()
+        self.address = self.server.getsockname()
+
+        threading.Thread(target=self.accept_loop, daemon=True).start()
+        threading.Thread(target=self.reaper_loop, daemon=True).start()
+
+    # --- Networking ---
+    def accept_loop(self):
+        while self.running:
+            try: conn, _ = self.server.accept()
+            except OSError: return
+            threading.Thread(target=self.handle_worker, args=(conn,), daemon=True).start()
+
+    def handle_worker(self, conn):
+        name = None
+        try:
+            for msg in read_msgs(conn):
+                kind = msg["type"]
+                if kind == "hello":
+                    name = msg["name"]
+                    self.drop_worker(name, "reconnected")
+                    with self.lock:
+                        self.socks[name] = conn
+                        send_lock = self.send_locks[name] = threading.Lock()
+                        self.assigned[name] = {}
+                        self.last_seen[name] = time.monotonic()
+                    # Not send_locks[name]: the worker may already be dropped again
+                    send_msg(conn, self.world_msg, send_lock)
+                    self.dispatch(name)
+                    continue
+                if name is None: continue
+
+                with self.lock:
+                    if self.socks.get(name) is not conn: break  # declared dead, or replaced
+                    self.last_seen[name] = time.monotonic()
+                    if kind == "result":
+                        job = self.assigned[name].pop(msg["id"], None)
+                        if job is not None and msg["id"] not in self.results:
+                            self.results[msg["id"]] = msg
+                            self.lock.notify_all()
+                if kind == "ready": self.dispatch(name)
+        except (OSError, ValueError):
+            pass
+        if name is not None: self.drop_worker(name, "disconnected", conn)
+
+    def dispatch(self, name):
+        with self.lock:
+            if name not in self.socks: return
+            if not self.pending:
+                self.idle.add(name)
+                return
+            self.idle.discard(name)
+            batch = [self.pending.popleft() for _ in range(min(self.batch_size, len(self.pending)))]
+            for job in batch: self.assigned[name][job["id"]] = job
+            sock, lock = self.socks[name], self.send_locks[name]
+        try:
+            send_msg(sock, {"type": "jobs", "jobs": batch}, lock)
+        except OSError:
+            self.drop_worker(name, "send failed")
+
+    def drop_worker(self, name, reason, conn=None):
+        # conn: only drop the worker if this is still its connection
+        with self.lock:
+            sock = self.socks.get(name)
+            if sock is None or (conn is not None and sock is not conn): return
+            del self.socks[name]
+            jobs = self.assigned.pop(name, {})
+            self.idle.discard(name)
+            self.last_seen.pop(name, None)
+            self.send_locks.pop(name, None)
+            # Requeue at the front so a stalled generation finishes first
+            for job in reversed(list(jobs.values())):
+                if job["id"] not in self.results: self.pending.appendleft(job)
+            self.requeued += len(jobs)
+            idle = list(self.idle)
+        if jobs: print(f"[coordinator] worker {name} {reason}, requeued {len(jobs)} job(s)")
+        try: sock.close()
+        except OSError: pass
+        for other in idle: self.dispatch(other)
+
+    def reaper_loop(self):
+        while self.running:
+            time.sleep(HEARTBEAT_INTERVAL)
+            now = time.monotonic()
+            with self.lock:
+                dead = [n for n, seen in self.last_seen.items() if now - seen > HEARTBEAT_TIMEOUT]
+            for name in dead: self.drop_worker(name, "missed heartbeat")
+
+    # --- Job API ---
+    def submit(self, genes, scenario):
+        with self.lock:
+            job = {"id": self.next_id, "genes": list(genes), "scenario": scenario}
+            self.next_id += 1
+            self.pending.append(job)
+            idle = list(self.idle)
+        for name in idle: self.dispatch(name)
+        return job["id"]
+
+    def wait(self, job_ids, timeout=None):
+        # Raises TimeoutError after timeout s, or once no worker has been
+        # connected for NO_WORKER_TIMEOUT s (the jobs stay queued)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        alone_since = None
+        with self.lock:
+            while not all(j in self.results for j in job_ids):
+                now = time.monotonic()
+                if deadline is not None and now >= deadline: raise TimeoutError("evaluation timed out")
+                if self.socks: alone_since = None
+                elif alone_since is None: alone_since = now
+                elif now - alone_since > NO_WORKER_TIMEOUT:
+                    raise TimeoutError(f"no worker connected for {NO_WORKER_TIMEOUT:g}s")
+                self.lock.wait(HEARTBEAT_INTERVAL if deadline is None else min(HEARTBEAT_INTERVAL, deadline - now))
+            return [self.results.pop(j) for j in job_ids]
+
+    def evaluate(self, population, scenario_ids=(0,), timeout=None):
+        # Mean fitness per individual over the given scenarios
+        ids = [[self.submit(genes, s) for s in scenario_ids] for genes in population]
+        flat = self.wait([j for row in ids for j in row], timeout)
+        it = iter(flat)
+        return [sum(next(it)["fitness"] for _ in row) / len(row) for row in ids]
+
+    def worker_count(self):
+        with self.lock: return len(self.socks)
+
+    def close(self):
+        self.running = False
+        self.server.close()
+        with self.lock: names = list(self.socks)
+        for name in names: self.drop_worker(name, "shutdown")
+
+# ==========================================
+# 3. WORKER
+# ==========================================
+def run_worker(host, port, name=None):
+    name = name or f"{socket.gethostname()}-{mp.current_process().pid}"
+    sock = socket.create_connection((host, port))
+    lock = threading.Lock()
+    alive = threading.Event()
+    alive.set()
+
+    def heartbeat():
+        while alive.is_set():
+            try: send_msg(sock, {"type": "heartbeat"}, lock)
+            except OSError: return
+            time.sleep(HEARTBEAT_INTERVAL)
+
+    send_msg(sock, {"type": "hello", "name": name}, lock)
+    threading.Thread(target=heartbeat, daemon=True).start()
+
+    world, config = None, None
+    try:
+        for msg in read_msgs(sock):
+            if msg["type"] == "welcome":
+                config = msg
+                world = ObstacleWorld([tuple(o) for o in msg["obstacles"]])
+            elif msg["type"] == "jobs":
+                for job in msg["jobs"]:
+                    start = tuple(config["scenarios"][job["scenario"]])
+                    res = run_episode(DynamicFuzzyBrain(job["genes"]), world, start, tuple(config["goal"]), config["max_steps"])
+                    send_msg(sock, {"type": "result", "id": job["id"], "fitness": res["fitness"], "status": res["status"],
+                                    "steps": res["steps"], "smoothness": res["smoothness"], "path_len": res["path_len"]}, lock)
+                send_msg(sock, {"type": "ready"}, lock)
+    except OSError:
+        pass
+    finally:
+        alive.clear()
+        sock.close()
+
+
+def spawn_local_workers(address, count):
+    procs = []
+    for i in range(count):
+        name = f"local-{i}-{uuid.uuid4().hex[:8]}"  # unique across coordinators and restarts
+        p = mp.Process(target=run_worker, args=(address[0], address[1], name), daemon=True)
+        p.start()
+        procs.append(p)
+    return procs
+
+
+def self_test(jobs=200, timeout=120.0):
+    # Localhost check of the requeue path: a coordinator and two worker
+    # processes, one killed while it holds jobs. Every job must still come
+    # back, with the fitness a local run_episode gives.
+    coord = Coordinator(batch_size=2)
+    procs = spawn_local_workers(coord.address, 2)
+    try:
+        deadline = time.monotonic() + timeout
+        while coord.worker_count() < 2:
+            if time.monotonic() > deadline: raise SystemExit("FAIL: workers did not connect")
+            time.sleep(0.05)
+        population = [random_genes() for _ in range(jobs)]
+        ids = [coord.submit(genes, 0) for genes in population]
+        while len(coord.results) < jobs // 10: time.sleep(0.01)
+        procs[0].kill()
+        results = coord.wait(ids, timeout)
+        world = ObstacleWorld(OBS_COMPLEX)
+        wrong = [i for i in range(0, jobs, 20) if results[i]["fitness"] !=
+                 run_episode(DynamicFuzzyBrain(population[i]), world, START_POSE, GOAL, MAX_STEPS)["fitness"]]
+        print(f"{len(results)}/{jobs} results, {coord.requeued} job(s) requeued, "
+              f"{coord.worker_count()} worker(s) left, {len(wrong)} wrong fitness value(s)")
+        if coord.requeued == 0 or coord.worker_count() != 1 or wrong: raise SystemExit("FAIL")
+        print("OK")
+    finally:
+        coord.close()
+        for p in procs: p.kill()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distributed GA evaluation over TCP")
+    sub = parser.add_subparsers(dest="role", required=True)
+    c = sub.add_parser("coordinator", help="run the GA and hand out jobs")
+    c.add_argument("--host", default="127.0.0.1")
+    c.add_argument("--port", type=int, default=5555)
+    c.add_argument("--local-workers", type=int, default=0, help="also start N workers on this machine")
+    c.add_argument("--generations", type=int, default=5)
+    c.add_argument("--map", help="map file (JSON, see mapFile.py) sent to the workers instead of the complex map")
+    w = sub.add_parser("worker", help="evaluate jobs for a coordinator")
+    w.add_argument("--host", default="127.0.0.1")
+    w.add_argument("--port", type=int, default=5555)
+    sub.add_parser("test", help="localhost self-test: kill one of two workers mid-run, check its jobs are requeued")
+    args = parser.parse_args()
+
+    if args.role == "test":
+        self_test()
+    elif args.role == "worker":
+        run_worker(args.host, args.port)
+    else:
+        obstacles, start, goal = OBS_COMPLEX, START_POSE, GOAL
+        if args.map:
+            from mapFile import load_map
+            game_map = load_map(args.map)
+            obstacles, start, goal = game_map.obstacles, game_map.start, game_map.goal
+        coord = Coordinator(args.host, args.port, obstacles, goal, (start,))
+        print(f"Coordinator listening on {coord.address[0]}:{coord.address[1]}")
+        spawn_local_workers(coord.address, args.local_workers)
+
+        population = [random_genes() for _ in range(POP_SIZE)]
+        for gen in range(1, args.generations + 1):
+            t0 = time.perf_counter()
+            scores = coord.evaluate(population)
+            print(f"Gen {gen}: best {max(scores):.1f} | {coord.worker_count()} worker(s) | {time.perf_counter() - t0:.2f}s")
+            population = breed_population(list(zip(scores, population)))
+        coord.close()
\ No newline at end of file
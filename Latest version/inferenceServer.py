@@ -0,0 +1,352 @@
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+from collections import deque
+
+import numpy as np
+
+from trainFuzzyGA import DynamicFuzzyBrain
+from paramRegistry import REGISTRY, RegistryError, load as load_registry
+
+# ==========================================
+# 1. VECTORIZED CONTROLLER
+# ==========================================
+# DynamicFuzzyBrain.compute() for a whole batch at once: row i of every array
+# is one request, each with its own genes. Same memberships, rules and
+# weighted-average defuzzification, in the same order of float operations,
+# so the outputs are bit-identical to the scalar brain (checked by `bench`).
+
+TURN_OUT = (-0.8, -0.3, 0.0, 0.3, 0.8)   # Hard_Right, Soft_Right, Straight, Soft_Left, Hard_Left
+SPEED_OUT = (0.0, 2.0, 4.0, 7.0)         # Stop, Slow, Medium, Fast
+
+
+def trimf(x, a, b, c):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rise = (x - a) / (b - a)
+        fall = (c - x) / (c - b)
+    return np.where((x <= a) | (x >= c), 0.0, np.where(x <= b, rise, fall))
+
+
+def fuzzy_batch(genes, sensors, goal_angle):
+    # genes (n, 4), sensors (n, 5), goal_angle (n,) -> speed (n,), turn (n,)
+    c_max, m_min, m_max, f_min = (genes[:, i:i + 1] for i in range(4))
+    m_min = np.where(m_min >= m_max, m_max - 1, m_min)
+    C = trimf(sensors, 0.0, 0.0, c_max)
+    M = trimf(sensors, m_min, 40.0, m_max)
+    F = trimf(sensors, f_min, 100.0, 1000.0)
+    g_right = trimf(goal_angle, -3.14, -1.0, -0.1)
+    g_str = trimf(goal_angle, -0.3, 0.0, 0.3)
+    g_left = trimf(goal_angle, 0.1, 1.0, 3.14)
+    zero = np.zeros(len(goal_angle))
+    mx, mn = np.maximum, np.minimum
+
+    # 1. Panic
+    right_first = sensors[:, 1] < sensors[:, 2]
+    hard_right = np.where(right_first, C[:, 0], zero)
+    hard_left = np.where(right_first, zero, C[:, 0])
+    slow = C[:, 0]
+    # 2. Navigate
+    straight = mn(C[:, 3], C[:, 4])
+    soft_right = mn(C[:, 3], F[:, 4])
+    soft_left = mn(C[:, 4], F[:, 3])
+    medium = mx(mx(straight, soft_right), soft_left)
+    soft_right, slow = mx(soft_right, C[:, 1]), mx(slow, C[:, 1])
+    soft_left, slow = mx(soft_left, C[:, 2]), mx(slow, C[:, 2])
+    # 3. Wall hugging
+    w = mn(mn(C[:, 4], C[:, 2]), M[:, 0])
+    soft_left, slow = mx(soft_left, w), mx(slow, w)
+    w = mn(mn(C[:, 3], C[:, 1]), M[:, 0])
+    soft_right, slow = mx(soft_right, w), mx(slow, w)
+    # 4. Goal
+    safe = mn(mn(mx(F[:, 0], M[:, 0]), mx(F[:, 1], M[:, 1])), mx(F[:, 2], M[:, 2]))
+    fast_goal = mn(F[:, 0], F[:, 1]) > 0.5
+    fast = zero
+    for g in (mn(safe, g_left), mn(safe, g_right), mn(safe, g_str)):
+        fast = mx(fast, np.where(fast_goal, g, zero))
+        medium = mx(medium, np.where(fast_goal, zero, g))
+    soft_left = mx(soft_left, mn(safe, g_left))
+    soft_right = mx(soft_right, mn(safe, g_right))
+    straight = mx(straight, mn(safe, g_str))
+
+    # Defuzzify, summing in the scalar brain's order
+    t_num = t_den = 0.0
+    for v, out in zip((hard_right, soft_right, straight, soft_left, hard_left), TURN_OUT):
+        t_num, t_den = t_num + v * out, t_den + v
+    s_num = s_den = 0.0
+    for v, out in zip((zero, slow, medium, fast), SPEED_OUT):
+        s_num, s_den = s_num + v * out, s_den + v
+    with np.errstate(divide="ignore", invalid="ignore"):
+        turn = np.where(t_den != 0, t_num / t_den, 0.0)
+        speed = np.where(s_den == 0, 2.0, s_num / s_den)
+    return speed, turn
+
+# ==========================================
+# 2. PARAMETER SETS
+# ==========================================
+# Requests name their parameters by registry version (paramRegistry.py);
+# id 0 is the hand-tuned set. An unknown id re-reads the registry if the file
+# changed since the last read, so newly published versions work at once.
+
+BUILTIN_PARAMS = {0: [40.0, 10.0, 50.0, 40.0]}  # MANUAL_PARAMS in LatestCompare.py
+
+
+class ParamTable:
+    def __init__(self, path=REGISTRY):
+        self.path = path
+        self.stamp = None
+        self.rows = {}
+        self.genes = np.zeros((0, 4))
+        self.brains = {}
+        self.reload()
+
+    def reload(self):
+        try:
+            st = os.stat(self.path)
+            stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            stamp = None
+        if stamp == self.stamp and self.rows: return False
+        self.stamp = stamp
+        params = dict(BUILTIN_PARAMS)
+        if stamp is not None:
+            try:
+                params.update((e["id"], e["genes"]) for e in load_registry(self.path)["entries"])
+            except RegistryError as e:
+                print(f"Parameter registry: {e}")
+        self.rows = {pid: i for i, pid in enumerate(params)}
+        self.genes = np.array(list(params.values()), dtype=float).reshape(-1, 4)
+        self.brains = {}
+        return True
+
+    def row(self, pid):
+        if pid not in self.rows and not (self.reload() and pid in self.rows):
+            raise KeyError(f"unknown params id {pid!r}")
+        return self.rows[pid]
+
+    def brain(self, pid):
+        # Scalar brain, for --scalar serving
+        if pid not in self.brains: self.brains[pid] = DynamicFuzzyBrain(self.genes[self.rows[pid]].tolist())
+        return self.brains[pid]
+
+# ==========================================
+# 3. MICRO-BATCHING SERVER
+# ==========================================
+# Localhost TCP, one JSON object per line each way. Clients may pipeline;
+# replies carry the request's "id":
+#
+#   -> {"id": 7, "params": 3, "sensors": [s0, s1, s2, s3, s4], "goal_angle": 0.2}
+#   <- {"id": 7, "speed": 4.0, "turn": -0.3}
+#   -> {"cmd": "stats"}
+#   <- {"requests": ..., "p50_ms": ..., "p99_ms": ..., "mean_batch": ...}
+#
+# The first request of a batch starts a window_ms timer; everything that
+# arrives before it fires (or until max_batch requests) is evaluated in one
+# fuzzy_batch() call. Latency is measured from parsing a request to its result.
+
+INFERENCE_PORT = 8766
+WINDOW_MS = 1.0
+MAX_BATCH = 1024
+REPORT_S = 5.0
+LATENCY_SAMPLES = 100000
+
+
+class Batcher:
+    def __init__(self, params, window_ms=WINDOW_MS, max_batch=MAX_BATCH, scalar=False):
+        self.params = params
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.scalar = scalar
+        self.pending = []
+        self.timer = None
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)  # s, newest requests
+        self.requests = self.batches = 0
+        self.started = time.perf_counter()
+
+    def submit(self, pid, sensors, goal_angle):
+        row = self.params.row(pid)
+        sensors = [float(s) for s in sensors]
+        if len(sensors) != 5: raise ValueError("'sensors' must hold 5 readings")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((time.perf_counter(), pid, row, sensors, float(goal_angle), future))
+        if len(self.pending) >= self.max_batch: self.flush()
+        elif self.timer is None: self.timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self):
+        if self.timer is not None: self.timer.cancel()
+        self.timer = None
+        batch, self.pending = self.pending, []
+        if not batch: return
+        if self.scalar:
+            results = [self.params.brain(pid).compute(s, g) for _, pid, _, s, g, _ in batch]
+        else:
+            genes = self.params.genes[[row for _, _, row, _, _, _ in batch]]
+            speed, turn = fuzzy_batch(genes, np.array([s for _, _, _, s, _, _ in batch]),
+                                      np.array([g for _, _, _, _, g, _ in batch]))
+            results = zip(speed.tolist(), turn.tolist())
+        now = time.perf_counter()
+        for (t0, _, _, _, _, future), result in zip(batch, results):
+            if not future.done(): future.set_result(result)
+            self.latencies.append(now - t0)
+        self.requests += len(batch)
+        self.batches += 1
+
+    def stats(self, reset=False):
+        lat = np.array(self.latencies) * 1000.0
+        elapsed = time.perf_counter() - self.started
+        out = {"requests": self.requests, "batches": self.batches, "seconds": round(elapsed, 3),
+               "throughput": round(self.requests / elapsed, 1) if elapsed > 0 else 0.0,
+               "mean_batch": round(self.requests / self.batches, 1) if self.batches else 0.0,
+               "p50_ms": round(float(np.percentile(lat, 50)), 3) if len(lat) else None,
+               "p99_ms": round(float(np.percentile(lat, 99)), 3) if len(lat) else None}
+        if reset:
+            self.latencies.clear()
+            self.requests = self.batches = 0
+            self.started = time.perf_counter()
+        return out
+
+
+class InferenceServer:
+    def __init__(self, batcher, port=INFERENCE_PORT, host="127.0.0.1"):
+        self.batcher = batcher
+        self.port, self.host = port, host
+
+    async def handle(self, reader, writer):
+        def reply(rid, future):
+            if writer.is_closing(): return
+            speed, turn = future.result()
+            writer.write((json.dumps({"id": rid, "speed": speed, "turn": turn}) + "\n").encode())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: break
+                rid = None
+                try:
+                    msg = json.loads(line)
+                    if not isinstance(msg, dict): raise ValueError("expected a JSON object")
+                    if msg.get("cmd") == "stats":
+                        writer.write((json.dumps(self.batcher.stats(msg.get("reset", False))) + "\n").encode())
+                        continue
+                    rid = msg.get("id")
+                    future = self.batcher.submit(msg["params"], msg["sensors"], msg["goal_angle"])
+                except (ValueError, KeyError, TypeError) as e:
+                    writer.write((json.dumps({"id": rid, "error": str(e)}) + "\n").encode())
+                    continue
+                future.add_done_callback(lambda f, rid=rid: reply(rid, f))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def report(self):
+        while True:
+            await asyncio.sleep(REPORT_S)
+            s = self.batcher.stats(reset=True)
+            if s["requests"]:
+                print(f"{s['throughput']:>9,.0f} req/s | p50 {s['p50_ms']:.2f} ms | p99 {s['p99_ms']:.2f} ms | "
+                      f"mean batch {s['mean_batch']:.1f}")
+
+    async def serve(self):
+        server = await asyncio.start_server(self.handle, self.host, self.port, limit=2 ** 20)
+        mode = "scalar" if self.batcher.scalar else f"window {self.batcher.window * 1000:g} ms, max batch {self.batcher.max_batch}"
+        print(f"Inference server on {self.host}:{self.port} ({mode}); params ids {sorted(self.batcher.params.rows)}")
+        reporter = asyncio.create_task(self.report())
+        try:
+            async with server: await server.serve_forever()
+        finally:
+            reporter.cancel()
+
+# ==========================================
+# 4. LOAD GENERATOR
+# ==========================================
+# `clients` connections, each sending `requests` requests one after another
+# (a closed loop: concurrency = clients) with random sensor readings.
+
+async def load_client(port, requests, pid, rng, rtts):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=2 ** 20)
+    try:
+        for i in range(requests):
+            msg = {"id": i, "params": pid, "sensors": [rng.uniform(0, 150) for _ in range(5)],
+                   "goal_angle": rng.uniform(-3.14, 3.14)}
+            t0 = time.perf_counter()
+            writer.write((json.dumps(msg) + "\n").encode())
+            reply = json.loads(await reader.readline())
+            rtts.append(time.perf_counter() - t0)
+            if "error" in reply: raise RuntimeError(reply["error"])
+    finally:
+        writer.close()
+
+
+async def server_stats(port, reset=False):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write((json.dumps({"cmd": "stats", "reset": reset}) + "\n").encode())
+    stats = json.loads(await reader.readline())
+    writer.close()
+    return stats
+
+
+async def run_load(port, clients, requests, pid=0, seed=0):
+    await server_stats(port, reset=True)
+    rtts = []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(load_client(port, requests, pid, random.Random(seed + c), rtts) for c in range(clients)))
+    elapsed = time.perf_counter() - t0
+    lat = np.array(rtts) * 1000.0
+    server = await server_stats(port)
+    print(f"{clients} clients x {requests} requests: {len(rtts) / elapsed:,.0f} req/s | round trip p50 "
+          f"{np.percentile(lat, 50):.2f} ms, p99 {np.percentile(lat, 99):.2f} ms")
+    print(f"  server: p50 {server['p50_ms']} ms, p99 {server['p99_ms']} ms, mean batch {server['mean_batch']}")
+    return len(rtts) / elapsed, lat
+
+
+def bench(n, rounds=20, seed=0):
+    # In-process: scalar brain per request vs one fuzzy_batch call, same inputs
+    rng = np.random.default_rng(seed)
+    genes = np.column_stack([rng.uniform(lo, hi, n) for lo, hi in [(20, 60), (5, 30), (30, 80), (30, 70)]])
+    sensors = rng.uniform(0, 150, (n, 5))
+    genes[::5, 1] = genes[::5, 2]  # med_min >= med_max is repaired by the brain
+    sensors[::7, 2] = sensors[::7, 1]  # exercise the panic rule's tie
+    goal = rng.uniform(-3.14, 3.14, n)
+    brains = [DynamicFuzzyBrain(g) for g in genes.tolist()]
+    rows, goals = sensors.tolist(), goal.tolist()
+    t0 = time.perf_counter()
+    for _ in range(rounds): scalar = [b.compute(s, g) for b, s, g in zip(brains, rows, goals)]
+    t1 = time.perf_counter()
+    for _ in range(rounds): speed, turn = fuzzy_batch(genes, sensors, goal)
+    t2 = time.perf_counter()
+    same = all(s == a and t == b for (s, t), a, b in zip(scalar, speed.tolist(), turn.tolist()))
+    print(f"batch of {n}: scalar {(t1 - t0) / rounds / n * 1e6:.2f} us/request, vectorized "
+          f"{(t2 - t1) / rounds / n * 1e6:.2f} us/request ({(t1 - t0) / (t2 - t1):.1f}x), identical: {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-batching fuzzy controller inference server")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("serve", help="run the server")
+    s.add_argument("--port", type=int, default=INFERENCE_PORT)
+    s.add_argument("--window-ms", type=float, default=WINDOW_MS, help="how long a batch collects requests")
+    s.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    s.add_argument("--registry", default=REGISTRY, help="parameter registry the params ids refer to")
+    s.add_argument("--scalar", action="store_true", help="one DynamicFuzzyBrain.compute() per request (baseline)")
+    l = sub.add_parser("load", help="drive a running server and report latency and throughput")
+    l.add_argument("--port", type=int, default=INFERENCE_PORT)
+    l.add_argument("--clients", type=int, default=256)
+    l.add_argument("--requests", type=int, default=200, help="per client")
+    l.add_argument("--params", type=int, default=0, help="params id (registry version, 0 = hand-tuned)")
+    b = sub.add_parser("bench", help="scalar vs vectorized inference, in-process")
+    b.add_argument("--batch", type=int, nargs="+", default=[1, 16, 256, 1024])
+    args = parser.parse_args()
+
+    if args.cmd == "serve":
+        batcher = Batcher(ParamTable(args.registry), args.window_ms, args.max_batch, args.scalar)
+        try: asyncio.run(InferenceServer(batcher, args.port).serve())
+        except KeyboardInterrupt: pass
+    elif args.cmd == "load":
+        asyncio.run(run_load(args.port, args.clients, args.requests, args.params))
+    else:
+        for n in args.batch: bench(n)
\ No newline at end of file
@@ -0,0 +1,118 @@
+import math
+import numpy as np
+
+from simCore import SENSOR_ANGLES, SENSOR_RANGE
+
+# ==========================================
+# 1. BATCHED RAY CAST
+# ==========================================
+# All rays against all (nearby) obstacles in one NumPy pass. Small layouts use
+# the edge tests of simCore.cast_rays, so a 5-ray layout reads identically.
+
+PREFILTER_MIN = 64  # above this many obstacles, drop those out of range first
+
+
+def cast_rays_batch(x, y, t, ox1, oy1, ox2, oy2, angles, max_range=SENSOR_RANGE):
+    # ox1..oy2: 1-D arrays of obstacle bounds; angles: offsets from heading t
+    if len(ox1) > PREFILTER_MIN:
+        gx = np.maximum(np.maximum(ox1 - x, 0.0), x - ox2)
+        gy = np.maximum(np.maximum(oy1 - y, 0.0), y - oy2)
+        near = gx * gx + gy * gy <= max_range * max_range
+        ox1, oy1, ox2, oy2 = ox1[near], oy1[near], ox2[near], oy2[near]
+    if len(ox1) == 0: return np.full(len(angles), float(max_range))
+
+    if len(angles) <= 8:
+        # Small layouts: math.cos and the four edge tests of cast_rays, so the
+        # 5-ray layout reads bit-identically
+        vx = np.array([math.cos(t + a) for a in angles])[:, None]
+        vy = np.array([math.sin(t + a) for a in angles])[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            okx = np.abs(vx) > 0.001
+            oky = np.abs(vy) > 0.001
+            closest = np.full((len(angles), len(ox1)), np.inf)
+            for ox in (ox1, ox2):
+                tt = (ox - x) / vx
+                yy = y + tt * vy
+                np.minimum(closest, np.where(okx & (tt > 0) & (oy1 <= yy) & (yy <= oy2), tt, np.inf), out=closest)
+            for oy in (oy1, oy2):
+                tt = (oy - y) / vy
+                xx = x + tt * vx
+                np.minimum(closest, np.where(oky & (tt > 0) & (ox1 <= xx) & (xx <= ox2), tt, np.inf), out=closest)
+        return np.minimum(closest.min(axis=1), max_range)
+
+    # Dense layouts: slab method, about a third of the array passes
+    ray_t = t + np.asarray(angles)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ivx, ivy = (1.0 / np.cos(ray_t))[:, None], (1.0 / np.sin(ray_t))[:, None]
+        ax, bx = (ox1 - x) * ivx, (ox2 - x) * ivx
+        ay, by = (oy1 - y) * ivy, (oy2 - y) * ivy
+        # 0 * inf is NaN for a ray running exactly along an edge line; that ray
+        # stays inside the closed slab, so it spans (-inf, inf) like cast_rays
+        lo_x, hi_x = np.minimum(ax, bx), np.maximum(ax, bx)
+        lo_y, hi_y = np.minimum(ay, by), np.maximum(ay, by)
+        for lo, hi in ((lo_x, hi_x), (lo_y, hi_y)):
+            edge = np.isnan(lo) | np.isnan(hi)
+            lo[edge], hi[edge] = -np.inf, np.inf
+        enter = np.maximum(lo_x, lo_y)
+        leave = np.minimum(hi_x, hi_y)
+    # Starting inside a rectangle reads its far edge, like cast_rays
+    dist = np.where(enter > 0, enter, leave)
+    closest = np.where((enter <= leave) & (leave > 0), dist, np.inf)
+    return np.minimum(closest.min(axis=1), max_range)
+
+# ==========================================
+# 2. CONFIGURABLE LIDAR
+# ==========================================
+class Lidar:
+    def __init__(self, obstacles, angles=SENSOR_ANGLES, max_range=SENSOR_RANGE):
+        self.angles = np.asarray(angles, dtype=float)
+        self.max_range = max_range
+        self.set_obstacles(obstacles)
+
+    @classmethod
+    def uniform(cls, obstacles, n_rays, fov=math.pi, max_range=SENSOR_RANGE):
+        # n_rays spread evenly over fov (centred on the heading); fov=2*pi is a full ring
+        if fov >= 2 * math.pi: angles = np.arange(n_rays) * (2 * math.pi / n_rays) - math.pi
+        else: angles = np.linspace(-fov / 2, fov / 2, n_rays)
+        return cls(obstacles, angles, max_range)
+
+    def set_obstacles(self, obstacles):
+        obs = np.asarray(obstacles, dtype=float).reshape(-1, 4)
+        self.ox1, self.oy1, self.ox2, self.oy2 = (np.ascontiguousarray(c) for c in obs.T)
+
+    def scan(self, x, y, t):
+        return cast_rays_batch(x, y, t, self.ox1, self.oy1, self.ox2, self.oy2, self.angles, self.max_range)
+
+# ==========================================
+# 3. REDUCTION TO THE 5 SEMANTIC SECTORS
+# ==========================================
+class SectorReducer:
+    # Maps N lidar rays onto the sectors the rule base indexes as s_mfs[0..4]
+    # (Front, Front-Left, Front-Right, Left, Right). Each ray joins the sector
+    # whose centre angle is nearest, if within half the sector spacing; a
+    # sector reads the minimum of its rays (closest obstacle), or max range.
+    def __init__(self, angles, sectors=SENSOR_ANGLES, max_range=SENSOR_RANGE):
+        angles = np.asarray(angles, dtype=float)
+        sectors = np.asarray(sectors, dtype=float)
+        half_width = np.min(np.diff(np.sort(sectors))) / 2 + 1e-9
+        diff = np.abs((angles[None, :] - sectors[:, None] + math.pi) % (2 * math.pi) - math.pi)
+        nearest = diff.argmin(axis=0)
+        self.mask = np.zeros((len(sectors), len(angles)), dtype=bool)
+        for ray, sec in enumerate(nearest):
+            if diff[sec, ray] <= half_width: self.mask[sec, ray] = True
+        self.max_range = max_range
+
+    def reduce(self, readings):
+        return np.where(self.mask, readings[None, :], self.max_range).min(axis=1).tolist()
+
+
+class SectorLidar:
+    # N-ray lidar presented to the existing 5-input controllers
+    def __init__(self, obstacles, lidar=None, n_rays=64, fov=math.pi, max_range=SENSOR_RANGE):
+        self.lidar = lidar or Lidar.uniform(obstacles, n_rays, fov, max_range)
+        self.reducer = SectorReducer(self.lidar.angles, max_range=self.lidar.max_range)
+        self.last_scan = None
+
+    def sense(self, x, y, t):
+        self.last_scan = self.lidar.scan(x, y, t)
+        return self.reducer.reduce(self.last_scan)
\ No newline at end of file
@@ -0,0 +1,275 @@
+import math
+import time
+import argparse
+import multiprocessing as mp
+
+from simCore import ObstacleWorld, run_episode
+from sharedMap import SharedMapPool
+from simWorker import FRAME_MS, SimWorker
+from warmStart import initial_population, known_fitness, split_known
+from paramRegistry import publish
+from trainFuzzyGA import (DynamicFuzzyBrain, random_genes, breed_population,
+                          OBS_COMPLEX, GOAL, START_POSE, MAP_NAME, MAX_STEPS, POP_SIZE, GENERATIONS)
+
+# ==========================================
+# LIVE TRAINING VIEWER
+# ==========================================
+# GAVisualTrainer simulates every robot on screen, so training runs at
+# drawing speed. Here the GA runs at full speed: a worker thread (simWorker)
+# evaluates each generation on a SharedMapPool and publishes one sample per
+# generation (fitness history, best genes, the best robot's path). The window
+# replays the best episode and plots fitness per generation, with a fixed
+# number of canvas items however long training runs.
+
+VIEW = 500            # map canvas size in px (larger maps are scaled down)
+CHART_POINTS = 200    # the fitness chart plots at most this many generations
+TRAIL_STRIDE = 5      # replay trail: one vertex every N steps
+REPLAY_STEPS = 4      # replayed robot steps per UI frame
+
+
+class RecordingWorld(ObstacleWorld):
+    # Records the pose at every sensing call, i.e. every step of run_episode
+    def __init__(self, obstacles):
+        super().__init__(obstacles)
+        self.poses = []
+
+    def sense(self, x, y, t):
+        self.poses.append((x, y, t))
+        return super().sense(x, y, t)
+
+
+def record_episode(genes, obstacles, start, goal, nav=None):
+    world = RecordingWorld(obstacles)
+    result = run_episode(DynamicFuzzyBrain(genes), world, start, goal, MAX_STEPS, nav=nav)
+    world.poses.append((result["x"], result["y"], result["t"]))
+    return result, world.poses
+
+
+class TrainingRun:
+    # Generational GA, one generation per step(); runs on the worker thread.
+    # population: generation 1 (e.g. warmStart.initial_population), else random.
+    # known: {tuple(genes): fitness} reused instead of simulating those genes
+    # again; it also spares re-simulating the elites every generation.
+    def __init__(self, pool, obstacles, start, goal, generations=GENERATIONS, pop_size=POP_SIZE, nav=None,
+                 population=None, known=None, save=True, map_name=MAP_NAME):
+        self.pool = pool
+        self.obstacles, self.start, self.goal, self.nav = obstacles, start, goal, nav
+        self.generations = generations
+        self.pop_size = pop_size
+        self.population = population or [random_genes() for _ in range(pop_size)]
+        self.known = dict(known or {})
+        self.save = save
+        self.map_name = map_name
+        self.gen = 0
+        self.evals = 0
+        self.history = []  # (best so far, generation mean) per generation
+        self.best, self.best_genes = 0.0, None
+        self.replay = None  # (status, poses) of the best individual's episode
+        self.finished = False
+        self.t0 = time.perf_counter()
+        self.elapsed = 0.0
+
+    def step(self):
+        if self.finished: return False
+        to_simulate, _ = split_known(self.population, self.known)
+        if to_simulate:
+            for genes, fitness in zip(to_simulate, self.pool.evaluate(to_simulate, generation=self.gen + 1)): self.known[tuple(genes)] = fitness
+        scores = [self.known[tuple(genes)] for genes in self.population]
+        self.gen += 1
+        self.evals += len(to_simulate)
+        i = max(range(len(scores)), key=scores.__getitem__)
+        if self.best_genes is None or scores[i] > self.best:
+            self.best, self.best_genes = scores[i], list(self.population[i])
+            result, poses = record_episode(self.best_genes, self.obstacles, self.start, self.goal, self.nav)
+            self.replay = (result["status"], poses)
+        self.history.append((self.best, sum(scores) / len(scores)))
+        self.elapsed = time.perf_counter() - self.t0
+
+        if self.gen >= self.generations:
+            self.stop()
+        else:
+            self.population = breed_population(list(zip(scores, self.population)), self.pop_size)
+        return True
+
+    def stop(self):
+        # Also the SAVE & STOP button (through SimWorker.call)
+        if self.finished: return
+        self.finished = True
+        if not self.save: return
+        if self.best_genes is None:
+            print("No training done yet.")
+            return
+        print(f"Saving Best Genes: {self.best_genes}")
+        entry = publish(self.best_genes, self.best, self.map_name, getattr(self.pool, "run_id", None), "liveTrainer")
+        print(f"Published as v{entry['id']}")
+
+    def snapshot(self):
+        # history and replay are replaced or appended to, never changed in place
+        return {"gen": self.gen, "evals": self.evals, "elapsed": self.elapsed, "best": self.best,
+                "genes": self.best_genes, "history": tuple(self.history), "replay": self.replay,
+                "finished": self.finished}
+
+
+def chart_sample(history, points=CHART_POINTS):
+    # Evenly spaced generations, always including the first and the last
+    n = len(history)
+    if n <= points: return list(enumerate(history))
+    idx = [round(i * (n - 1) / (points - 1)) for i in range(points)]
+    return [(i, history[i]) for i in idx]
+
+
+class LiveTrainingViewer:
+    def __init__(self, root, run, size):
+        import tkinter as tk
+        self.root, self.run = root, run
+        root.title("GA Live Training")
+        self.scale = k = min(1.0, VIEW / max(size))
+
+        self.canvas = tk.Canvas(root, width=size[0] * k, height=size[1] * k, bg="white")
+        self.canvas.pack(side=tk.LEFT, padx=10, pady=10)
+        panel = tk.Frame(root)
+        panel.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10)
+
+        self.lbl_gen = tk.Label(panel, text="Generation: 0", font=("Arial", 14, "bold"))
+        self.lbl_gen.pack(pady=5)
+        self.lbl_rate = tk.Label(panel, text="Evaluations: 0", font=("Arial", 12))
+        self.lbl_rate.pack(pady=5)
+        self.lbl_fit = tk.Label(panel, text="Best Fitness: 0", font=("Arial", 12, "bold"), fg="green")
+        self.lbl_fit.pack(pady=5)
+        self.lbl_params = tk.Label(panel, text="Best Genes:\n-", font=("Consolas", 10), justify=tk.LEFT)
+        self.lbl_params.pack(pady=5)
+
+        self.chart_w, self.chart_h = 280, 180
+        self.chart = tk.Canvas(panel, width=self.chart_w, height=self.chart_h, bg="white")
+        self.chart.pack(pady=5)
+        tk.Label(panel, text="green: best so far | blue: generation mean", font=("Arial", 8)).pack()
+        self.line_best = self.chart.create_line(0, 0, 0, 0, fill="green", width=2)
+        self.line_mean = self.chart.create_line(0, 0, 0, 0, fill="blue")
+
+        tk.Button(panel, text="SAVE & STOP", command=lambda: self.worker.call(run.stop), bg="red", fg="white", height=2).pack(side=tk.BOTTOM, pady=20, fill=tk.X)
+
+        # Map (drawn once), robot and its trail: a constant item count
+        goal = run.goal
+        self.canvas.create_oval((goal[0] - 10) * k, (goal[1] - 10) * k, (goal[0] + 10) * k, (goal[1] + 10) * k, fill="green")
+        for ox1, oy1, ox2, oy2 in run.obstacles:
+            self.canvas.create_rectangle(ox1 * k, oy1 * k, ox2 * k, oy2 * k, fill="gray")
+        self.trail = self.canvas.create_line(0, 0, 0, 0, fill="blue")
+        self.poly = self.canvas.create_polygon(0, 0, 0, 0, fill="blue")
+
+        self.drawn = {}
+        self.replay, self.frame = None, 0
+        self.worker = SimWorker(run.step, run.snapshot).start()
+        self.poll()
+
+    def poll(self):
+        view = self.worker.latest()
+        if view is not None:
+            if view["finished"]:
+                self.worker.stop()
+                self.root.destroy()
+                return
+            self.draw(view)
+        self.animate()
+        self.root.after(FRAME_MS, self.poll)
+
+    def changed(self, key, value):
+        # Skips Tk calls for values already on screen
+        if self.drawn.get(key) == value: return False
+        self.drawn[key] = value
+        return True
+
+    def draw(self, view):
+        if self.changed("gen", view["gen"]): self.lbl_gen.config(text=f"Generation: {view['gen']} / {self.run.generations}")
+        if self.changed("evals", view["evals"]):
+            rate = view["evals"] / view["elapsed"] if view["elapsed"] else 0.0
+            self.lbl_rate.config(text=f"Evaluations: {view['evals']} ({rate:.1f}/s)")
+        if self.changed("best", view["best"]): self.lbl_fit.config(text=f"Best Fitness: {view['best']:.1f}")
+        genes = view["genes"]
+        if genes is not None and self.changed("genes", tuple(genes)):
+            genes_str = f"Close_Max: {genes[0]:.1f}\nMed_Min:   {genes[1]:.1f}\nMed_Max:   {genes[2]:.1f}\nFar_Min:   {genes[3]:.1f}"
+            self.lbl_params.config(text="Best Genes:\n" + genes_str)
+        if self.changed("history", len(view["history"])): self.draw_chart(view["history"])
+
+        # A new best: restart the replay on its episode
+        if view["replay"] is not None and view["replay"] is not self.replay:
+            self.replay, self.frame = view["replay"], 0
+            self.canvas.itemconfig(self.poly, fill="blue")
+
+    def draw_chart(self, history):
+        if not history: return
+        sample = chart_sample(history)
+        top = max(best for _, (best, _) in sample) or 1.0
+        w, h, pad = self.chart_w, self.chart_h, 10
+        span = max(len(history) - 1, 1)
+        for item, col in ((self.line_best, 0), (self.line_mean, 1)):
+            coords = []
+            for i, values in sample:
+                coords += [pad + (w - 2 * pad) * i / span, h - pad - (h - 2 * pad) * values[col] / top]
+            if len(coords) == 2: coords *= 2  # a line needs two points
+            self.chart.coords(item, *coords)
+
+    def animate(self):
+        # Advance the replayed robot; it loops until a better one arrives
+        if self.replay is None: return
+        status, poses = self.replay
+        k = self.scale
+        if self.frame >= len(poses):
+            self.frame = 0
+            self.canvas.itemconfig(self.poly, fill="blue")
+        i = min(self.frame + REPLAY_STEPS, len(poses)) - 1
+        x, y, t = poses[i]
+        r = 10 * max(k, 0.3)
+        x, y = x * k, y * k
+        self.canvas.coords(self.poly,
+            x + r*math.cos(t), y + r*math.sin(t),
+            x + r*math.cos(t+2.5), y + r*math.sin(t+2.5),
+            x + r*math.cos(t-2.5), y + r*math.sin(t-2.5)
+        )
+        trail = []
+        for px, py, _ in poses[:i + 1:TRAIL_STRIDE] + [poses[i]]: trail += [px * k, py * k]
+        if len(trail) == 2: trail *= 2
+        self.canvas.coords(self.trail, *trail)
+        if i == len(poses) - 1:
+            self.canvas.itemconfig(self.poly, fill={"GOAL": "gold", "COLLISION": "red"}.get(status, "gray"))
+        self.frame = i + 1
+
+
+if __name__ == "__main__":
+    from mapFile import add_map_argument, load_map, map_cache_dir, resolve_map
+    from resultsStore import add_db_argument, open_store
+
+    parser = argparse.ArgumentParser(description="GA training on worker processes with a live sampled view")
+    parser.add_argument("--workers", type=int, default=mp.cpu_count())
+    parser.add_argument("--generations", type=int, default=GENERATIONS)
+    parser.add_argument("--pop", type=int, default=POP_SIZE)
+    parser.add_argument("--nav", action="store_true", help="steer by a wavefront navigation field (navField.py)")
+    parser.add_argument("--headless", action="store_true", help="train without a window")
+    parser.add_argument("--cold", action="store_true", help="random generation 1 instead of a warm start (warmStart.py)")
+    add_map_argument(parser)
+    add_db_argument(parser)
+    args = parser.parse_args()
+    obstacles, start, goal, distance = resolve_map(args.map, OBS_COMPLEX, START_POSE, GOAL)
+    nav = None
+    if args.nav:
+        from navField import nav_field
+        nav = nav_field(obstacles, goal, cache_dir=map_cache_dir(args.map) if args.map else None)
+
+    store = open_store(args.db)
+    with SharedMapPool(obstacles, [start], goal, MAX_STEPS, args.workers, distance, nav, store, "liveTrainer") as pool:
+        population = None if args.cold else initial_population(args.pop, store)
+        known = known_fitness(store, pool.context)
+        map_name = load_map(args.map).name if args.map else MAP_NAME
+        run = TrainingRun(pool, obstacles, start, goal, args.generations, args.pop, nav, population, known, map_name=map_name)
+        if args.headless:
+            while run.step():
+                best, mean = run.history[-1]
+                print(f"Generation {run.gen:>4} | best {best:8.1f} | mean {mean:8.1f}")
+        else:
+            import tkinter as tk
+            size = (max(o[2] for o in obstacles), max(o[3] for o in obstacles))
+            root = tk.Tk()
+            viewer = LiveTrainingViewer(root, run, size)
+            root.mainloop()
+            viewer.worker.stop()
+    if store is not None: store.close()
+    print(f"{run.evals} evaluations on {args.workers} workers in {run.elapsed:.2f}s ({run.evals / max(run.elapsed, 1e-9):.1f}/s)")
\ No newline at end of file
@@ -0,0 +1,288 @@
+import os
+import json
+import math
+import time
+import hashlib
+import argparse
+
+import numpy as np
+
+from simCore import ObstacleGrid, hits_obstacle
+from sharedMap import DF_CELL, build_distance_field
+
+# ==========================================
+# 1. MAP FORMAT
+# ==========================================
+# JSON, hand-authored or written by `python mapFile.py import`:
+#
+#   {"version": 1, "name": "complex",
+#    "size": [400, 500],                      (optional, defaults to the obstacle bounds)
+#    "start": [360, 460, 3.14], "goal": [200, 40],
+#    "obstacles": [[x1, y1, x2, y2], ...]}
+#
+# Occupancy images (PGM/PBM natively, anything else through Pillow if it is
+# installed) are converted to rectangles: dark pixels are occupied, each row
+# is split into runs and runs repeated on consecutive rows are merged.
+
+MAP_VERSION = 1
+GRID_CELL = 100.0
+CACHE_DIR = ".mapcache"
+
+
+class MapError(ValueError):
+    pass
+
+
+class GameMap:
+    def __init__(self, obstacles, start, goal, size=None, name="map"):
+        self.obstacles = [tuple(float(v) for v in o) for o in obstacles]
+        self.start = tuple(float(v) for v in start)
+        self.goal = tuple(float(v) for v in goal)
+        if size is None and self.obstacles:
+            size = (max(o[2] for o in self.obstacles), max(o[3] for o in self.obstacles))
+        self.size = tuple(size) if size is not None else (0.0, 0.0)
+        self.name = name
+        self.distance = None   # clearance field, DF_CELL px cells
+        self._grid = None      # simCore.ObstacleGrid
+        self._grid_index = None  # (grid_cell, cell_keys, offsets, ids) from a cache, see grid
+
+    @property
+    def grid(self):
+        # A cached map rebuilds its grid on first use: most callers only want
+        # the obstacles and distance field, and the cells are the slow part
+        if self._grid is None and self._grid_index is not None:
+            cell, keys, offsets, ids = self._grid_index
+            grid = ObstacleGrid((), cell)
+            obstacles, ids, offsets = self.obstacles, ids.tolist(), offsets.tolist()
+            # Cells share the obstacle tuples, as in a freshly built grid
+            grid.cells = {k: [obstacles[i] for i in ids[a:b]]
+                          for k, a, b in zip(map(tuple, keys.tolist()), offsets, offsets[1:])}
+            self._grid, self._grid_index = grid, None
+        return self._grid
+
+    def to_json(self):
+        return {"version": MAP_VERSION, "name": self.name, "size": list(self.size),
+                "start": list(self.start), "goal": list(self.goal),
+                "obstacles": [list(o) for o in self.obstacles]}
+
+    def precompute(self, df_cell=DF_CELL, grid_cell=GRID_CELL):
+        self._grid = ObstacleGrid(self.obstacles, grid_cell)
+        self.distance = build_distance_field(self.obstacles, df_cell) if self.obstacles else np.zeros((0, 0), np.float32)
+        return self
+
+
+def validate(data):
+    # Raises MapError listing every problem found; returns a GameMap
+    problems = []
+
+    def numbers(value, n, what):
+        ok = isinstance(value, (list, tuple)) and len(value) == n and all(
+            isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v) for v in value)
+        if not ok: problems.append(f"{what} must be {n} finite numbers, got {value!r}")
+        return ok
+
+    if not isinstance(data, dict): raise MapError("map must be a JSON object")
+    if data.get("version", MAP_VERSION) > MAP_VERSION:
+        problems.append(f"map version {data['version']} is newer than supported ({MAP_VERSION})")
+    for key in ("start", "goal", "obstacles"):
+        if key not in data: problems.append(f"missing '{key}'")
+    if problems: raise MapError("; ".join(problems))
+
+    numbers(data["start"], 3, "start")
+    numbers(data["goal"], 2, "goal")
+    obstacles = data["obstacles"]
+    if not isinstance(obstacles, list): raise MapError("'obstacles' must be a list")
+    for i, o in enumerate(obstacles):
+        if numbers(o, 4, f"obstacle {i}") and not (o[0] < o[2] and o[1] < o[3]):
+            problems.append(f"obstacle {i} has x1 >= x2 or y1 >= y2: {o}")
+    size = data.get("size")
+    if size is not None and numbers(size, 2, "size") and min(size) <= 0:
+        problems.append(f"size must be positive, got {size}")
+    if problems: raise MapError("; ".join(problems[:10]) + (f" (+{len(problems) - 10} more)" if len(problems) > 10 else ""))
+
+    game_map = GameMap(obstacles, data["start"], data["goal"], size, data.get("name", "map"))
+    w, h = game_map.size
+    for what, (x, y) in (("start", game_map.start[:2]), ("goal", game_map.goal)):
+        if not (0 <= x <= w and 0 <= y <= h): problems.append(f"{what} {x, y} is outside the map {w}x{h}")
+        elif hits_obstacle(x, y, game_map.obstacles): problems.append(f"{what} {x, y} is inside an obstacle")
+    if problems: raise MapError("; ".join(problems))
+    return game_map
+
+
+def save_map(game_map, path):
+    with open(path, "w") as f: json.dump(game_map.to_json(), f)
+
+# ==========================================
+# 2. OCCUPANCY IMAGE IMPORT
+# ==========================================
+def read_pnm(path):
+    # Grey levels (0 = black) from P1/P2 (ASCII) or P4/P5 (binary) files
+    with open(path, "rb") as f: raw = f.read()
+    magic = raw[:2]
+    if magic not in (b"P1", b"P2", b"P4", b"P5"): raise MapError(f"{path}: not a PBM/PGM file")
+
+    fields, pos = [], 2
+    needed = 2 if magic in (b"P1", b"P4") else 3
+    while len(fields) < needed:
+        while raw[pos:pos + 1].isspace(): pos += 1
+        if raw[pos:pos + 1] == b"#":
+            pos = raw.index(b"\n", pos)
+            continue
+        end = pos
+        while not raw[end:end + 1].isspace(): end += 1
+        fields.append(int(raw[pos:end]))
+        pos = end
+    w, h = fields[0], fields[1]
+    maxval = fields[2] if needed == 3 else 1
+    pos += 1  # single whitespace before binary data
+
+    if magic == b"P5":
+        img = np.frombuffer(raw, dtype=np.uint8 if maxval < 256 else ">u2", count=w * h, offset=pos)
+        return img.reshape(h, w).astype(float) * (255.0 / maxval)
+    if magic == b"P4":
+        bits = np.unpackbits(np.frombuffer(raw, dtype=np.uint8, offset=pos).reshape(h, -1), axis=1)[:, :w]
+        return (1 - bits).astype(float) * 255.0
+    if magic == b"P1":
+        # ASCII bits may be written without separators
+        bits = np.array([int(c) for c in b"".join(raw[pos:].split()).decode()[:w * h]], dtype=float)
+        return (1 - bits.reshape(h, w)) * 255.0
+    values = np.array(raw[pos:].split(), dtype=float)
+    return values[:w * h].reshape(h, w) * (255.0 / maxval)
+
+
+def read_image(path):
+    if os.path.splitext(path)[1].lower() in (".pgm", ".pbm", ".pnm"): return read_pnm(path)
+    try:
+        from PIL import Image
+    except ImportError:
+        raise MapError(f"{path}: only PGM/PBM can be read without Pillow (pip install pillow)")
+    return np.asarray(Image.open(path).convert("L"), dtype=float)
+
+
+def occupancy_to_rects(occupied, scale=1.0):
+    # Row runs of occupied pixels, merged downwards while the same run repeats
+    rects, open_runs = [], {}
+    for row in range(occupied.shape[0] + 1):
+        runs = set()
+        if row < occupied.shape[0]:
+            edges = np.flatnonzero(np.diff(np.r_[0, occupied[row].astype(np.int8), 0]))
+            runs = set(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+        for run in list(open_runs):
+            if run not in runs:
+                top = open_runs.pop(run)
+                rects.append((run[0] * scale, top * scale, run[1] * scale, row * scale))
+        for run in runs:
+            open_runs.setdefault(run, row)
+    return rects
+
+
+def import_image(path, start, goal, scale=1.0, threshold=128, name=None):
+    img = read_image(path)
+    rects = occupancy_to_rects(img < threshold, scale)
+    size = (img.shape[1] * scale, img.shape[0] * scale)
+    return validate({"version": MAP_VERSION, "name": name or os.path.splitext(os.path.basename(path))[0],
+                     "size": list(size), "start": list(start), "goal": list(goal),
+                     "obstacles": [list(r) for r in rects]})
+
+# ==========================================
+# 3. LOADER WITH DERIVED-DATA CACHE
+# ==========================================
+# The first load parses and validates the JSON and builds the obstacle grid
+# and distance field; all of it goes to CACHE_DIR/<sha256>.npz next to the
+# map, keyed by the file's bytes and the precomputation settings. Later loads
+# hash the file and read the arrays back without touching the JSON; the grid
+# is only rebuilt from them when something asks for it. With a generated
+# 100k-obstacle clutter map (mapGen.py): about 2 s cold, 80 ms cached.
+
+def cache_key(raw, df_cell, grid_cell):
+    h = hashlib.sha256(f"mapcache:{MAP_VERSION}:{df_cell}:{grid_cell}:".encode())
+    h.update(raw)
+    return h.hexdigest()
+
+
+def write_cache(path, game_map):
+    grid = game_map.grid
+    slot = {id(o): i for i, o in enumerate(game_map.obstacles)}
+    keys = list(grid.cells)
+    ids = [slot[id(o)] for k in keys for o in grid.cells[k]]
+    offsets = np.cumsum([0] + [len(grid.cells[k]) for k in keys])
+    meta = {"name": game_map.name, "size": list(game_map.size), "start": list(game_map.start),
+            "goal": list(game_map.goal), "grid_cell": grid.cell}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, meta=np.array(json.dumps(meta)),
+             obstacles=np.asarray(game_map.obstacles, dtype=np.float64).reshape(-1, 4),
+             distance=game_map.distance, cell_keys=np.asarray(keys, dtype=np.int64).reshape(-1, 2),
+             offsets=offsets.astype(np.int64), ids=np.asarray(ids, dtype=np.int64))
+    os.replace(tmp, path)
+
+
+def read_cache(path):
+    with np.load(path, allow_pickle=False) as z:
+        meta = json.loads(str(z["meta"]))
+        obstacles = list(map(tuple, z["obstacles"].tolist()))
+        distance = z["distance"]
+        index = (meta["grid_cell"], z["cell_keys"], z["offsets"], z["ids"])
+
+    game_map = GameMap.__new__(GameMap)
+    game_map.obstacles, game_map.name = obstacles, meta["name"]
+    game_map.size, game_map.start, game_map.goal = tuple(meta["size"]), tuple(meta["start"]), tuple(meta["goal"])
+    game_map.distance = distance
+    game_map._grid, game_map._grid_index = None, index
+    return game_map
+
+
+def map_cache_dir(path):
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR)
+
+
+def load_map(path, cache=True, df_cell=DF_CELL, grid_cell=GRID_CELL):
+    with open(path, "rb") as f: raw = f.read()
+    cache_path = os.path.join(map_cache_dir(path), cache_key(raw, df_cell, grid_cell) + ".npz")
+    if cache and os.path.exists(cache_path):
+        try: return read_cache(cache_path)
+        except (OSError, ValueError, KeyError) as e: print(f"Ignoring unreadable map cache {cache_path}: {e}")
+
+    try: data = json.loads(raw)
+    except ValueError as e: raise MapError(f"{path}: not valid JSON ({e})")
+    game_map = validate(data).precompute(df_cell, grid_cell)
+    if cache: write_cache(cache_path, game_map)
+    return game_map
+
+
+def add_map_argument(parser):
+    parser.add_argument("--map", help="map file (JSON, see mapFile.py) instead of the built-in complex map")
+
+
+def resolve_map(path, obstacles, start, goal):
+    # (obstacles, start, goal, distance field) from --map, or the defaults
+    # passed in with distance None (computed by whoever needs it)
+    if not path: return obstacles, start, goal, None
+    game_map = load_map(path)
+    return game_map.obstacles, game_map.start, game_map.goal, game_map.distance
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Map files: validate/load, import occupancy images")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    i = sub.add_parser("import", help="convert an occupancy image to a JSON map")
+    i.add_argument("image")
+    i.add_argument("out")
+    i.add_argument("--start", type=float, nargs=3, required=True, metavar=("X", "Y", "T"))
+    i.add_argument("--goal", type=float, nargs=2, required=True, metavar=("X", "Y"))
+    i.add_argument("--scale", type=float, default=1.0, help="px per image pixel")
+    i.add_argument("--threshold", type=int, default=128, help="grey levels below this are occupied")
+    l = sub.add_parser("load", help="validate a map and build (or time) its cache")
+    l.add_argument("path")
+    args = parser.parse_args()
+
+    if args.cmd == "import":
+        game_map = import_image(args.image, args.start, args.goal, args.scale, args.threshold)
+        save_map(game_map, args.out)
+        print(f"{args.out}: {len(game_map.obstacles)} obstacles, {game_map.size[0]:.0f}x{game_map.size[1]:.0f}")
+    else:
+        for attempt in (1, 2):
+            t0 = time.perf_counter()
+            game_map = load_map(args.path)
+            print(f"load {attempt}: {len(game_map.obstacles)} obstacles, distance field "
+                  f"{game_map.distance.shape} in {(time.perf_counter() - t0) * 1e3:.1f} ms")
\ No newline at end of file
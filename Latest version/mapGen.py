@@ -0,0 +1,296 @@
+import math
+import time
+import random
+import argparse
+from collections import deque
+
+import numpy as np
+
+from mapFile import GameMap, save_map
+
+# ==========================================
+# PROCEDURAL MAP GENERATOR
+# ==========================================
+# Seeded mazes, warehouses and clutter fields at any size and obstacle count,
+# for scaling benchmarks. Unlike generate_random_obstacles, every map has a
+# path from start to goal at least 2 * CLEARANCE wide, by construction:
+#   maze      - a perfect maze: every cell reaches every other
+#   warehouse - shelving rows separated by full-width aisles
+#   clutter   - random boxes, minus any that touch a corridor along a random
+#               polyline from start to goal
+# has_path() re-checks a map on a raster (python mapGen.py ... --check).
+
+CLEARANCE = 15.0  # half the narrowest guaranteed passage (drawn body ~10 px)
+WALL = 4.0        # boundary and maze wall thickness
+
+
+def border(w, h, t=WALL):
+    return [(0, 0, w, t), (0, h - t, w, h), (0, 0, t, h), (w - t, 0, w, h)]
+
+
+def rounded(rects):
+    # One decimal keeps 100k-obstacle JSON files small
+    return [tuple(r) for r in np.round(np.asarray(rects, dtype=float).reshape(-1, 4), 1).tolist()]
+
+# ==========================================
+# 1. MAZE
+# ==========================================
+def maze(size, count, seed=0, wall=WALL):
+    # n x n cells with n ~ sqrt(count): a perfect maze leaves about one unit
+    # wall per cell, so the obstacle count lands close to count
+    n = max(2, int(round(math.sqrt(count))))
+    c = (size - wall) / n
+    if c - wall < 2 * CLEARANCE:
+        raise ValueError(f"maze cells of {c:.1f} px leave no {2 * CLEARANCE:.0f} px passage; "
+                         f"use size >= {math.ceil(n * (2 * CLEARANCE + wall) + wall)} for {count} obstacles")
+    rng = random.Random(seed)
+
+    # Iterative recursive backtracker over cell ids i = row * n + col;
+    # open_e / open_s mark the removed east / south walls of each cell
+    open_e, open_s = bytearray(n * n), bytearray(n * n)
+    seen = bytearray(n * n)
+    seen[0] = 1
+    stack = [0]
+    while stack:
+        i = stack[-1]
+        r, col = divmod(i, n)
+        options = []
+        if col + 1 < n and not seen[i + 1]: options.append(i + 1)
+        if col > 0 and not seen[i - 1]: options.append(i - 1)
+        if r + 1 < n and not seen[i + n]: options.append(i + n)
+        if r > 0 and not seen[i - n]: options.append(i - n)
+        if not options:
+            stack.pop()
+            continue
+        j = rng.choice(options)
+        a, b = min(i, j), max(i, j)
+        if b - a == 1: open_e[a] = 1
+        else: open_s[a] = 1
+        seen[j] = 1
+        stack.append(j)
+
+    # Unit walls on the grid lines, overlapping at the posts
+    half = wall / 2
+    o = wall / 2  # grid lines sit inside the outer border
+    ids = np.arange(n * n)
+    rows, cols = ids // n, ids % n
+    east = (np.frombuffer(bytes(open_e), np.uint8) == 0) & (cols < n - 1)
+    south = (np.frombuffer(bytes(open_s), np.uint8) == 0) & (rows < n - 1)
+    ex = o + (cols[east] + 1) * c
+    ey = o + rows[east] * c
+    sx = o + cols[south] * c
+    sy = o + (rows[south] + 1) * c
+    rects = np.concatenate([
+        np.stack([ex - half, ey - half, ex + half, ey + c + half], axis=1),
+        np.stack([sx - half, sy - half, sx + c + half, sy + half], axis=1)])
+    obstacles = border(size, size, wall) + rounded(rects)
+    start = (o + c / 2, o + c / 2, 0.0)
+    goal = (o + (n - 0.5) * c, o + (n - 0.5) * c)
+    return GameMap(obstacles, start, goal, (size, size), f"maze-{n}x{n}-s{seed}")
+
+# ==========================================
+# 2. WAREHOUSE
+# ==========================================
+def warehouse(size, count, seed=0, depth=20.0, aisle=40.0, bay=10):
+    # Horizontal shelving rows of rack units (the obstacles), each row split
+    # into bays by cross-aisles at seeded positions. Aisles between rows run
+    # the full width, so every aisle connects to every other.
+    if aisle < 2 * CLEARANCE: raise ValueError(f"aisle {aisle} is narrower than {2 * CLEARANCE:.0f} px")
+    rng = random.Random(seed)
+    rows = int((size - WALL * 2 - aisle) // (depth + aisle))
+    if rows < 1: raise ValueError(f"a {size} px warehouse has no room for a shelving row")
+    per_row = math.ceil(count / rows)
+    bays = max(1, math.ceil(per_row / bay))
+    unit = (size - 2 * WALL - aisle * (bays + 1)) / per_row
+    if unit < 2:
+        raise ValueError(f"{count} rack units do not fit in {size} px; "
+                         f"use size >= {math.ceil(count / rows * 2 + aisle * (bays + 1) + 2 * WALL)}")
+
+    obstacles = border(size, size)
+    placed = 0
+    for r in range(rows):
+        y = WALL + aisle + r * (depth + aisle)
+        # Random composition of per_row units into bays (each at least 1)
+        cuts = sorted(rng.sample(range(1, per_row), bays - 1)) if bays > 1 else []
+        sizes = [b - a for a, b in zip([0] + cuts, cuts + [per_row])]
+        x = WALL + aisle
+        units = []
+        for k in sizes:
+            for u in range(k): units.append((x + u * unit, y, x + (u + 1) * unit, y + depth))
+            x += k * unit + aisle
+        take = min(len(units), count - placed)
+        obstacles += rounded(units[:take])
+        placed += take
+        if placed >= count: break
+
+    start = (size - WALL - aisle / 2, size - WALL - aisle / 2, math.pi)
+    goal = (WALL + aisle / 2, WALL + aisle / 2)
+    return GameMap(obstacles, start, goal, (size, size), f"warehouse-{count}-s{seed}")
+
+# ==========================================
+# 3. CLUTTER WITH A CARVED CORRIDOR
+# ==========================================
+def segment_rect_distance(x0, y0, x1, y1, ox1, oy1, ox2, oy2):
+    # Distance from one segment to many rectangles (arrays), 0 where they touch
+    dx, dy = x1 - x0, y1 - y0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Slab clip of the segment against each rectangle; a segment parallel
+        # to an axis is unbounded inside that slab and misses outside it
+        inx, iny = (ox1 <= x0) & (x0 <= ox2), (oy1 <= y0) & (y0 <= oy2)
+        ax = (ox1 - x0) / dx if dx else np.where(inx, -np.inf, np.inf)
+        bx = (ox2 - x0) / dx if dx else np.full_like(ox1, np.inf)
+        ay = (oy1 - y0) / dy if dy else np.where(iny, -np.inf, np.inf)
+        by = (oy2 - y0) / dy if dy else np.full_like(oy1, np.inf)
+    enter = np.maximum(np.maximum(np.minimum(ax, bx), np.minimum(ay, by)), 0.0)
+    leave = np.minimum(np.minimum(np.maximum(ax, bx), np.maximum(ay, by)), 1.0)
+    touching = enter <= leave
+
+    def point_rect(px, py):
+        gx = np.maximum(np.maximum(ox1 - px, 0.0), px - ox2)
+        gy = np.maximum(np.maximum(oy1 - py, 0.0), py - oy2)
+        return np.hypot(gx, gy)
+
+    def corner_segment(cx, cy):
+        length2 = dx * dx + dy * dy
+        u = np.clip(((cx - x0) * dx + (cy - y0) * dy) / length2, 0.0, 1.0) if length2 else 0.0
+        return np.hypot(cx - (x0 + u * dx), cy - (y0 + u * dy))
+
+    # Apart from touching, the closest pair always involves an endpoint or a corner
+    d = np.minimum(point_rect(x0, y0), point_rect(x1, y1))
+    for cx, cy in ((ox1, oy1), (ox1, oy2), (ox2, oy1), (ox2, oy2)):
+        np.minimum(d, corner_segment(cx, cy), out=d)
+    return np.where(touching, 0.0, d)
+
+
+def corridor(start, goal, size, rng, spacing=300.0):
+    # Start, jittered waypoints roughly every `spacing` px towards goal, goal
+    n = max(1, int(math.hypot(goal[0] - start[0], goal[1] - start[1]) // spacing))
+    lo, hi = WALL + CLEARANCE, size - WALL - CLEARANCE
+    pts = [start[:2]]
+    for k in range(1, n):
+        u = k / n
+        pts.append((float(np.clip(start[0] + (goal[0] - start[0]) * u + rng.uniform(-spacing, spacing), lo, hi)),
+                    float(np.clip(start[1] + (goal[1] - start[1]) * u + rng.uniform(-spacing, spacing), lo, hi))))
+    return pts + [goal[:2]]
+
+
+def clutter(size, count, seed=0, min_side=5.0, max_side=30.0):
+    # Boxes drawn in vectorised batches; any within CLEARANCE of the corridor
+    # polyline is discarded and redrawn until count are kept
+    rng = np.random.default_rng(seed)
+    margin = WALL + CLEARANCE
+    start = (margin + 5, margin + 5, 0.0)
+    goal = (size - margin - 5, size - margin - 5)
+    path = corridor(start, goal, size, rng)
+
+    kept, have = [], 0
+    while have < count:
+        m = int((count - have) * 1.2) + 16
+        x = rng.uniform(WALL, size - WALL - max_side, m)
+        y = rng.uniform(WALL, size - WALL - max_side, m)
+        w = rng.uniform(min_side, max_side, m)
+        h = rng.uniform(min_side, max_side, m)
+        ox1, oy1, ox2, oy2 = x, y, x + w, y + h
+        clear = np.ones(m, dtype=bool)
+        for (px0, py0), (px1, py1) in zip(path, path[1:]):
+            # Only boxes in the segment's bounding box can be near it
+            near = clear & (ox2 > min(px0, px1) - CLEARANCE) & (ox1 < max(px0, px1) + CLEARANCE) \
+                & (oy2 > min(py0, py1) - CLEARANCE) & (oy1 < max(py0, py1) + CLEARANCE)
+            idx = np.flatnonzero(near)
+            if len(idx):
+                d = segment_rect_distance(px0, py0, px1, py1, ox1[idx], oy1[idx], ox2[idx], oy2[idx])
+                clear[idx[d <= CLEARANCE]] = False
+        batch = np.stack([ox1, oy1, ox2, oy2], axis=1)[clear][:count - have]
+        kept.append(batch)
+        have += len(batch)
+
+    obstacles = border(size, size) + rounded(np.concatenate(kept))
+    return GameMap(obstacles, start, goal, (size, size), f"clutter-{count}-s{seed}")
+
+
+GENERATORS = {"maze": maze, "warehouse": warehouse, "clutter": clutter}
+
+
+def generate(kind, size, count, seed=0):
+    if kind not in GENERATORS: raise ValueError(f"unknown map kind {kind!r} (expected one of {', '.join(GENERATORS)})")
+    return GENERATORS[kind](size, count, seed)
+
+# ==========================================
+# 4. PATH CHECK
+# ==========================================
+def occupancy(obstacles, size, cell, inflate=0.0):
+    # Boolean (rows, cols) raster: True where a cell centre is within
+    # `inflate` px of an obstacle (or inside one)
+    w, h = size
+    cols, rows = int(math.ceil(w / cell)), int(math.ceil(h / cell))
+    grid = np.zeros((rows, cols), dtype=bool)
+    obs = np.asarray(obstacles, dtype=float).reshape(-1, 4)
+    # Cell centres (k + 0.5) * cell inside [x1 - inflate, x2 + inflate]
+    c1 = np.clip(np.ceil((obs[:, 0] - inflate) / cell - 0.5), 0, cols).astype(int)
+    c2 = np.clip(np.floor((obs[:, 2] + inflate) / cell - 0.5) + 1, 0, cols).astype(int)
+    r1 = np.clip(np.ceil((obs[:, 1] - inflate) / cell - 0.5), 0, rows).astype(int)
+    r2 = np.clip(np.floor((obs[:, 3] + inflate) / cell - 0.5) + 1, 0, rows).astype(int)
+    for a, b, c, d in zip(r1.tolist(), r2.tolist(), c1.tolist(), c2.tolist()):
+        if a < b and c < d: grid[a:b, c:d] = True
+    return grid
+
+
+def has_path(game_map, clearance=CLEARANCE / 2, cell=5.0):
+    # 4-connected BFS over cells whose centre keeps `clearance` px from every
+    # obstacle (box-inflated, so slightly conservative at corners)
+    grid = occupancy(game_map.obstacles, game_map.size, cell, clearance)
+    rows, cols = grid.shape
+
+    def index(x, y):
+        return min(int(y // cell), rows - 1) * cols + min(int(x // cell), cols - 1)
+
+    blocked = bytearray(grid.tobytes())
+    s, g = index(*game_map.start[:2]), index(*game_map.goal)
+    if blocked[s] or blocked[g]: return False
+    blocked[s] = 1
+    queue = deque([s])
+    while queue:
+        i = queue.popleft()
+        if i == g: return True
+        c = i % cols
+        for j in (i - cols, i + cols, i - 1 if c else -1, i + 1 if c + 1 < cols else -1):
+            if 0 <= j < len(blocked) and not blocked[j]:
+                blocked[j] = 1
+                queue.append(j)
+    return False
+
+
+def bench(counts, seed=0):
+    # Size scales with sqrt(count) so density stays roughly constant
+    print(f"  {'kind':>9} | {'target':>7} | {'size':>6} | {'obstacles':>9} | generate")
+    for kind, px_per_obstacle in (("maze", 50), ("warehouse", 45), ("clutter", 45)):
+        for n in counts:
+            size = int(math.ceil(math.sqrt(n) * px_per_obstacle))
+            t0 = time.perf_counter()
+            game_map = generate(kind, size, n, seed)
+            dt = time.perf_counter() - t0
+            print(f"  {kind:>9} | {n:>7} | {size:>6} | {len(game_map.obstacles):>9} | {dt * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Procedural maps (maze / warehouse / clutter) with a guaranteed path")
+    parser.add_argument("kind", nargs="?", choices=sorted(GENERATORS))
+    parser.add_argument("out", nargs="?", help="JSON map file to write (see mapFile.py)")
+    parser.add_argument("--size", type=int, default=2000, help="square arena side in px")
+    parser.add_argument("--count", type=int, default=1000, help="number of obstacles (approximate for mazes)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true", help="verify start-goal connectivity on a raster")
+    parser.add_argument("--bench", action="store_true", help="time 1k/10k/100k-obstacle maps of each kind")
+    args = parser.parse_args()
+
+    if args.bench:
+        bench((1000, 10000, 100000), args.seed)
+    else:
+        if not args.kind or not args.out: parser.error("kind and out are required unless --bench is given")
+        t0 = time.perf_counter()
+        game_map = generate(args.kind, args.size, args.count, args.seed)
+        print(f"{game_map.name}: {len(game_map.obstacles)} obstacles in {(time.perf_counter() - t0) * 1e3:.1f} ms")
+        if args.check:
+            t0 = time.perf_counter()
+            print(f"path start -> goal: {has_path(game_map)} ({(time.perf_counter() - t0) * 1e3:.1f} ms)")
+        save_map(game_map, args.out)
\ No newline at end of file
@@ -0,0 +1,224 @@
+import math
+import time
+import random
+import argparse
+
+from simCore import (SENSOR_RANGE, ROBOT_RADIUS, cast_rays, hits_obstacle,
+                     inflate_obstacles, segment_time_of_impact)
+
+# ==========================================
+# 1. SCRIPTED MOVERS
+# ==========================================
+# A mover is a w x h rectangle whose corner follows a polyline at constant
+# speed: "loop" goes round and back to the first point (vehicles), "pingpong"
+# runs to the end and back (sliding doors are a two-point pingpong path).
+
+
+class ScriptedObstacle:
+    def __init__(self, w, h, path, speed, mode="loop", phase=0.0):
+        self.w, self.h = w, h
+        self.path = [tuple(p) for p in path]
+        self.speed = speed
+        self.mode = mode
+        pts = self.path + [self.path[0]] if mode == "loop" else self.path
+        self.legs = [(a, b, math.hypot(b[0] - a[0], b[1] - a[1])) for a, b in zip(pts, pts[1:])]
+        self.length = sum(l for _, _, l in self.legs) or 1.0
+        self.s = phase % (self.length if mode == "loop" else 2 * self.length)
+
+    def advance(self, k=1):
+        period = self.length if self.mode == "loop" else 2 * self.length
+        self.s = (self.s + self.speed * k) % period
+
+    def rect(self):
+        s = self.s if self.s <= self.length else 2 * self.length - self.s
+        for (ax, ay), (bx, by), l in self.legs:
+            if s <= l:
+                u = s / l if l else 0.0
+                x, y = ax + (bx - ax) * u, ay + (by - ay) * u
+                break
+            s -= l
+        else:
+            x, y = self.legs[-1][1]
+        return (x, y, x + self.w, y + self.h)
+
+
+def sliding_door(x, y, w, h, travel, speed=1.0, vertical=False):
+    end = (x, y + travel) if vertical else (x + travel, y)
+    return ScriptedObstacle(w, h, [(x, y), end], speed, mode="pingpong")
+
+# ==========================================
+# 2. INCREMENTAL GRID INDEX
+# ==========================================
+class GridIndex:
+    # Uniform grid of obstacle ids. move() only touches the cells an obstacle
+    # leaves and enters; query() returns the ids in the cells overlapping a box.
+    def __init__(self, cell=100.0):
+        self.cell = cell
+        self.cells = {}
+        self.spans = {}
+        self.cell_moves = 0
+
+    def span(self, rect):
+        c = self.cell
+        return (int(rect[0] // c), int(rect[1] // c), int(rect[2] // c), int(rect[3] // c))
+
+    def span_cells(self, span):
+        cx1, cy1, cx2, cy2 = span
+        return {(cx, cy) for cx in range(cx1, cx2 + 1) for cy in range(cy1, cy2 + 1)}
+
+    def slack(self, rect):
+        # How far rect can move in any direction and keep the same cells
+        c = self.cell
+        best = c
+        for v in rect:
+            f = v % c
+            if f < best: best = f
+            if c - f < best: best = c - f
+        return best
+
+    def insert(self, oid, rect):
+        self.spans[oid] = span = self.span(rect)
+        for key in self.span_cells(span): self.cells.setdefault(key, set()).add(oid)
+
+    def remove(self, oid):
+        for key in self.span_cells(self.spans.pop(oid)):
+            bucket = self.cells[key]
+            bucket.discard(oid)
+            if not bucket: del self.cells[key]
+
+    def move(self, oid, rect):
+        old, new = self.spans[oid], self.span(rect)
+        if old == new: return
+        self.spans[oid] = new
+        before, after = self.span_cells(old), self.span_cells(new)
+        for key in before - after:
+            bucket = self.cells[key]
+            bucket.discard(oid)
+            if not bucket: del self.cells[key]
+        for key in after - before: self.cells.setdefault(key, set()).add(oid)
+        self.cell_moves += 1
+
+    def query(self, x1, y1, x2, y2):
+        c = self.cell
+        found = set()
+        for cx in range(int(x1 // c), int(x2 // c) + 1):
+            for cy in range(int(y1 // c), int(y2 // c) + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket: found.update(bucket)
+        return found
+
+# ==========================================
+# 3. WORLD WITH MOVING OBSTACLES
+# ==========================================
+class DynamicWorld:
+    # Same sense/hits/sweep trio as simCore.ObstacleWorld, plus advance(k),
+    # which run_episode calls after every move to step the movers. Static
+    # obstacles are indexed once (ids >= 0). Movers (ids < 0) only touch the
+    # index when they may have crossed a cell boundary: each keeps a slack
+    # distance it can travel without changing cells, and its rectangle is
+    # computed only when a query actually reaches it.
+    # Collision is tested against the movers' current positions, so a mover
+    # that drives over the robot is reported on the robot's next move
+    # (the swept test returns 0 when the start point is already inside).
+    # rebuild=True re-indexes everything every step (benchmark reference).
+    def __init__(self, static_obstacles, movers, radius=ROBOT_RADIUS, cell=100.0, rebuild=False):
+        self.static = list(static_obstacles)
+        self.movers = list(movers)
+        self.radius = radius
+        self.cell = cell
+        self.rebuild = rebuild
+        self.build_index()
+
+    def build_index(self):
+        self.index = GridIndex(self.cell)
+        for i, o in enumerate(self.static): self.index.insert(i, o)
+        self.slack = []
+        for i, m in enumerate(self.movers):
+            rect = m.rect()
+            self.index.insert(-1 - i, rect)
+            self.slack.append(self.index.slack(rect))
+
+    def advance(self, k=1):
+        for m in self.movers: m.advance(k)
+        if self.rebuild:
+            self.build_index()
+            return
+        slack, index = self.slack, self.index
+        for i, m in enumerate(self.movers):
+            # Path length travelled bounds the displacement
+            slack[i] -= m.speed * k
+            # At exactly 0 an edge may sit on a cell boundary, so re-index then too
+            if slack[i] <= 0:
+                rect = m.rect()
+                index.move(-1 - i, rect)
+                slack[i] = index.slack(rect)
+
+    def lookup(self, ids):
+        return [self.static[i] if i >= 0 else self.movers[-1 - i].rect() for i in ids]
+
+    def obstacles(self):
+        return self.static + [m.rect() for m in self.movers]
+
+    def near(self, x1, y1, x2, y2):
+        return self.lookup(self.index.query(x1, y1, x2, y2))
+
+    def sense(self, x, y, t):
+        r = SENSOR_RANGE
+        return cast_rays(x, y, t, self.near(x - r, y - r, x + r, y + r))
+
+    def hits(self, x, y):
+        r = self.radius
+        return hits_obstacle(x, y, inflate_obstacles(self.near(x - r, y - r, x + r, y + r), r))
+
+    def sweep(self, x0, y0, x1, y1):
+        r = self.radius
+        near = self.near(min(x0, x1) - r, min(y0, y1) - r, max(x0, x1) + r, max(y0, y1) + r)
+        return segment_time_of_impact(x0, y0, x1, y1, inflate_obstacles(near, r))
+
+# ==========================================
+# 4. BENCHMARK
+# ==========================================
+def traffic(count, size, seed=0):
+    # Vehicles patrolling random rectangles, and every tenth mover a door
+    rng = random.Random(seed)
+    movers = []
+    for i in range(count):
+        x, y = rng.uniform(20, size - 120), rng.uniform(20, size - 120)
+        if i % 10 == 9:
+            movers.append(sliding_door(x, y, 40, 8, rng.uniform(20, 60), rng.uniform(0.5, 1.5)))
+        else:
+            w, h = rng.uniform(40, 100), rng.uniform(40, 100)
+            path = [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
+            movers.append(ScriptedObstacle(12, 12, path, rng.uniform(1.0, 3.0), phase=rng.uniform(0, 400)))
+    return movers
+
+
+def bench(counts, steps, size=2000):
+    from benchSensing import clutter_map, wander
+
+    static = clutter_map(size, 500)
+    poses = wander((size / 2, size / 2, 0.0), size, steps)
+    print(f"  {'movers':>6} | {'update':>16} | {'sense + sweep':>16} | {'full rebuild':>16} | cell changes/step")
+    for n in counts:
+        row = []
+        for rebuild in (False, True):
+            world = DynamicWorld(static, traffic(n, size), rebuild=rebuild)
+            t_update = t_query = 0.0
+            for x, y, t in poses:
+                t0 = time.perf_counter()
+                world.advance()
+                t1 = time.perf_counter()
+                world.sense(x, y, t)
+                world.sweep(x, y, x + 4 * math.cos(t), y + 4 * math.sin(t))
+                t_query += time.perf_counter() - t1
+                t_update += t1 - t0
+            row.append((t_update / steps, t_query / steps, world.index.cell_moves / steps))
+        (inc, q, moves), (full, _, _) = row
+        print(f"  {n:>6} | {inc * 1e6:10.1f} us/st | {q * 1e6:10.1f} us/st | {full * 1e6:10.1f} us/st | {moves:8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-step cost of moving obstacles")
+    parser.add_argument("--steps", type=int, default=300)
+    args = parser.parse_args()
+    bench((10, 100, 1000, 5000), args.steps)
\ No newline at end of file
@@ -0,0 +1,351 @@
+import os
+import math
+import json
+import time
+import random
+import argparse
+
+import numpy as np
+
+from simCore import (SENSOR_ANGLES, SENSOR_RANGE, GOAL_RADIUS, SPEED_SCALE, GridSensor, ObstacleGrid,
+                     goal_angle_error, held_command_pose, hits_obstacle, segment_time_of_impact)
+from trainFuzzyGA import DynamicFuzzyBrain, random_genes
+
+# ==========================================
+# 1. SPATIAL INDEXES
+# ==========================================
+# Walls are bucketed once per map (simCore.ObstacleGrid); robots are re-hashed
+# every step. Both are uniform grids, so a query only touches the cells around
+# the robot and the cost per robot does not grow with the number of robots or
+# obstacles.
+
+AGENT_RADIUS = 8.0   # body radius for robot-robot sensing and collision (walls keep the point-robot test)
+HASH_STRIDE = 1 << 20
+
+RUNNING, GOAL, COLLISION, CRASH, TIMEOUT = 0, 1, 2, 3, 4
+STATUS_NAMES = {RUNNING: "RUNNING", GOAL: "GOAL", COLLISION: "COLLISION", CRASH: "CRASH", TIMEOUT: "TIMEOUT"}
+
+# simCore.RobotState as one packed record per robot (69 bytes with goal and last command)
+AGENT_DTYPE = np.dtype([("x", np.float64), ("y", np.float64), ("t", np.float64),
+                        ("steps", np.int32), ("path_len", np.float64), ("smoothness", np.float64),
+                        ("status", np.int8), ("goal_x", np.float64), ("goal_y", np.float64),
+                        ("speed", np.float32), ("turn", np.float32)])
+
+
+def robot_state_array(n):
+    return np.zeros(n, dtype=AGENT_DTYPE)
+
+
+class SpatialHash:
+    # Robot positions bucketed by cell, rebuilt from the state arrays each step.
+    # Neighbour pairs for all robots come out of one vectorised pass: each
+    # robot looks up its 3x3 block of cells in the sorted cell keys.
+    def __init__(self, cell):
+        self.cell = cell
+
+    def keys(self, cx, cy):
+        return cx * HASH_STRIDE + cy
+
+    def pairs(self, xs, ys, idx, radius):
+        # (a, b) index arrays of robots in idx closer than radius (a != b, both orders)
+        if radius > self.cell: raise ValueError("query radius larger than the hash cell")
+        cx = np.floor(xs[idx] / self.cell).astype(np.int64)
+        cy = np.floor(ys[idx] / self.cell).astype(np.int64)
+        keys = self.keys(cx, cy)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys, sorted_idx = keys[order], idx[order]
+
+        a_parts, b_parts = [], []
+        for ox in (-1, 0, 1):
+            for oy in (-1, 0, 1):
+                q = self.keys(cx + ox, cy + oy)
+                lo = np.searchsorted(sorted_keys, q, "left")
+                counts = np.searchsorted(sorted_keys, q, "right") - lo
+                total = counts.sum()
+                if total == 0: continue
+                offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                a_parts.append(np.repeat(idx, counts))
+                b_parts.append(sorted_idx[np.repeat(lo, counts) + offsets])
+        if not a_parts: return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return close_pairs(xs, ys, np.concatenate(a_parts), np.concatenate(b_parts), radius)
+
+
+def all_pairs(xs, ys, idx, radius):
+    # Brute-force reference for SpatialHash.pairs
+    a, b = np.repeat(idx, len(idx)), np.tile(idx, len(idx))
+    return close_pairs(xs, ys, a, b, radius)
+
+
+def close_pairs(xs, ys, a, b, radius):
+    keep = (a != b) & ((xs[a] - xs[b]) ** 2 + (ys[a] - ys[b]) ** 2 < radius * radius)
+    return a[keep], b[keep]
+
+# ==========================================
+# 2. MULTI-ROBOT SIMULATION
+# ==========================================
+class MultiAgentSim:
+    # All robots share the map and move synchronously: every running robot
+    # senses (walls plus other robots' bodies), decides, then all move. Walls
+    # use the swept test of the single-robot trainers; two bodies closer than
+    # 2 * AGENT_RADIUS after the move both crash. Finished robots leave the
+    # hash, so they are no longer seen or hit.
+    # use_hash=False checks every robot against every other (for the benchmark).
+    def __init__(self, obstacles, starts, goals, brains, max_steps=1000,
+                 speed_scale=SPEED_SCALE, angles=SENSOR_ANGLES, max_range=SENSOR_RANGE, use_hash=True, grid=None):
+        # grid: prebuilt simCore.ObstacleGrid of the obstacles (e.g. a map
+        # file's cached one, mapFile.GameMap.grid), else built here
+        n = len(starts)
+        self.n = n
+        self.obstacles = obstacles
+        self.max_steps = max_steps
+        self.speed_scale = speed_scale
+        self.max_range = max_range
+        self.use_hash = use_hash
+        self.brains = brains if isinstance(brains, (list, tuple)) else [brains] * n
+
+        # Agent state, one record per robot; the attributes are field views
+        self.state = robot_state_array(n)
+        starts, goals = np.asarray(starts, dtype=float), np.asarray(goals, dtype=float)
+        for name in AGENT_DTYPE.names: setattr(self, name, self.state[name])
+        self.x[:], self.y[:], self.t[:] = starts.T
+        self.goal_x[:], self.goal_y[:] = goals.T
+
+        self.ray_cos = np.cos(np.asarray(angles, dtype=float))
+        self.ray_sin = np.sin(np.asarray(angles, dtype=float))
+        self.grid = grid if grid is not None else ObstacleGrid(obstacles)
+        self.sensors = [GridSensor(self.grid, angles, max_range) for _ in range(n)]
+        self.hash = SpatialHash(max_range + AGENT_RADIUS)
+        self.tick = 0
+
+    def active(self):
+        return np.flatnonzero(self.status == RUNNING)
+
+    def pairs(self, active, radius):
+        if self.use_hash: return self.hash.pairs(self.x, self.y, active, radius)
+        return all_pairs(self.x, self.y, active, radius)
+
+    def robot_ranges(self, active):
+        # Distance along each ray to the nearest other robot body, (n, rays) with inf for no hit
+        ranges = np.full((self.n, len(self.ray_cos)), np.inf)
+        a, b = self.pairs(active, self.max_range + AGENT_RADIUS)
+        if len(a) == 0: return ranges
+        px, py = (self.x[b] - self.x[a])[:, None], (self.y[b] - self.y[a])[:, None]
+        c, s = np.cos(self.t[a])[:, None], np.sin(self.t[a])[:, None]
+        dx, dy = c * self.ray_cos - s * self.ray_sin, s * self.ray_cos + c * self.ray_sin
+        proj = px * dx + py * dy
+        gap = AGENT_RADIUS * AGENT_RADIUS - (px * px + py * py - proj * proj)
+        dist = np.where((gap >= 0) & (proj > 0), np.maximum(proj - np.sqrt(np.maximum(gap, 0.0)), 0.0), np.inf)
+        np.minimum.at(ranges, a, dist)
+        return ranges
+
+    def step(self):
+        # Advance every running robot by one control step; False when all are done
+        active = self.active()
+        if len(active) == 0: return False
+        self.tick += 1
+        others = self.robot_ranges(active)
+        seen = np.isfinite(others).any(axis=1)
+
+        # The per-robot loop works on Python floats; results go back into the arrays
+        xs, ys, ts = self.x.tolist(), self.y.tolist(), self.t.tolist()
+        gx, gy, steps = self.goal_x.tolist(), self.goal_y.tolist(), self.steps.tolist()
+        moved = []
+        for i in active.tolist():
+            x, y, t = xs[i], ys[i], ts[i]
+            angle_err, goal_dist = goal_angle_error(x, y, t, (gx[i], gy[i]))
+            if goal_dist < GOAL_RADIUS:
+                self.status[i] = GOAL; continue
+            if steps[i] >= self.max_steps:
+                self.status[i] = TIMEOUT; continue
+
+            sensor = self.sensors[i]
+            readings = sensor.sense(x, y, t)
+            if seen[i]: readings = np.minimum(readings, others[i]).tolist()
+            out = self.brains[i].compute(readings, angle_err)
+            speed, turn = out[0] * self.speed_scale, out[1]
+
+            nx, ny, nt = held_command_pose(x, y, t, speed, turn, 1)
+            # The sensor's candidates cover everything within reach of this move
+            if segment_time_of_impact(x, y, nx, ny, sensor.candidates) is not None:
+                self.status[i] = COLLISION; continue
+            xs[i], ys[i], ts[i] = nx, ny, nt
+            moved.append((i, speed, turn))
+
+        if moved:
+            # Synchronous update: every robot decided from the same snapshot
+            i, speed, turn = (np.array(c) for c in zip(*moved))
+            self.x[i], self.y[i], self.t[i] = [xs[k] for k in i], [ys[k] for k in i], [ts[k] for k in i]
+            self.steps[i] += 1
+            self.path_len[i] += speed
+            self.smoothness[i] += np.abs(turn)
+            self.speed[i], self.turn[i] = speed, turn
+        self.check_robot_collisions(self.active())
+        return True
+
+    def check_robot_collisions(self, active):
+        a, _ = self.pairs(active, 2 * AGENT_RADIUS)
+        self.status[np.unique(a)] = CRASH
+
+    def run(self, max_ticks=None):
+        while self.step():
+            if max_ticks is not None and self.tick >= max_ticks: break
+        return self.summary()
+
+    def summary(self):
+        counts = np.bincount(self.status, minlength=len(STATUS_NAMES))
+        return {STATUS_NAMES[k]: int(v) for k, v in enumerate(counts)}
+
+# ==========================================
+# 3. SCENARIOS
+# ==========================================
+def scatter_map(size, count, seed=0):
+    rng = random.Random(seed)
+    obs = [(0, 0, size, 10), (0, size - 10, size, size), (0, 0, 10, size), (size - 10, 0, size, size)]
+    for _ in range(count):
+        x, y = rng.uniform(20, size - 60), rng.uniform(20, size - 60)
+        w, h = rng.uniform(10, 40), rng.uniform(10, 40)
+        obs.append((x, y, x + w, y + h))
+    return obs
+
+
+def free_points(obstacles, size, count, spacing, seed=0, grid=None):
+    # Random points clear of walls and at least spacing apart; size is the
+    # side of a square arena or (width, height)
+    rng = random.Random(seed)
+    w, h = size if isinstance(size, tuple) else (size, size)
+    if grid is None: grid = ObstacleGrid(obstacles)
+    cell = max(spacing, 1.0)
+    taken = {}
+    pts = []
+    while len(pts) < count:
+        x, y = rng.uniform(30, w - 30), rng.uniform(30, h - 30)
+        if hits_obstacle(x, y, obstacles) or grid.near(x, y, spacing / 2): continue
+        cx, cy = int(x // cell), int(y // cell)
+        close = [p for i in (cx - 1, cx, cx + 1) for j in (cy - 1, cy, cy + 1) for p in taken.get((i, j), ())]
+        if any(math.hypot(x - px, y - py) < spacing for px, py in close): continue
+        taken.setdefault((cx, cy), []).append((x, y))
+        pts.append((x, y))
+    return pts
+
+
+def make_scenario(agents, seed=0, area_per_agent=200.0 ** 2, obstacles_per_agent=2):
+    # Map grows with the agent count so density (and per-agent work) stays constant
+    size = max(400.0, math.sqrt(agents * area_per_agent))
+    obstacles = scatter_map(size, agents * obstacles_per_agent, seed)
+    rng = random.Random(seed)
+    starts = [(x, y, rng.uniform(-math.pi, math.pi)) for x, y in free_points(obstacles, size, agents, 4 * AGENT_RADIUS, seed)]
+    goals = free_points(obstacles, size, agents, 0.0, seed + 1)
+    return size, obstacles, starts, goals
+
+
+def map_scenario(game_map, agents, seed=0):
+    # Robots spread over a map file (mapFile.py), sharing its cached wall grid
+    grid, rng = game_map.grid, random.Random(seed)
+    starts = [(x, y, rng.uniform(-math.pi, math.pi))
+              for x, y in free_points(game_map.obstacles, game_map.size, agents, 4 * AGENT_RADIUS, seed, grid)]
+    goals = free_points(game_map.obstacles, game_map.size, agents, 0.0, seed + 1, grid)
+    return max(game_map.size), game_map.obstacles, starts, goals, grid
+
+
+def load_genes(path="best_params.json"):
+    if os.path.exists(path):
+        with open(path, "r") as f: data = json.load(f)
+        if isinstance(data, dict): return [data["close_max"], data["med_min"], data["med_max"], data["far_min"]]
+        return data
+    return random_genes()
+
+# ==========================================
+# 4. VIEWER AND BENCHMARK
+# ==========================================
+class MultiAgentViewer:
+    # The simulation steps on a worker thread (see simWorker); Tk draws the
+    # newest position snapshot every frame
+    def __init__(self, root, sim, size, view=800, sim_ms=20):
+        import tkinter as tk
+        from simWorker import FRAME_MS, SimWorker
+        self.root, self.sim = root, sim
+        self.scale = view / size
+        self.frame_ms = FRAME_MS
+        root.title(f"Multi-Robot Simulation ({sim.n} robots)")
+        self.canvas = tk.Canvas(root, width=view, height=view, bg="white")
+        self.canvas.pack()
+        self.label = tk.Label(root, text="", font=("Arial", 11))
+        self.label.pack()
+
+        k = self.scale
+        for ox1, oy1, ox2, oy2 in sim.obstacles:
+            self.canvas.create_rectangle(ox1 * k, oy1 * k, ox2 * k, oy2 * k, fill="gray", outline="")
+        r = max(AGENT_RADIUS * k, 2)
+        self.r = r
+        self.dots = [self.canvas.create_oval(0, 0, 0, 0, fill="blue", outline="") for _ in range(sim.n)]
+        self.colors = {GOAL: "green", COLLISION: "red", CRASH: "orange", TIMEOUT: "gray"}
+        self.drawn_status = np.full(sim.n, RUNNING)
+        self.worker = SimWorker(sim.step, self.snapshot, period=sim_ms / 1000.0).start()
+        self.poll()
+
+    def snapshot(self):
+        # Worker thread: copies, so the next step can't change what is drawn
+        sim = self.sim
+        return sim.tick, sim.x.copy(), sim.y.copy(), sim.status.copy(), sim.summary()
+
+    def poll(self):
+        view = self.worker.latest()
+        if view is not None:
+            tick, xs, ys, status, summary = view
+            k, r = self.scale, self.r
+            for i, dot in enumerate(self.dots):
+                x, y = xs[i] * k, ys[i] * k
+                self.canvas.coords(dot, x - r, y - r, x + r, y + r)
+            for i in np.flatnonzero(status != self.drawn_status):
+                self.canvas.itemconfig(self.dots[i], fill=self.colors[status[i]])
+            self.drawn_status = status
+            self.label.config(text=f"Tick {tick} | " + " | ".join(f"{k}: {v}" for k, v in summary.items()))
+        self.root.after(self.frame_ms, self.poll)
+
+
+def benchmark(counts, ticks, genes, compare_naive=True):
+    brain = DynamicFuzzyBrain(genes)
+    for n in counts:
+        size, obstacles, starts, goals = make_scenario(n)
+        modes = [("hash", True)] + ([("all-pairs", False)] if compare_naive else [])
+        for name, use_hash in modes:
+            sim = MultiAgentSim(obstacles, starts, goals, brain, use_hash=use_hash)
+            agent_steps = 0
+            t0 = time.perf_counter()
+            for _ in range(ticks):
+                agent_steps += len(sim.active())
+                if not sim.step(): break
+            dt = time.perf_counter() - t0
+            print(f"  {n:>5} robots | {name:<9} | {dt / max(sim.tick, 1) * 1e3:8.2f} ms/tick | "
+                  f"{dt / max(agent_steps, 1) * 1e6:7.1f} us/robot-step | {sim.summary()}")
+
+
+if __name__ == "__main__":
+    from mapFile import add_map_argument, load_map
+
+    parser = argparse.ArgumentParser(description="Many fuzzy robots sharing one map")
+    parser.add_argument("--agents", type=int, default=50)
+    parser.add_argument("--headless", action="store_true", help="run to completion without a window")
+    parser.add_argument("--bench", action="store_true", help="time 10, 100 and 1000 robots")
+    parser.add_argument("--ticks", type=int, default=100, help="ticks per benchmark run")
+    parser.add_argument("--seed", type=int, default=0)
+    add_map_argument(parser)
+    args = parser.parse_args()
+
+    genes = load_genes()
+    if args.bench:
+        benchmark((10, 100, 1000), args.ticks, genes)
+    else:
+        grid = None
+        if args.map: size, obstacles, starts, goals, grid = map_scenario(load_map(args.map), args.agents, args.seed)
+        else: size, obstacles, starts, goals = make_scenario(args.agents, args.seed)
+        sim = MultiAgentSim(obstacles, starts, goals, DynamicFuzzyBrain(genes), grid=grid)
+        if args.headless:
+            t0 = time.perf_counter()
+            result = sim.run()
+            print(f"{args.agents} robots, {sim.tick} ticks in {time.perf_counter() - t0:.2f}s: {result}")
+        else:
+            import tkinter as tk
+            root = tk.Tk()
+            MultiAgentViewer(root, sim, size)
+            root.mainloop()
\ No newline at end of file
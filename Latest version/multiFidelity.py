@@ -0,0 +1,106 @@
+import math
+import time
+import argparse
+import multiprocessing as mp
+
+from surrogateGA import rank_correlation
+from trainFuzzyGA import random_genes, breed_population, OBS_COMPLEX, GOAL, START_POSE, MAX_STEPS, POP_SIZE
+
+# ==========================================
+# TWO-STAGE (MULTI-FIDELITY) EVALUATION
+# ==========================================
+# Stage 1 screens the whole population with a cheap episode in which the robot
+# senses and runs the fuzzy controller only every LOW_FI_CONTROL_EVERY steps
+# (motion and collision are still stepped every step), or alternatively moves
+# in large dt steps checked by swept collision. Stage 2 re-runs the top
+# fraction at full fidelity. Individuals that are not promoted keep their
+# low-fidelity score, capped below the weakest promoted one so a cheap estimate
+# never outranks a real one.
+
+LOW_FI_CONTROL_EVERY = 2
+
+
+class TwoStageEvaluator:
+    def __init__(self, pool, promote_fraction=0.3, control_every=LOW_FI_CONTROL_EVERY, audit_every=5, dt=1):
+        self.pool = pool
+        self.promote_fraction = promote_fraction
+        self.control_every = control_every
+        self.dt = dt
+        self.audit_every = audit_every
+        self.calls = 0
+        self.low_episodes = 0
+        self.high_episodes = 0
+        self.promoted_corr = []  # rank corr (low vs high) among promoted individuals
+        self.audit_corr = []     # rank corr over a whole population, every audit_every calls
+
+    def evaluate(self, population, generation=None):
+        # Every pass (low fidelity, promotion, audit) is recorded under the
+        # caller's generation
+        self.calls += 1
+        low = self.pool.evaluate(population, control_every=self.control_every, dt=self.dt, generation=generation)
+        self.low_episodes += len(population)
+
+        if self.audit_every and self.calls % self.audit_every == 0:
+            # Periodic full-fidelity pass to measure how well stage 1 ranks
+            high = self.pool.evaluate(population, generation=generation)
+            self.high_episodes += len(population)
+            self.audit_corr.append(rank_correlation(low, high))
+            return high
+
+        n = max(2, int(math.ceil(len(population) * self.promote_fraction)))
+        order = sorted(range(len(population)), key=lambda i: low[i], reverse=True)
+        promoted = order[:n]
+        high = self.pool.evaluate([population[i] for i in promoted], generation=generation)
+        self.high_episodes += len(promoted)
+        self.promoted_corr.append(rank_correlation([low[i] for i in promoted], high))
+
+        scores = list(low)
+        for i, f in zip(promoted, high): scores[i] = f
+        floor = min(high)
+        for i in order[n:]: scores[i] = min(low[i], floor)
+        return scores
+
+
+def run_ga(evaluate, generations, pop_size=POP_SIZE):
+    population = [random_genes() for _ in range(pop_size)]
+    best = 0.0
+    for gen in range(1, generations + 1):
+        scores = evaluate(population, generation=gen)
+        best = max(best, max(scores))
+        population = breed_population(list(zip(scores, population)), pop_size)
+    return best
+
+
+if __name__ == "__main__":
+    from sharedMap import SharedMapPool
+    from mapFile import add_map_argument, resolve_map
+    from resultsStore import add_db_argument, open_store
+
+    parser = argparse.ArgumentParser(description="Compare full-fidelity and two-stage GA evaluation")
+    parser.add_argument("--workers", type=int, default=mp.cpu_count())
+    parser.add_argument("--generations", type=int, default=10)
+    parser.add_argument("--promote", type=float, default=0.3, help="fraction promoted to full fidelity")
+    parser.add_argument("--control-every", type=int, default=LOW_FI_CONTROL_EVERY)
+    parser.add_argument("--low-dt", type=int, default=1, help="large-step low fidelity (use with --control-every 1)")
+    add_map_argument(parser)
+    add_db_argument(parser)
+    args = parser.parse_args()
+    obstacles, start, goal, distance = resolve_map(args.map, OBS_COMPLEX, START_POSE, GOAL)
+
+    store = open_store(args.db)
+    with SharedMapPool(obstacles, [start], goal, MAX_STEPS, args.workers, distance, store=store, label="multiFidelity") as pool:
+        t0 = time.perf_counter()
+        best_full = run_ga(pool.evaluate, args.generations)
+        t1 = time.perf_counter()
+        two_stage = TwoStageEvaluator(pool, args.promote, args.control_every, dt=args.low_dt)
+        best_two = run_ga(two_stage.evaluate, args.generations)
+        t2 = time.perf_counter()
+    if store is not None: store.close()
+
+    print(f"full fidelity: {(t1 - t0) / args.generations:.3f}s/gen | best {best_full:.1f}")
+    print(f"two-stage:     {(t2 - t1) / args.generations:.3f}s/gen | best {best_two:.1f} "
+          f"| {two_stage.low_episodes} low + {two_stage.high_episodes} full episodes")
+    if two_stage.promoted_corr:
+        print(f"rank corr (promoted): mean {sum(two_stage.promoted_corr) / len(two_stage.promoted_corr):.2f}")
+    if two_stage.audit_corr:
+        print(f"rank corr (full audit): {', '.join(f'{c:.2f}' for c in two_stage.audit_corr)}")
\ No newline at end of file
@@ -0,0 +1,188 @@
+import os
+import json
+import math
+import heapq
+import time
+import hashlib
+import argparse
+
+import numpy as np
+
+from mapGen import occupancy
+
+# ==========================================
+# WAVEFRONT NAVIGATION FIELD
+# ==========================================
+# angle_err normally comes from the straight-line bearing to the goal, which
+# points into walls whenever the goal is behind one. A NavField is built once
+# per (map, goal): an 8-connected Dijkstra wavefront from the goal over an
+# occupancy grid gives every free cell its next cell on the shortest path,
+# and each cell stores an aim point LOOKAHEAD cells further along. The brain
+# is then fed the bearing to that aim point, one array lookup per step.
+# Cells near walls cost more to cross, so paths keep off them.
+
+NAV_CELL = 10.0      # grid resolution in px
+NAV_CLEARANCE = 15.0  # cells within this of an obstacle are crossed at NEAR_WALL_COST
+NEAR_WALL_COST = 4.0
+LOOKAHEAD = 5        # aim this many cells down the path (~50 px)
+
+_FIELDS = {}  # in-process cache: key -> NavField
+
+
+class NavField:
+    def __init__(self, aim, cost, cell, goal):
+        # aim: (rows, cols, 2) aim points, NaN where the goal is unreachable;
+        # cost: (rows, cols) path length to the goal in px, inf if unreachable
+        self.aim = aim
+        self.cost = cost
+        self.cell = cell
+        self.goal = tuple(goal)
+        self.rows, self.cols = cost.shape
+        # Flat float view for the per-step lookup. It shares aim's buffer, so a
+        # pool worker indexes the nav_aim shared memory block (sharedMap.py)
+        # instead of holding its own copy of the grid
+        self.flat = memoryview(np.ascontiguousarray(aim, dtype=np.float64)).cast("B").cast("d")
+
+    @classmethod
+    def build(cls, obstacles, goal, size=None, cell=NAV_CELL, clearance=NAV_CLEARANCE, lookahead=LOOKAHEAD):
+        obs = np.asarray(obstacles, dtype=float).reshape(-1, 4)
+        if size is None: size = (obs[:, 2].max(), obs[:, 3].max())
+        blocked = occupancy(obs, size, cell).ravel().tolist()
+        near = occupancy(obs, size, cell, clearance).ravel().tolist()
+        rows, cols = int(math.ceil(size[1] / cell)), int(math.ceil(size[0] / cell))
+        n = rows * cols
+
+        g = min(int(goal[1] // cell), rows - 1) * cols + min(int(goal[0] // cell), cols - 1)
+        dist = [math.inf] * n
+        parent = list(range(n))
+        dist[g] = 0.0
+        heap = [(0.0, g)]
+        diag = math.sqrt(2)
+        while heap:
+            d, i = heapq.heappop(heap)
+            if d > dist[i]: continue
+            r, c = divmod(i, cols)
+            for dr, dc, step in ((-1, 0, 1.0), (1, 0, 1.0), (0, -1, 1.0), (0, 1, 1.0),
+                                 (-1, -1, diag), (-1, 1, diag), (1, -1, diag), (1, 1, diag)):
+                rr, cc = r + dr, c + dc
+                if not (0 <= rr < rows and 0 <= cc < cols): continue
+                j = rr * cols + cc
+                if blocked[j]: continue
+                # No diagonal squeezing between two blocked cells
+                if dr and dc and (blocked[r * cols + cc] or blocked[rr * cols + c]): continue
+                nd = d + step * (NEAR_WALL_COST if near[j] else 1.0)
+                if nd < dist[j]:
+                    dist[j] = nd
+                    parent[j] = i
+                    heapq.heappush(heap, (nd, j))
+
+        # Aim point: follow the parent pointers lookahead times (the goal cell
+        # is its own parent, so paths shorter than that end on it)
+        parent = np.asarray(parent)
+        ahead = parent.copy()
+        for _ in range(lookahead - 1): ahead = parent[ahead]
+        cost = np.asarray(dist).reshape(rows, cols) * cell
+        aim = np.empty((n, 2))
+        aim[:, 0] = (ahead % cols + 0.5) * cell
+        aim[:, 1] = (ahead // cols + 0.5) * cell
+        aim[ahead == g] = goal[:2]
+        aim[~np.isfinite(cost.ravel())] = np.nan
+        return cls(aim.reshape(rows, cols, 2), cost, cell, goal)
+
+    def aim_point(self, x, y):
+        # Where to steer from (x, y), or None off the grid / where the goal
+        # is unreachable (callers then fall back to the goal itself)
+        row, col = int(y // self.cell), int(x // self.cell)
+        if not (0 <= row < self.rows and 0 <= col < self.cols): return None
+        i = 2 * (row * self.cols + col)
+        ax = self.flat[i]
+        if ax != ax: return None  # NaN
+        return ax, self.flat[i + 1]
+
+    def path_length(self, x, y):
+        row, col = int(y // self.cell), int(x // self.cell)
+        if not (0 <= row < self.rows and 0 <= col < self.cols): return math.inf
+        return float(self.cost[row, col])
+
+
+def field_key(obstacles, goal, size, cell, clearance, lookahead):
+    h = hashlib.sha256(f"navfield:{goal[0]}:{goal[1]}:{size}:{cell}:{clearance}:{NEAR_WALL_COST}:{lookahead}:".encode())
+    h.update(np.asarray(obstacles, dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+def nav_field(obstacles, goal, size=None, cache_dir=None, cell=NAV_CELL, clearance=NAV_CLEARANCE, lookahead=LOOKAHEAD):
+    # Built once per (map, goal, settings) and kept for the process; with
+    # cache_dir (e.g. mapFile.CACHE_DIR) it is also stored as .npz on disk
+    key = field_key(obstacles, goal, size, cell, clearance, lookahead)
+    if key in _FIELDS: return _FIELDS[key]
+    path = os.path.join(cache_dir, f"nav-{key}.npz") if cache_dir else None
+    field = None
+    if path and os.path.exists(path):
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                field = NavField(z["aim"], z["cost"], float(z["cell"]), tuple(z["goal"].tolist()))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring unreadable nav field cache {path}: {e}")
+    if field is None:
+        field = NavField.build(obstacles, goal, size, cell, clearance, lookahead)
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = path + ".tmp.npz"
+            np.savez(tmp, aim=field.aim, cost=field.cost, cell=np.array(cell), goal=np.asarray(goal[:2], float))
+            os.replace(tmp, path)
+    _FIELDS[key] = field
+    return field
+
+
+def compare(obstacles, start, goal, nav, genes_list, max_steps, starts=()):
+    # Same brains and scenarios with the straight-line and the wavefront heading
+    from simCore import ObstacleWorld, run_episode
+    from trainFuzzyGA import DynamicFuzzyBrain
+
+    world = ObstacleWorld(obstacles)
+    scenarios = [start] + list(starts)
+    for label, field in (("straight bearing", None), ("wavefront", nav)):
+        t0 = time.perf_counter()
+        results = [run_episode(DynamicFuzzyBrain(genes), world, s, goal, max_steps, nav=field)
+                   for genes in genes_list for s in scenarios]
+        cpu = time.perf_counter() - t0
+        goals = [r for r in results if r["status"] == "GOAL"]
+        mean_steps = sum(r["steps"] for r in results) / len(results)
+        goal_steps = sum(r["steps"] for r in goals) / len(goals) if goals else float("nan")
+        print(f"  {label:>16}: {len(goals):>4}/{len(results)} reach the goal | {mean_steps:6.1f} steps/episode"
+              f" ({goal_steps:6.1f} when successful) | {len(goals) / cpu:7.1f} successful episodes per CPU-s")
+
+
+if __name__ == "__main__":
+    import random
+    from trainFuzzyGA import OBS_COMPLEX, START_POSE, GOAL, MAX_STEPS, random_genes
+    from mapFile import add_map_argument, resolve_map
+    from simCore import hits_obstacle, inflate_obstacles
+
+    parser = argparse.ArgumentParser(description="Straight-line vs wavefront goal heading on the same brains")
+    parser.add_argument("--brains", type=int, default=30, help="random gene vectors to evaluate")
+    parser.add_argument("--starts", type=int, default=4, help="extra random start poses")
+    parser.add_argument("--seed", type=int, default=0)
+    add_map_argument(parser)
+    args = parser.parse_args()
+    obstacles, start, goal, _ = resolve_map(args.map, OBS_COMPLEX, START_POSE, GOAL)
+
+    random.seed(args.seed)
+    genes_list = [random_genes() for _ in range(args.brains)]
+    if os.path.exists("best_params.json"):
+        with open("best_params.json") as f: genes_list.append(json.load(f))
+
+    # Extra starts: random poses clear of walls with a path to the goal
+    t0 = time.perf_counter()
+    nav = nav_field(obstacles, goal)
+    print(f"nav field {nav.rows}x{nav.cols} cells built in {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+    rng = random.Random(args.seed)
+    inflated = inflate_obstacles(obstacles, NAV_CLEARANCE)
+    starts = []
+    while len(starts) < args.starts:
+        x, y = rng.uniform(0, nav.cols * nav.cell), rng.uniform(0, nav.rows * nav.cell)
+        if not hits_obstacle(x, y, inflated) and nav.path_length(x, y) < math.inf:
+            starts.append((x, y, rng.uniform(-math.pi, math.pi)))
+    compare(obstacles, start, goal, nav, genes_list, MAX_STEPS, starts)
\ No newline at end of file
@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import argparse
+import tempfile
+from contextlib import contextmanager
+
+# ==========================================
+# VERSIONED PARAMETER REGISTRY
+# ==========================================
+# Trained membership parameters are published as numbered entries in one JSON
+# file instead of overwriting a bare list:
+#
+#   {"format": 1, "entries": [
+#       {"id": 3, "genes": [c_max, m_min, m_max, f_min], "fitness": 6716.8,
+#        "map": "complex", "run_id": 12, "source": "liveTrainer",
+#        "saved": 1760000000.0}, ...]}
+#
+# Writers take a lock file, write a temporary file next to the registry,
+# fsync it and os.replace() it over the old one, so readers only ever see a
+# complete registry. Every publish also rewrites best_params.json (the newest
+# genes as a bare list) for the tools that still read that file.
+# Running apps poll with a RegistryWatcher (a stat() per check) and swap the
+# brain's parameters between two simulation steps.
+
+# Next to this file, not the working directory, so FUZZgui.py launched from the
+# repo root and the trainers in Latest version share one registry
+HERE = os.path.dirname(os.path.abspath(__file__))
+REGISTRY = os.path.join(HERE, "param_registry.json")
+BEST_PARAMS = os.path.join(HERE, "best_params.json")
+REGISTRY_FORMAT = 1
+LOCK_TIMEOUT = 10.0   # s; an older lock file is treated as left over from a crash
+RELOAD_MS = 1000      # how often the GUIs check the registry
+
+
+class RegistryError(ValueError):
+    pass
+
+
+def atomic_write_json(path, data):
+    atomic_write_text(path, json.dumps(data, indent=1))
+
+
+def atomic_write_text(path, text):
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=folder)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)  # mkstemp creates it owner-only
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp): os.remove(tmp)
+        raise
+
+
+@contextmanager
+def locked(path, timeout=LOCK_TIMEOUT):
+    lock = path + ".lock"
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock) > timeout:
+                    os.remove(lock)  # stale
+                    continue
+            except OSError:
+                continue  # released meanwhile
+            if time.monotonic() > deadline: raise RegistryError(f"{lock} is held by another writer")
+            time.sleep(0.05)
+    try:
+        os.close(fd)
+        yield
+    finally:
+        os.remove(lock)
+
+
+def load(path=REGISTRY):
+    if not os.path.exists(path): return {"format": REGISTRY_FORMAT, "entries": []}
+    try:
+        with open(path, "r") as f: data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise RegistryError(f"{path}: {e}") from None
+    if not isinstance(data, dict) or data.get("format") != REGISTRY_FORMAT or not isinstance(data.get("entries"), list):
+        raise RegistryError(f"{path}: not a format {REGISTRY_FORMAT} parameter registry")
+    return data
+
+
+def latest(path=REGISTRY):
+    entries = load(path)["entries"]
+    return max(entries, key=lambda e: e["id"]) if entries else None
+
+
+def publish(genes, fitness=None, map_name=None, run_id=None, source=None, path=REGISTRY, legacy=BEST_PARAMS):
+    genes = [float(g) for g in genes]
+    if len(genes) != 4: raise RegistryError(f"expected 4 genes, got {len(genes)}")
+    with locked(path):
+        registry = load(path)
+        entry = {"id": max((e["id"] for e in registry["entries"]), default=0) + 1, "genes": genes,
+                 "fitness": fitness, "map": map_name, "run_id": run_id, "source": source, "saved": time.time()}
+        registry["entries"].append(entry)
+        atomic_write_json(path, registry)
+        if legacy: atomic_write_json(legacy, genes)
+    return entry
+
+
+def read_legacy(path=BEST_PARAMS):
+    # best_params.json: a bare list, or the old dict form
+    with open(path, "r") as f: data = json.load(f)
+    if isinstance(data, dict): data = [data["close_max"], data["med_min"], data["med_max"], data["far_min"]]
+    return [float(g) for g in data]
+
+
+def current_genes(path=REGISTRY, legacy=BEST_PARAMS):
+    # (genes, entry) of the newest entry; without a registry, the genes in
+    # best_params.json with entry None. path=None skips the registry.
+    entry = latest(path) if path else None
+    if entry is not None: return entry["genes"], entry
+    if legacy and os.path.exists(legacy): return read_legacy(legacy), None
+    return None, None
+
+
+class RegistryWatcher:
+    # poll() returns the newest entry once, when one newer than the last seen
+    # appears. since_latest: entries already published at start don't count.
+    def __init__(self, path=REGISTRY, since_latest=True):
+        self.path = path
+        self.stamp = None
+        self.seen = 0
+        if since_latest:
+            try:
+                entry = latest(path)
+                if entry is not None: self.seen = entry["id"]
+            except RegistryError as e:
+                print(f"Parameter registry: {e}")
+
+    def poll(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if stamp == self.stamp: return None
+        self.stamp = stamp
+        try:
+            entry = latest(self.path)
+        except RegistryError as e:
+            print(f"Parameter registry: {e}")
+            return None
+        if entry is None or entry["id"] <= self.seen: return None
+        self.seen = entry["id"]
+        return entry
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Versioned fuzzy parameter registry")
+    parser.add_argument("--registry", default=REGISTRY)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list", help="list entries")
+    p = sub.add_parser("publish", help="publish genes as a new version")
+    p.add_argument("genes", type=float, nargs=4, metavar="G")
+    p.add_argument("--fitness", type=float)
+    p.add_argument("--map")
+    u = sub.add_parser("use", help="republish an older entry as the newest version (rollback)")
+    u.add_argument("id", type=int)
+    i = sub.add_parser("import", help="publish the genes in a best_params.json file")
+    i.add_argument("path", nargs="?", default=BEST_PARAMS)
+    args = parser.parse_args()
+
+    if args.cmd == "list":
+        for e in load(args.registry)["entries"]:
+            fitness = f"{e['fitness']:8.1f}" if e.get("fitness") is not None else "       -"
+            print(f"v{e['id']:<3} | {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(e['saved']))} | {fitness} | "
+                  f"{e.get('map') or '-':<10} | {e.get('source') or '-':<12} | {[round(g, 2) for g in e['genes']]}")
+    elif args.cmd == "publish":
+        print(f"published v{publish(args.genes, args.fitness, args.map, source='cli', path=args.registry)['id']}")
+    elif args.cmd == "use":
+        old = next((e for e in load(args.registry)["entries"] if e["id"] == args.id), None)
+        if old is None: raise SystemExit(f"no entry v{args.id}")
+        entry = publish(old["genes"], old.get("fitness"), old.get("map"), old.get("run_id"), f"rollback v{args.id}", args.registry)
+        print(f"published v{entry['id']} (copy of v{args.id})")
+    else:
+        if not os.path.exists(args.path): raise SystemExit(f"{args.path} not found")
+        genes = read_legacy(args.path)
+        print(f"published v{publish(genes, source='import', path=args.registry, legacy=None)['id']}")
\ No newline at end of file
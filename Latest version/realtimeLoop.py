@@ -0,0 +1,272 @@
+import math
+import time
+import random
+import bisect
+import argparse
+from contextlib import contextmanager
+
+from simCore import SPEED_SCALE, RobotState, SweptCollider, cast_rays, goal_angle_error
+from simWorker import SimWorker
+from paramRegistry import atomic_write_text
+
+# ==========================================
+# 1. DEADLINE-AWARE CONTROL LOOP
+# ==========================================
+# RealtimeWorker is a SimWorker whose steps are control cycles on a fixed
+# period grid (perf_counter, monotonic). Cycle k is released at t0 + k*period
+# and must finish by release + budget (default: the period). For every cycle
+# it records:
+#   - jitter: how late the cycle started after its release,
+#   - the phases the step marks with `with worker.phase("sense"):` etc.,
+#   - the whole cycle, release to end; past the deadline it is a miss.
+# A cycle that runs into the next release skips the missed releases and stays
+# on the grid, instead of starting the next cycle at once.
+#
+# The step asks resolve(command) before acting. On time, the command is used.
+# Past the deadline, the policy decides:
+#   skip     - don't act this cycle,
+#   hold     - act on the last on-time command again,
+#   degrade  - act on it, then use the cheap fallback controller
+#              (fallback_command) until `recover` cycles in a row are on time.
+# With period 0 (as fast as possible) there are no deadlines, only timings.
+
+SKIP, HOLD, DEGRADE = "skip", "hold", "degrade"
+POLICIES = (SKIP, HOLD, DEGRADE)
+RECOVER_CYCLES = 20
+PHASES = ("sense", "compute", "act")
+BUCKETS_MS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 50, 100, 250)
+EXPORT_S = 5.0       # how often the apps rewrite the metrics file
+METRIC = "fuzzy_control"
+FALLBACK_CLOSE = 30.0  # px; reaches the goal of the complex map on its own at either speed scale
+
+
+class LatencyHistogram:
+    # Cumulative-bucket histogram in ms, Prometheus style
+    def __init__(self, bounds=BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.sum += ms
+        if ms > self.max: self.max = ms
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-quantile (the max for +Inf)
+        if not self.count: return None
+        target, seen = q * self.count, 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= target: return bound
+        return self.max
+
+    def prometheus(self, name, labels):
+        counts, total, count = list(self.counts), self.sum, self.count  # the worker may be observing
+        lines, seen = [], 0
+        for bound, n in zip(self.bounds + ("+Inf",), counts):
+            seen += n
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {seen}')
+        lines.append(f"{name}_sum{{{labels}}} {total:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {count}")
+        return lines
+
+
+def fallback_command(sensors, goal_angle, close=FALLBACK_CLOSE):
+    # The degraded controller: a few comparisons instead of fuzzy inference,
+    # with the brain's output turns and speeds (Slow near walls, else Medium)
+    front, front_left, front_right, left, right = sensors
+    if front < close: return 2.0, (-0.8 if front_left < front_right else 0.8)
+    if front_left < close: return 2.0, -0.3
+    if front_right < close: return 2.0, 0.3
+    if (goal_angle > 0 and left < close) or (goal_angle < 0 and right < close): return 4.0, 0.0  # follow the wall
+    return 4.0, max(-0.3, min(0.3, goal_angle))
+
+
+class RealtimeWorker(SimWorker):
+    def __init__(self, step, snapshot, period=0.0, budget=None, policy=HOLD, recover=RECOVER_CYCLES, maxsize=2):
+        if policy not in POLICIES: raise ValueError(f"policy must be one of {', '.join(POLICIES)}")
+        super().__init__(step, snapshot, period, maxsize)
+        self.budget = budget  # s; None = the period
+        self.policy = policy
+        self.recover = recover
+        self.hist = {name: LatencyHistogram() for name in ("jitter",) + PHASES + ("cycle",)}
+        self.cycles = self.misses = self.missed_releases = 0
+        self.skipped = self.held = self.degraded_cycles = 0
+        self.degraded = 0         # cycles left on the fallback controller
+        self.last_command = None  # last command acted on in time
+        self.deadline = None
+
+    # --- Worker thread: called from step() ---
+    @contextmanager
+    def phase(self, name):
+        t0 = time.perf_counter()
+        try: yield
+        finally: self.hist[name].observe((time.perf_counter() - t0) * 1000.0)
+
+    def late(self):
+        return self.deadline is not None and time.perf_counter() > self.deadline
+
+    def use_fallback(self):
+        return self.degraded > 0
+
+    def resolve(self, command):
+        # The command to act on this cycle, or None for no action
+        if not self.late():
+            self.last_command = command
+            return command
+        if self.policy == SKIP:
+            self.skipped += 1
+            return None
+        if self.policy == HOLD:
+            self.held += 1
+            return self.last_command
+        self.degraded = self.recover
+        self.last_command = command
+        return command
+
+    # --- Scheduling (SimWorker hooks) ---
+    def run_step(self, release):
+        period = self.period
+        start = time.perf_counter()
+        self.deadline = release + (self.budget or period) if period > 0 else None
+        fallback = self.degraded > 0
+        if not self.step(): return False
+        end = time.perf_counter()
+        self.cycles += 1
+        if fallback: self.degraded_cycles += 1
+        if period > 0:
+            self.hist["jitter"].observe(max(0.0, start - release) * 1000.0)
+            self.hist["cycle"].observe((end - release) * 1000.0)
+            if end > self.deadline: self.misses += 1
+            elif self.degraded: self.degraded -= 1
+        else:
+            self.hist["cycle"].observe((end - start) * 1000.0)
+        return True
+
+    def reschedule(self, missed):
+        # Skip the releases already past, keeping the period grid
+        period = self.period
+        behind = int((time.perf_counter() - missed) / period) + 1
+        self.missed_releases += behind
+        return missed + behind * period
+
+    # --- Any thread: reporting ---
+    def counters(self):
+        return {"cycles": self.cycles, "deadline_misses": self.misses, "missed_releases": self.missed_releases,
+                "skipped": self.skipped, "held": self.held, "degraded_cycles": self.degraded_cycles}
+
+    def summary(self):
+        parts = [f"{self.cycles} cycles, {self.misses} misses ({self.misses / max(1, self.cycles):.1%}), "
+                 f"{self.missed_releases} releases skipped, policy {self.policy}: "
+                 f"{self.skipped} skipped / {self.held} held / {self.degraded_cycles} degraded"]
+        for name, h in self.hist.items():
+            if h.count:
+                parts.append(f"  {name:<8} mean {h.sum / h.count:7.3f} ms | p50 <= {h.quantile(0.5)} ms | "
+                             f"p99 <= {h.quantile(0.99)} ms | max {h.max:.3f} ms")
+        return "\n".join(parts)
+
+    def prometheus(self, app):
+        lines = [f"# HELP {METRIC}_latency_ms Control loop timings (jitter, phases, whole cycle) in ms",
+                 f"# TYPE {METRIC}_latency_ms histogram"]
+        for name, h in self.hist.items():
+            lines += h.prometheus(f"{METRIC}_latency_ms", f'app="{app}",phase="{name}"')
+        for key, value in self.counters().items():
+            lines += [f"# TYPE {METRIC}_{key}_total counter", f'{METRIC}_{key}_total{{app="{app}"}} {value}']
+        lines += [f"# TYPE {METRIC}_period_ms gauge", f'{METRIC}_period_ms{{app="{app}"}} {self.period * 1000.0:g}',
+                  f"# TYPE {METRIC}_budget_ms gauge",
+                  f'{METRIC}_budget_ms{{app="{app}"}} {(self.budget or self.period) * 1000.0:g}']
+        return "\n".join(lines) + "\n"
+
+    def export(self, path, app):
+        # Prometheus text format, e.g. for node_exporter's textfile collector
+        atomic_write_text(path, self.prometheus(app))
+
+
+def add_realtime_arguments(parser):
+    parser.add_argument("--budget-ms", type=float, help="deadline per control cycle (default: the step period)")
+    parser.add_argument("--overrun", choices=POLICIES, default=HOLD, help="what a cycle past its deadline does")
+    parser.add_argument("--rt-metrics", metavar="PATH", help=f"write loop latency histograms here every {EXPORT_S:g}s "
+                        "(Prometheus text format, see realtimeLoop.py)")
+
+# ==========================================
+# 2. HEADLESS CONTROL LOOP
+# ==========================================
+# The FUZZgui robot without the window, for measuring a loop on its own. It
+# runs at the trainers' SPEED_SCALE, which the published parameters are tuned for.
+# --stress-ms adds a random busy wait (0 to 2x the value) to every fuzzy
+# compute (not to the fallback), to see each overrun policy at work.
+
+class HeadlessRobot:
+    def __init__(self, genes, obstacles, start, goal, stress_ms=0.0):
+        from trainFuzzyGA import DynamicFuzzyBrain
+        self.brain = DynamicFuzzyBrain(genes)
+        self.obstacles, self.start, self.goal = obstacles, start, goal
+        self.collider = SweptCollider(obstacles)
+        self.state = RobotState(*start)
+        self.stress = stress_ms / 1000.0
+        self.episodes = {"GOAL": 0, "COLLISION": 0}
+        self.worker = None
+
+    def step(self):
+        w, state = self.worker, self.state
+        if not state.active:
+            self.episodes[state.status] = self.episodes.get(state.status, 0) + 1
+            state.reset(*self.start)
+        x, y, t = state.x, state.y, state.t
+        with w.phase("sense"):
+            sensors = cast_rays(x, y, t, self.obstacles)
+            angle_err, goal_dist = goal_angle_error(x, y, t, self.goal)
+        with w.phase("compute"):
+            if w.use_fallback():
+                command = fallback_command(sensors, angle_err)
+            else:
+                command = self.brain.compute(sensors, angle_err)
+                if self.stress:
+                    until = time.perf_counter() + random.uniform(0, 2 * self.stress)
+                    while time.perf_counter() < until: pass
+        command = w.resolve(command)
+        with w.phase("act"):
+            if command is None: return True
+            speed, turn = command
+            speed *= SPEED_SCALE
+            nt = t + turn
+            nx, ny = x + math.cos(nt) * speed, y + math.sin(nt) * speed
+            if self.collider.time_of_impact(x, y, nx, ny) is not None: state.status = "COLLISION"
+            elif goal_dist < 15: state.status = "GOAL"
+            else:
+                state.x, state.y, state.t = nx, ny, nt
+                state.steps += 1
+        return True
+
+
+if __name__ == "__main__":
+    from mapFile import add_map_argument, resolve_map
+    from paramRegistry import current_genes
+    from trainFuzzyGA import GOAL, OBS_COMPLEX, START_POSE
+
+    parser = argparse.ArgumentParser(description="Run the fuzzy control loop headless and report its timing")
+    parser.add_argument("--period-ms", type=float, default=30.0)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--stress-ms", type=float, default=0.0, help="mean extra compute time per cycle")
+    parser.add_argument("--recover", type=int, default=RECOVER_CYCLES, help="on-time cycles before leaving degraded mode")
+    add_realtime_arguments(parser)
+    add_map_argument(parser)
+    args = parser.parse_args()
+    obstacles, start, goal, _ = resolve_map(args.map, OBS_COMPLEX, START_POSE, GOAL)
+
+    genes, _ = current_genes()
+    robot = HeadlessRobot(genes or [40, 10, 50, 40], obstacles, start, goal, args.stress_ms)
+    budget = args.budget_ms / 1000.0 if args.budget_ms else None
+    robot.worker = RealtimeWorker(robot.step, lambda: None, args.period_ms / 1000.0, budget, args.overrun, args.recover)
+    robot.worker.start()
+    end = time.perf_counter() + args.seconds
+    while time.perf_counter() < end:
+        time.sleep(min(EXPORT_S, max(0.0, end - time.perf_counter())))
+        if args.rt_metrics: robot.worker.export(args.rt_metrics, "headless")
+    robot.worker.stop()
+    print(robot.worker.summary())
+    print(f"episodes: {robot.episodes}")
\ No newline at end of file
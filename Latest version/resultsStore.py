@@ -0,0 +1,251 @@
+import json
+import hashlib
+import time
+import queue
+import sqlite3
+import argparse
+import threading
+from contextlib import closing
+
+# ==========================================
+# 1. SCHEMA
+# ==========================================
+# Every simulated episode goes into one SQLite file: the run it belongs to,
+# the genes, which scenario (start pose) of the run, and the outcome.
+# Evaluation loops only put rows on a queue; a writer thread owns the
+# connection and inserts them in batches, one transaction per batch.
+#
+# Genes are stored as their JSON text (floats keep their exact repr), which is
+# also the dedup key. A run's context hashes everything that decides an
+# episode's fitness (map, goal, scenarios, step limit, nav), so lookups can be
+# limited to results that are valid for the current setup. Low-fidelity
+# episodes (control_every, dt or max_dt > 1, see multiFidelity.py and
+# simCore.run_episode) are kept but never returned by lookup(), best() or known().
+
+DEFAULT_DB = "results.db"
+BATCH_SIZE = 500       # rows per transaction
+FLUSH_INTERVAL = 0.5   # s; a partial batch is written after this long
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    label TEXT NOT NULL,
+    goal TEXT NOT NULL,
+    scenarios TEXT NOT NULL,
+    settings TEXT NOT NULL,
+    context TEXT
+);
+CREATE TABLE IF NOT EXISTS evaluations (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    generation INTEGER,
+    genes TEXT NOT NULL,
+    scenario INTEGER NOT NULL,
+    fitness REAL NOT NULL,
+    status TEXT NOT NULL,
+    steps INTEGER NOT NULL,
+    smoothness REAL NOT NULL,
+    wall_time REAL NOT NULL,
+    control_every INTEGER NOT NULL DEFAULT 1,
+    dt INTEGER NOT NULL DEFAULT 1,
+    max_dt INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_evaluations_fitness ON evaluations(fitness);
+CREATE INDEX IF NOT EXISTS idx_evaluations_run ON evaluations(run_id);
+CREATE INDEX IF NOT EXISTS idx_evaluations_genes ON evaluations(genes);
+"""
+
+INSERT = ("INSERT INTO evaluations (run_id, generation, genes, scenario, fitness, status, steps, smoothness, "
+          "wall_time, control_every, dt, max_dt) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+
+def genes_key(genes):
+    return json.dumps([float(g) for g in genes])
+
+
+def evaluation_context(obstacles, goal, scenarios, max_steps, nav=False):
+    h = hashlib.sha256(json.dumps({"goal": [float(v) for v in goal], "max_steps": max_steps, "nav": bool(nav),
+                                   "scenarios": [[float(v) for v in s] for s in scenarios]}).encode())
+    for o in obstacles: h.update(json.dumps([float(v) for v in o]).encode())
+    return h.hexdigest()
+
+
+def connect(path):
+    con = sqlite3.connect(path, timeout=30)
+    con.execute("PRAGMA journal_mode=WAL")  # readers don't block the writer
+    con.execute("PRAGMA synchronous=NORMAL")
+    return con
+
+# ==========================================
+# 2. STORE
+# ==========================================
+class ResultsStore:
+    def __init__(self, path=DEFAULT_DB, batch=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.batch = batch
+        self.flush_interval = flush_interval
+        with closing(connect(path)) as con, con:
+            con.executescript(SCHEMA)
+            # Databases from before run contexts existed
+            if "context" not in [c[1] for c in con.execute("PRAGMA table_info(runs)")]:
+                con.execute("ALTER TABLE runs ADD COLUMN context TEXT")
+            # ... and from before adaptive-step episodes were recorded as such
+            if "max_dt" not in [c[1] for c in con.execute("PRAGMA table_info(evaluations)")]:
+                con.execute("ALTER TABLE evaluations ADD COLUMN max_dt INTEGER NOT NULL DEFAULT 1")
+            con.execute("CREATE INDEX IF NOT EXISTS idx_runs_context ON runs(context)")
+        self.rows = queue.Queue()
+        self.written = 0
+        self.error = None
+        self.thread = threading.Thread(target=self.writer, name="results-writer", daemon=True)
+        self.thread.start()
+
+    def start_run(self, label, goal, scenarios, context=None, **settings):
+        with closing(connect(self.path)) as con, con:
+            cur = con.execute("INSERT INTO runs (started, label, goal, scenarios, settings, context) VALUES (?, ?, ?, ?, ?, ?)",
+                              (time.time(), label, json.dumps(list(goal)), json.dumps([list(s) for s in scenarios]),
+                               json.dumps(settings), context))
+            return cur.lastrowid
+
+    def record(self, run_id, generation, genes, episodes, control_every=1, dt=1, max_dt=1):
+        # episodes: one (fitness, status, steps, smoothness, wall_time) per scenario.
+        # Never blocks; the writer thread does the inserting.
+        if self.error is not None: raise self.error
+        key = genes_key(genes)
+        for scenario, (fitness, status, steps, smoothness, wall) in enumerate(episodes):
+            self.rows.put((run_id, generation, key, scenario, fitness, status, steps, smoothness, wall, control_every, dt, max_dt))
+
+    def writer(self):
+        con = connect(self.path)
+        try:
+            while True:
+                row = self.rows.get()
+                if row is None:
+                    self.rows.task_done()
+                    return
+                batch, done = [row], False
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch:
+                    try: row = self.rows.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty: break
+                    if row is None:
+                        done = True
+                        break
+                    batch.append(row)
+                with con: con.executemany(INSERT, batch)
+                self.written += len(batch)
+                for _ in range(len(batch) + done): self.rows.task_done()
+                if done: return
+        except sqlite3.Error as e:
+            self.error = e
+            print(f"Results store writer stopped: {e}")
+        finally:
+            con.close()
+
+    def flush(self):
+        # Waits until every recorded row is committed
+        if self.thread.is_alive(): self.rows.join()
+        if self.error is not None: raise self.error
+
+    def close(self):
+        if self.thread.is_alive():
+            self.rows.put(None)
+            self.thread.join()
+        if self.error is not None: raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Queries (own connection per call, so any thread can ask) ---
+    def query(self, sql, params=()):
+        with closing(connect(self.path)) as con:
+            return con.execute(sql, params).fetchall()
+
+    def lookup(self, genes, scenarios=None, context=None):
+        # Mean full-fidelity fitness of these exact genes over a run's scenarios
+        # (all scenario indexes 0..scenarios-1 must be present), or None.
+        # With a context, only runs evaluated under it count.
+        sql = ("SELECT e.scenario, AVG(e.fitness) FROM evaluations e JOIN runs r ON r.id = e.run_id "
+               "WHERE e.genes = ? AND e.control_every = 1 AND e.dt = 1 AND e.max_dt = 1")
+        params = (genes_key(genes),)
+        if context is not None: sql, params = sql + " AND r.context = ?", params + (context,)
+        rows = self.query(sql + " GROUP BY e.scenario", params)
+        if not rows: return None
+        per = dict(rows)
+        n = scenarios if scenarios is not None else len(per)
+        if any(i not in per for i in range(n)): return None
+        return sum(per[i] for i in range(n)) / n
+
+    def best(self, limit=10, run_id=None, context=None):
+        # Best distinct genes by mean fitness: [(mean fitness, genes, episodes)]
+        sql = ("SELECT AVG(e.fitness) AS f, e.genes, COUNT(*) FROM evaluations e JOIN runs r ON r.id = e.run_id "
+               "WHERE e.control_every = 1 AND e.dt = 1 AND e.max_dt = 1")
+        params = ()
+        if run_id is not None: sql, params = sql + " AND e.run_id = ?", params + (run_id,)
+        if context is not None: sql, params = sql + " AND r.context = ?", params + (context,)
+        rows = self.query(sql + " GROUP BY e.genes ORDER BY f DESC LIMIT ?", params + (limit,))
+        return [(f, json.loads(g), n) for f, g, n in rows]
+
+    def known(self, context, scenarios):
+        # {genes_key: mean fitness} for every genes fully evaluated under context
+        rows = self.query("SELECT e.genes, e.scenario, AVG(e.fitness) FROM evaluations e JOIN runs r ON r.id = e.run_id "
+                          "WHERE r.context = ? AND e.control_every = 1 AND e.dt = 1 AND e.max_dt = 1 GROUP BY e.genes, e.scenario", (context,))
+        per = {}
+        for key, scenario, fitness in rows: per.setdefault(key, {})[scenario] = fitness
+        return {key: sum(f.values()) / scenarios for key, f in per.items() if all(i in f for i in range(scenarios))}
+
+    def runs(self):
+        return self.query("SELECT r.id, r.label, r.started, COUNT(e.id), MAX(e.fitness) FROM runs r "
+                          "LEFT JOIN evaluations e ON e.run_id = r.id GROUP BY r.id ORDER BY r.id")
+
+
+def add_db_argument(parser):
+    parser.add_argument("--db", help=f"record every evaluated episode in this SQLite file (e.g. {DEFAULT_DB}, see resultsStore.py)")
+
+
+def open_store(path):
+    return ResultsStore(path) if path else None
+
+
+def bench(path, rows, batch):
+    # Raw insert throughput, and how long record() keeps the caller busy
+    episode = (1234.5, "GOAL", 321, 12.5, 0.01)
+    with ResultsStore(path, batch=batch) as store:
+        run_id = store.start_run("bench", (0, 0), [(0, 0, 0)])
+        t0 = time.perf_counter()
+        for i in range(rows): store.record(run_id, i // 20, [i, 1.0, 2.0, 3.0], [episode])
+        t1 = time.perf_counter()
+        store.flush()
+        t2 = time.perf_counter()
+    print(f"{rows} rows, batch {batch}: record() {(t1 - t0) / rows * 1e6:.1f} us/row in the caller, "
+          f"committed in {t2 - t0:.2f}s ({rows / (t2 - t0):,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the evaluated-episode database")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("runs", help="list runs")
+    b = sub.add_parser("best", help="best genes by mean fitness")
+    b.add_argument("--run", type=int)
+    b.add_argument("--limit", type=int, default=10)
+    k = sub.add_parser("bench", help="time batched inserts")
+    k.add_argument("--rows", type=int, default=100000)
+    k.add_argument("--batch", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    if args.cmd == "bench":
+        bench(args.db, args.rows, args.batch)
+    else:
+        store = ResultsStore(args.db)
+        if args.cmd == "runs":
+            for run_id, label, started, n, top in store.runs():
+                print(f"{run_id:>4} | {time.strftime('%Y-%m-%d %H:%M', time.localtime(started))} | {label:<20} | "
+                      f"{n:>7} episodes | best {top if top is not None else float('nan'):8.1f}")
+        else:
+            for f, genes, n in store.best(args.limit, args.run):
+                print(f"{f:8.1f} | {n:>4} episodes | {[round(g, 2) for g in genes]}")
+        store.close()
\ No newline at end of file
@@ -0,0 +1,285 @@
+import math
+import time
+import argparse
+import functools
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+
+from simCore import SENSOR_ANGLES, SENSOR_RANGE, ROBOT_RADIUS, run_episode
+from lidar import cast_rays_batch
+
+# ==========================================
+# 1. SHARED MAP DATA
+# ==========================================
+# The map (obstacle array), its distance field and the scenario batch live in
+# multiprocessing.shared_memory blocks. Workers attach by name in their pool
+# initializer, so only gene vectors go in and fitness scalars come out.
+
+DF_CELL = 10  # distance field resolution in px
+DF_DENSE_LIMIT = 2e7  # obstacles * cells above which the field is built per obstacle window
+DF_CHUNK_CELLS = 2e7  # cap on the H*W*n temporary of the dense build
+DF_MAX = 100.0  # clearance cap of the windowed field (px)
+
+
+def build_distance_field(obstacles, cell=DF_CELL):
+    # Clearance (px) from each cell centre to the nearest obstacle, 0 inside one
+    obs = np.asarray(obstacles, dtype=np.float64).reshape(-1, 4)
+    width = int(math.ceil(obs[:, 2].max() / cell))
+    height = int(math.ceil(obs[:, 3].max() / cell))
+    cx = (np.arange(width) + 0.5) * cell
+    cy = (np.arange(height) + 0.5) * cell
+
+    if len(obs) * width * height > DF_DENSE_LIMIT:
+        return windowed_distance_field(obs, cx, cy, cell)
+    field = np.full((height, width), np.inf)
+    # Chunk over obstacles so big maps don't build a H*W*N temporary
+    step = max(1, min(256, int(DF_CHUNK_CELLS // (width * height))))
+    for i in range(0, len(obs), step):
+        chunk = obs[i:i+step]
+        ddx = np.maximum(np.maximum(chunk[:, 0][None, :] - cx[:, None], 0), cx[:, None] - chunk[:, 2][None, :])
+        ddy = np.maximum(np.maximum(chunk[:, 1][None, :] - cy[:, None], 0), cy[:, None] - chunk[:, 3][None, :])
+        # (H, W, n) via broadcasting of per-axis gaps
+        d = np.sqrt(ddy[:, None, :] ** 2 + ddx[None, :, :] ** 2).min(axis=2)
+        np.minimum(field, d, out=field)
+    return field.astype(np.float32)
+
+
+def windowed_distance_field(obs, cx, cy, cell):
+    # Large maps: each obstacle only updates the cells within DF_MAX of it, so
+    # cost grows with obstacle count instead of count * area. Cells farther
+    # than DF_MAX from everything read DF_MAX, a lower bound on their
+    # clearance, which is all the early-outs below rely on.
+    field = np.full((len(cy), len(cx)), DF_MAX)
+    c1 = np.clip(np.floor((obs[:, 0] - DF_MAX) / cell), 0, len(cx)).astype(int).tolist()
+    c2 = np.clip(np.ceil((obs[:, 2] + DF_MAX) / cell), 0, len(cx)).astype(int).tolist()
+    r1 = np.clip(np.floor((obs[:, 1] - DF_MAX) / cell), 0, len(cy)).astype(int).tolist()
+    r2 = np.clip(np.ceil((obs[:, 3] + DF_MAX) / cell), 0, len(cy)).astype(int).tolist()
+    for (x1, y1, x2, y2), a, b, c, d in zip(obs.tolist(), r1, r2, c1, c2):
+        gx = np.maximum(np.maximum(x1 - cx[c:d], 0), cx[c:d] - x2)
+        gy = np.maximum(np.maximum(y1 - cy[a:b], 0), cy[a:b] - y2)
+        window = field[a:b, c:d]
+        np.minimum(window, np.sqrt(gy[:, None] ** 2 + gx[None, :] ** 2), out=window)
+    return field.astype(np.float32)
+
+
+class SharedMapData:
+    def __init__(self, blocks, arrays, goal, owner, nav_cell=None):
+        self.blocks = blocks
+        self.arrays = arrays
+        self.goal = goal
+        self.owner = owner
+        self.nav_cell = nav_cell  # set when the nav_aim / nav_cost blocks exist
+
+    @classmethod
+    def create(cls, obstacles, scenarios, goal, cell=DF_CELL, distance=None, nav=None):
+        # distance: precomputed field (e.g. from a cached map file), else built here
+        # nav: optional navField.NavField, shared as its aim and cost arrays
+        sources = {
+            "obstacles": np.asarray(obstacles, dtype=np.float64).reshape(-1, 4),
+            "scenarios": np.asarray(scenarios, dtype=np.float64).reshape(-1, 3),
+            "distance": build_distance_field(obstacles, cell) if distance is None else np.asarray(distance, np.float32),
+        }
+        if nav is not None: sources["nav_aim"], sources["nav_cost"] = nav.aim, nav.cost
+        blocks, arrays = {}, {}
+        for key, src in sources.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(1, src.nbytes))
+            arr = np.ndarray(src.shape, dtype=src.dtype, buffer=shm.buf)
+            arr[...] = src
+            arr.flags.writeable = False
+            blocks[key] = shm
+            arrays[key] = arr
+        return cls(blocks, arrays, tuple(goal), owner=True, nav_cell=nav.cell if nav is not None else None)
+
+    def handle(self):
+        # Small picklable description: block names, shapes and dtypes only
+        spec = {k: (self.blocks[k].name, self.arrays[k].shape, self.arrays[k].dtype.str) for k in self.blocks}
+        return {"blocks": spec, "goal": self.goal, "nav_cell": self.nav_cell}
+
+    @classmethod
+    def attach(cls, handle):
+        blocks, arrays = {}, {}
+        for key, (name, shape, dtype) in handle["blocks"].items():
+            shm = shared_memory.SharedMemory(name=name)
+            arr = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+            arr.flags.writeable = False
+            blocks[key] = shm
+            arrays[key] = arr
+        return cls(blocks, arrays, handle["goal"], owner=False, nav_cell=handle["nav_cell"])
+
+    def close(self):
+        self.arrays = {}
+        for shm in self.blocks.values():
+            shm.close()
+            if self.owner: shm.unlink()
+        self.blocks = {}
+
+# ==========================================
+# 2. ARRAY-BACKED WORLD
+# ==========================================
+class SharedWorld:
+    # Same sensor and collision semantics as simCore.ObstacleWorld, but reads
+    # the obstacle array in place (no per-worker copy of the map).
+    def __init__(self, obstacles, distance, cell=DF_CELL, radius=ROBOT_RADIUS):
+        self.obs = obstacles
+        self.ox1, self.oy1, self.ox2, self.oy2 = obstacles.T
+        # Collision uses obstacles inflated by the robot radius (views when r=0)
+        self.ix1, self.iy1 = self.ox1 - radius, self.oy1 - radius
+        self.ix2, self.iy2 = self.ox2 + radius, self.oy2 + radius
+        self.distance = distance
+        self.cell = cell
+        self.radius = radius
+        self.safe_clearance = cell * math.sqrt(2) / 2 + radius + 1e-6
+
+    def sense(self, x, y, t, angles=SENSOR_ANGLES, max_range=SENSOR_RANGE):
+        return cast_rays_batch(x, y, t, self.ox1, self.oy1, self.ox2, self.oy2, angles, max_range).tolist()
+
+    def clearance(self, x, y):
+        col, row = int(x // self.cell), int(y // self.cell)
+        if 0 <= row < self.distance.shape[0] and 0 <= col < self.distance.shape[1]:
+            return float(self.distance[row, col])
+        return 0.0
+
+    def hits(self, x, y):
+        # Distance field early-out: a cell centre with enough clearance means
+        # nothing in this cell can contain the point
+        if self.clearance(x, y) > self.safe_clearance: return False
+        return bool(np.any((self.ix1 < x) & (x < self.ix2) & (self.iy1 < y) & (y < self.iy2)))
+
+    def sweep(self, x0, y0, x1, y1):
+        # Vectorized simCore.segment_time_of_impact
+        if self.clearance(x0, y0) > self.safe_clearance + math.hypot(x1 - x0, y1 - y0): return None
+        dx, dy = x1 - x0, y1 - y0
+        n = len(self.ix1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if dx != 0:
+                a, b = (self.ix1 - x0) / dx, (self.ix2 - x0) / dx
+                lo, hi = np.minimum(a, b), np.maximum(a, b)
+            else:
+                inside = (self.ix1 < x0) & (x0 < self.ix2)
+                lo, hi = np.where(inside, -np.inf, np.inf), np.where(inside, np.inf, -np.inf)
+            if dy != 0:
+                a, b = (self.iy1 - y0) / dy, (self.iy2 - y0) / dy
+                lo, hi = np.maximum(lo, np.minimum(a, b)), np.minimum(hi, np.maximum(a, b))
+            else:
+                inside = (self.iy1 < y0) & (y0 < self.iy2)
+                lo, hi = np.where(inside, lo, np.inf), np.where(inside, hi, -np.inf)
+        mask = (lo < hi) & (lo < 1.0) & (hi > 0.0)
+        if not n or not mask.any(): return None
+        return max(float(lo[mask].min()), 0.0)
+
+# ==========================================
+# 3. WORKER POOL
+# ==========================================
+_SHARED = None
+_WORLD = None
+_NAV = None
+_MAX_STEPS = None
+
+
+def _init_worker(handle, max_steps):
+    global _SHARED, _WORLD, _NAV, _MAX_STEPS
+    _SHARED = SharedMapData.attach(handle)
+    _WORLD = SharedWorld(_SHARED.arrays["obstacles"], _SHARED.arrays["distance"])
+    if _SHARED.nav_cell is not None:
+        from navField import NavField
+        _NAV = NavField(_SHARED.arrays["nav_aim"], _SHARED.arrays["nav_cost"], _SHARED.nav_cell, _SHARED.goal)
+    _MAX_STEPS = max_steps
+
+
+def _evaluate_genes(genes, control_every=1, dt=1, max_dt=1, detail=False):
+    # detail: also return (fitness, status, steps, smoothness, wall time) per
+    # scenario, for the results store
+    from trainFuzzyGA import DynamicFuzzyBrain
+    brain = DynamicFuzzyBrain(genes)
+    scenarios = _SHARED.arrays["scenarios"]
+    total = 0.0
+    episodes = []
+    for sx, sy, st in scenarios.tolist():
+        t0 = time.perf_counter()
+        r = run_episode(brain, _WORLD, (sx, sy, st), _SHARED.goal, _MAX_STEPS, control_every=control_every, dt=dt, max_dt=max_dt, nav=_NAV)
+        total += r["fitness"]
+        if detail: episodes.append((r["fitness"], r["status"], r["steps"], r["smoothness"], time.perf_counter() - t0))
+    if detail: return total / len(scenarios), episodes
+    return total / len(scenarios)
+
+
+class SharedMapPool:
+    def __init__(self, obstacles, scenarios, goal, max_steps, processes=None, distance=None, nav=None, store=None, label="sharedMap"):
+        # store: optional resultsStore.ResultsStore; every episode evaluated
+        # through this pool is then recorded under one run
+        self.processes = processes or mp.cpu_count()
+        self.data = SharedMapData.create(obstacles, scenarios, goal, distance=distance, nav=nav)
+        self.pool = mp.Pool(self.processes, initializer=_init_worker, initargs=(self.data.handle(), max_steps))
+        self.store = store
+        self.context = None
+        if store is not None:
+            from resultsStore import evaluation_context
+            self.context = evaluation_context(obstacles, goal, scenarios, max_steps, nav is not None)
+            self.run_id = store.start_run(label, goal, scenarios, self.context, max_steps=max_steps, processes=self.processes, nav=nav is not None)
+
+    def evaluate(self, population, control_every=1, dt=1, max_dt=1, generation=None):
+        # Mean fitness over the scenario batch for every gene vector.
+        # generation: the caller's GA generation, recorded with the episodes
+        population = [list(g) for g in population]
+        detail = self.store is not None
+        fn = functools.partial(_evaluate_genes, control_every=control_every, dt=dt, max_dt=max_dt, detail=detail)
+        results = self.pool.map(fn, population)
+        if not detail: return results
+        for genes, (_, episodes) in zip(population, results):
+            self.store.record(self.run_id, generation, genes, episodes, control_every, dt, max_dt)
+        return [fitness for fitness, _ in results]
+
+    def submit(self, genes, callback, error_callback=None, generation=None):
+        # Non-blocking single evaluation; callback(fitness) runs in the pool's
+        # result thread as soon as this individual finishes
+        genes = list(genes)
+        if self.store is None:
+            return self.pool.apply_async(_evaluate_genes, (genes,), callback=callback, error_callback=error_callback)
+
+        def done(result):
+            self.store.record(self.run_id, generation, genes, result[1])
+            callback(result[0])
+        return self.pool.apply_async(_evaluate_genes, (genes,), {"detail": True}, callback=done, error_callback=error_callback)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        self.data.close()
+        if self.store is not None: self.store.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    from trainFuzzyGA import random_genes, OBS_COMPLEX, GOAL, START_POSE, MAX_STEPS, POP_SIZE
+    from mapFile import add_map_argument, map_cache_dir, resolve_map
+    from resultsStore import add_db_argument, open_store
+
+    parser = argparse.ArgumentParser(description="Evaluate a random population on shared-memory workers")
+    parser.add_argument("--workers", type=int, default=mp.cpu_count())
+    parser.add_argument("--pop", type=int, default=POP_SIZE)
+    parser.add_argument("--max-dt", type=int, default=1, help="adaptive timestep: up to N steps per move in open space")
+    parser.add_argument("--nav", action="store_true", help="steer by a wavefront navigation field (navField.py)")
+    add_map_argument(parser)
+    add_db_argument(parser)
+    args = parser.parse_args()
+    obstacles, start, goal, distance = resolve_map(args.map, OBS_COMPLEX, START_POSE, GOAL)
+    nav = None
+    if args.nav:
+        from navField import nav_field
+        nav = nav_field(obstacles, goal, cache_dir=map_cache_dir(args.map) if args.map else None)
+
+    population = [random_genes() for _ in range(args.pop)]
+    store = open_store(args.db)
+    with SharedMapPool(obstacles, [start], goal, MAX_STEPS, args.workers, distance, nav, store) as pool:
+        t0 = time.perf_counter()
+        scores = pool.evaluate(population, max_dt=args.max_dt, generation=1)
+        dt = time.perf_counter() - t0
+    if store is not None: store.close()
+    print(f"{len(population)} individuals on {args.workers} workers in {dt:.2f}s")
+    print(f"Best fitness: {max(scores):.1f}")
\ No newline at end of file
@@ -0,0 +1,483 @@
+import math
+from array import array
+
+# ==========================================
+# HEADLESS SIMULATION CORE
+# ==========================================
+# Same sensor model, collision test and fitness as GAVisualTrainer, without
+# any canvas. Used by the worker processes so that an episode evaluated in
+# the background scores exactly like one run in the visual trainer.
+
+SENSOR_ANGLES = [0, 0.785, -0.785, 1.57, -1.57]
+SENSOR_RANGE = 150.0
+GOAL_RADIUS = 15
+SPEED_SCALE = 2.0  # trainers run the robot at double speed
+ROBOT_RADIUS = 0.0  # point robot, as in the original collision test (the drawn body is ~10 px)
+
+# Adaptive timestep: only integrate several steps blind when every reading
+# leaves this much room beyond the distance travelled, and the held turn
+# rate changes heading by at most ADAPTIVE_TURN_BUDGET over the whole move
+ADAPTIVE_MARGIN = 20.0
+ADAPTIVE_TURN_BUDGET = 0.1
+
+
+def cast_rays(x, y, t, obstacles, angles=SENSOR_ANGLES, max_range=SENSOR_RANGE):
+    readings = []
+    for offset in angles:
+        ray_t = t + offset
+        vx, vy = math.cos(ray_t), math.sin(ray_t)
+        closest = max_range
+        for ox1, oy1, ox2, oy2 in obstacles:
+            if abs(vx) > 0.001:
+                t1, t2 = (ox1 - x)/vx, (ox2 - x)/vx
+                if 0 < t1 < closest and oy1 <= y + t1*vy <= oy2: closest = t1
+                if 0 < t2 < closest and oy1 <= y + t2*vy <= oy2: closest = t2
+            if abs(vy) > 0.001:
+                t3, t4 = (oy1 - y)/vy, (oy2 - y)/vy
+                if 0 < t3 < closest and ox1 <= x + t3*vx <= ox2: closest = t3
+                if 0 < t4 < closest and ox1 <= x + t4*vx <= ox2: closest = t4
+        readings.append(closest)
+    return readings
+
+
+def rect_distance(x, y, rect):
+    ox1, oy1, ox2, oy2 = rect
+    dx = max(ox1 - x, 0.0, x - ox2)
+    dy = max(oy1 - y, 0.0, y - oy2)
+    return math.hypot(dx, dy)
+
+
+class IncrementalSensor:
+    # Drop-in for cast_rays that exploits temporal coherence. Obstacles within
+    # max_range + skin of an anchor point are the only ones any ray can reach
+    # while the robot stays within skin of that anchor, so only they are
+    # re-tested (obstacles entering the sensor disc are already in the list).
+    # Each ray first re-tests the obstacle it hit last step, which bounds the
+    # ray so most other candidates are rejected by a bounding-box check. The
+    # result is the same minimum as a full cast, so readings are identical.
+    def __init__(self, obstacles, angles=SENSOR_ANGLES, max_range=SENSOR_RANGE, skin=30.0):
+        self.obstacles = obstacles
+        self.angles = angles
+        self.max_range = max_range
+        self.skin = skin
+        self.anchor = None
+        self.version = None  # obstacles.version at the last rebuild (ObstacleSet)
+        self.candidates = []
+        self.last_hit = [None] * len(angles)
+        self.rebuilds = 0
+
+    def invalidate(self):
+        # Call when a plain obstacle list changes; an ObstacleSet is watched
+        # through its version
+        self.anchor = None
+
+    def rebuild(self, x, y):
+        reach = self.max_range + self.skin
+        self.candidates = [o for o in self.obstacles if rect_distance(x, y, o) <= reach]
+        self.anchor = (x, y)
+        self.version = getattr(self.obstacles, "version", None)
+        self.last_hit = [None] * len(self.angles)
+        self.rebuilds += 1
+
+    def sense(self, x, y, t):
+        if (self.anchor is None or math.hypot(x - self.anchor[0], y - self.anchor[1]) > self.skin
+                or getattr(self.obstacles, "version", None) != self.version):
+            self.rebuild(x, y)
+
+        readings = []
+        for i, offset in enumerate(self.angles):
+            ray_t = t + offset
+            vx, vy = math.cos(ray_t), math.sin(ray_t)
+            prev = self.last_hit[i]
+            order = self.candidates if prev is None else [prev] + self.candidates
+            closest = self.max_range
+            hit = None
+            bx1, bx2 = min(x, x + vx*closest), max(x, x + vx*closest)
+            by1, by2 = min(y, y + vy*closest), max(y, y + vy*closest)
+
+            for o in order:
+                ox1, oy1, ox2, oy2 = o
+                if ox1 > bx2 or ox2 < bx1 or oy1 > by2 or oy2 < by1: continue
+                best = closest
+                if abs(vx) > 0.001:
+                    t1, t2 = (ox1 - x)/vx, (ox2 - x)/vx
+                    if 0 < t1 < closest and oy1 <= y + t1*vy <= oy2: closest = t1
+                    if 0 < t2 < closest and oy1 <= y + t2*vy <= oy2: closest = t2
+                if abs(vy) > 0.001:
+                    t3, t4 = (oy1 - y)/vy, (oy2 - y)/vy
+                    if 0 < t3 < closest and ox1 <= x + t3*vx <= ox2: closest = t3
+                    if 0 < t4 < closest and ox1 <= x + t4*vx <= ox2: closest = t4
+                if closest < best:
+                    hit = o
+                    bx1, bx2 = min(x, x + vx*closest), max(x, x + vx*closest)
+                    by1, by2 = min(y, y + vy*closest), max(y, y + vy*closest)
+
+            self.last_hit[i] = hit
+            readings.append(closest)
+        return readings
+
+
+class ObstacleGrid:
+    # Obstacles bucketed into uniform cells once per map; near() returns those
+    # within reach of a point without scanning the whole map
+    def __init__(self, obstacles, cell=100.0):
+        self.cell = cell
+        self.cells = {}
+        for o in obstacles:
+            ox1, oy1, ox2, oy2 = o
+            for cx in range(int(ox1 // cell), int(ox2 // cell) + 1):
+                for cy in range(int(oy1 // cell), int(oy2 // cell) + 1):
+                    self.cells.setdefault((cx, cy), []).append(o)
+
+    def near(self, x, y, reach):
+        c = self.cell
+        found = {}
+        for cx in range(int((x - reach) // c), int((x + reach) // c) + 1):
+            for cy in range(int((y - reach) // c), int((y + reach) // c) + 1):
+                for o in self.cells.get((cx, cy), ()): found[id(o)] = o
+        return [o for o in found.values() if rect_distance(x, y, o) <= reach]
+
+
+class GridSensor(IncrementalSensor):
+    # IncrementalSensor whose candidate list comes from the wall grid instead
+    # of a scan over every obstacle on the map
+    def __init__(self, grid, angles=SENSOR_ANGLES, max_range=SENSOR_RANGE, skin=30.0):
+        super().__init__([], angles, max_range, skin)
+        self.grid = grid
+
+    def rebuild(self, x, y):
+        self.candidates = self.grid.near(x, y, self.max_range + self.skin)
+        self.anchor = (x, y)
+        self.last_hit = [None] * len(self.angles)
+        self.rebuilds += 1
+
+
+def hits_obstacle(x, y, obstacles):
+    for ox1, oy1, ox2, oy2 in obstacles:
+        if ox1 < x < ox2 and oy1 < y < oy2: return True
+    return False
+
+
+def normalize_rect(rect):
+    # (x1, y1, x2, y2) with x1 <= x2 and y1 <= y2, whichever corners were given
+    ox1, oy1, ox2, oy2 = rect
+    return (min(ox1, ox2), min(oy1, oy2), max(ox1, ox2), max(oy1, oy2))
+
+
+def inflate_obstacles(obstacles, radius):
+    # Normalized first: the point and slab tests assume x1 < x2 and y1 < y2,
+    # and an inverted rectangle would be solid from some directions only
+    return [(ox1 - radius, oy1 - radius, ox2 + radius, oy2 + radius)
+            for ox1, oy1, ox2, oy2 in map(normalize_rect, obstacles)]
+
+
+def segment_time_of_impact(x0, y0, x1, y1, obstacles):
+    # Swept version of hits_obstacle: the first fraction u in [0, 1] of the
+    # move (x0, y0) -> (x1, y1) at which the point is strictly inside a
+    # rectangle, or None. Liang-Barsky slab clipping against open rectangles.
+    dx, dy = x1 - x0, y1 - y0
+    best = None
+    for ox1, oy1, ox2, oy2 in obstacles:
+        if dx != 0:
+            lo, hi = (ox1 - x0) / dx, (ox2 - x0) / dx
+            if lo > hi: lo, hi = hi, lo
+        elif ox1 < x0 < ox2: lo, hi = -math.inf, math.inf
+        else: continue
+        if dy != 0:
+            a, b = (oy1 - y0) / dy, (oy2 - y0) / dy
+            if a > b: a, b = b, a
+            if a > lo: lo = a
+            if b < hi: hi = b
+        elif not oy1 < y0 < oy2: continue
+
+        if lo < hi and lo < 1.0 and hi > 0.0:
+            toi = lo if lo > 0.0 else 0.0
+            if best is None or toi < best: best = toi
+    return best
+
+
+def segment_circle_entry(x0, y0, x1, y1, cx, cy, r):
+    # First fraction u in [0, 1] at which the move comes within r of (cx, cy)
+    dx, dy = x1 - x0, y1 - y0
+    fx, fy = x0 - cx, y0 - cy
+    a = dx*dx + dy*dy
+    c = fx*fx + fy*fy - r*r
+    if c < 0: return 0.0
+    if a == 0: return None
+    b = 2 * (fx*dx + fy*dy)
+    disc = b*b - 4*a*c
+    if disc < 0: return None
+    u = (-b - math.sqrt(disc)) / (2*a)
+    return u if 0.0 <= u <= 1.0 else None
+
+
+class SweptCollider:
+    # Obstacles inflated by the robot radius once per map; reports time of
+    # impact so the simulator can take steps longer than a wall is thick
+    def __init__(self, obstacles, radius=ROBOT_RADIUS):
+        self.radius = radius
+        self.inflated = inflate_obstacles(obstacles, radius)
+
+    def time_of_impact(self, x0, y0, x1, y1):
+        return segment_time_of_impact(x0, y0, x1, y1, self.inflated)
+
+    def hits(self, x, y):
+        return hits_obstacle(x, y, self.inflated)
+
+
+class ObstacleSet:
+    # Fixed map plus dynamic obstacles, merged once per scenario change and
+    # shared read-only by every robot on the map. rects is the merged list
+    # the ray cast iterates; packed holds the same bounds in one contiguous
+    # float64 buffer (4 per obstacle) for NumPy consumers. add/remove patch
+    # both in place (remove swaps the last obstacle into the hole), packed
+    # first so a failed resize leaves the set unchanged, and bump version;
+    # an IncrementalSensor over the set rebuilds its candidates when it changes.
+    # An obstacle added twice (e.g. a random one equal to a fixed one) is
+    # stored once and counted, and stays until it is removed as often.
+    def __init__(self, fixed=(), dynamic=(), radius=ROBOT_RADIUS):
+        self.radius = radius
+        self.version = 0
+        self.reset(fixed, dynamic)
+
+    def reset(self, fixed, dynamic=()):
+        self.rects = []
+        self.inflated = []
+        self.packed = array("d")
+        self.slot = {}
+        self.refs = {}
+        for o in fixed: self.add(o)
+        for o in dynamic: self.add(o)
+
+    def add(self, rect):
+        rect = normalize_rect(rect)
+        if rect in self.slot:
+            self.refs[rect] += 1
+            return
+        inflated = inflate_obstacles([rect], self.radius)
+        self.packed.extend(rect)
+        self.slot[rect] = len(self.rects)
+        self.refs[rect] = 1
+        self.rects.append(rect)
+        self.inflated.extend(inflated)
+        self.version += 1
+
+    def remove(self, rect):
+        rect = normalize_rect(rect)
+        i = self.slot[rect]
+        if self.refs[rect] > 1:
+            self.refs[rect] -= 1
+            return
+        last = len(self.rects) - 1
+        tail = self.packed[4*last:]
+        del self.packed[4*last:]
+        if i != last:
+            self.packed[4*i:4*i + 4] = tail
+            moved = self.rects[last]
+            self.rects[i], self.inflated[i] = moved, self.inflated[last]
+            self.slot[moved] = i
+        del self.slot[rect], self.refs[rect]
+        self.rects.pop()
+        self.inflated.pop()
+        self.version += 1
+
+    def __len__(self):
+        return len(self.rects)
+
+    def __iter__(self):
+        return iter(self.rects)
+
+    def as_array(self):
+        # (N, 4) NumPy copy of packed. A view would export packed's buffer
+        # and make every later add/remove fail while it is alive.
+        import numpy as np
+        return np.frombuffer(self.packed, dtype=np.float64).reshape(-1, 4).copy()
+
+    def sense(self, x, y, t):
+        return cast_rays(x, y, t, self.rects)
+
+    def hits(self, x, y):
+        return hits_obstacle(x, y, self.inflated)
+
+    def time_of_impact(self, x0, y0, x1, y1):
+        return segment_time_of_impact(x0, y0, x1, y1, self.inflated)
+
+
+class RobotState:
+    # Pose and episode counters of one robot. Fixed slots, no per-step
+    # allocation; canvas items and labels are kept by the caller.
+    # status is None while running, else "GOAL" / "COLLISION" / "TIMEOUT" / ...
+    __slots__ = ("x", "y", "t", "steps", "path_len", "smoothness", "status")
+
+    def __init__(self, x=0.0, y=0.0, t=0.0):
+        self.reset(x, y, t)
+
+    def reset(self, x, y, t):
+        self.x, self.y, self.t = x, y, t
+        self.steps = 0
+        self.path_len = 0.0
+        self.smoothness = 0.0
+        self.status = None
+
+    @property
+    def active(self):
+        return self.status is None
+
+
+def goal_angle_error(x, y, t, goal, nav=None):
+    # nav: optional navField.NavField; the heading then follows the shortest
+    # free path instead of the straight line (goal distance stays Euclidean)
+    dx, dy = goal[0] - x, goal[1] - y
+    aim = nav.aim_point(x, y) if nav is not None else None
+    if aim is None: goal_heading = math.atan2(dy, dx)
+    else: goal_heading = math.atan2(aim[1] - y, aim[0] - x)
+    angle_err = (goal_heading - t + math.pi) % (2 * math.pi) - math.pi
+    return angle_err, math.hypot(dx, dy)
+
+
+def episode_fitness(start_dist, final_dist, status, steps, visited_count, max_steps):
+    fitness = (start_dist - final_dist) * 2.0
+
+    if status == "GOAL":
+        fitness += 5000.0 + (max_steps - steps) * 2
+    elif status == "COLLISION":
+        fitness -= 200.0
+
+    if steps > 50:
+        ratio = visited_count / steps
+        if ratio < 0.15: fitness -= 1000.0
+
+    return max(0.0, fitness)
+
+
+class ObstacleWorld:
+    # Plain list-of-rectangles world. Other worlds (shared memory, spatial
+    # index, ...) only need to provide the same sense/hits/sweep trio.
+    # sensor: any object with sense(x, y, t) -> 5 readings (e.g. IncrementalSensor,
+    # lidar.SectorLidar); defaults to the plain 5-ray cast.
+    def __init__(self, obstacles, radius=ROBOT_RADIUS, incremental=False, sensor=None):
+        self.obstacles = obstacles
+        self.collider = SweptCollider(obstacles, radius)
+        self.sensor = sensor
+        if sensor is None and incremental: self.sensor = IncrementalSensor(obstacles)
+
+    def sense(self, x, y, t):
+        if self.sensor is not None: return self.sensor.sense(x, y, t)
+        return cast_rays(x, y, t, self.obstacles)
+
+    def hits(self, x, y):
+        return self.collider.hits(x, y)
+
+    def sweep(self, x0, y0, x1, y1):
+        return self.collider.time_of_impact(x0, y0, x1, y1)
+
+
+def held_command_pose(x, y, t, speed, turn, k):
+    # Pose after k unit steps of (new_t = t + turn, x += cos(new_t) * speed)
+    # with the command held, in closed form (sum of a cosine series)
+    mid = t + turn * (k + 1) / 2
+    if k == 1 or abs(turn) < 1e-9: chord = speed * k
+    else: chord = speed * math.sin(k * turn / 2) / math.sin(turn / 2)
+    return x + math.cos(mid) * chord, y + math.sin(mid) * chord, t + turn * k
+
+
+def held_move_impact(world, x, y, t, speed, turn, k):
+    # Whole unit steps of a held move completed before it hits something, or
+    # None. A turning move follows an arc whose chord cuts its corners, so it
+    # is swept one unit step at a time; a straight one in a single segment.
+    if k == 1 or abs(turn) < 1e-9:
+        new_x, new_y, _ = held_command_pose(x, y, t, speed, turn, k)
+        toi = world.sweep(x, y, new_x, new_y)
+        return None if toi is None else int(toi * k)
+    px, py = x, y
+    for i in range(1, k + 1):
+        nx, ny, _ = held_command_pose(x, y, t, speed, turn, i)
+        if world.sweep(px, py, nx, ny) is not None: return i - 1
+        px, py = nx, ny
+    return None
+
+
+def adaptive_step_count(sensors, speed, turn, goal_dist, max_dt, clearance=None):
+    # How many unit steps can be integrated in one move: 1 near walls or the
+    # goal, up to max_dt when cruising in open space
+    room = min(sensors) if clearance is None else min(min(sensors), clearance)
+    if speed <= 0: return 1
+    k = min(int((room - ADAPTIVE_MARGIN) // speed), int((goal_dist - GOAL_RADIUS) // speed))
+    if abs(turn) > 1e-9: k = min(k, int(ADAPTIVE_TURN_BUDGET // abs(turn)))
+    return max(1, min(k, max_dt))
+
+
+def run_episode(brain, world, start, goal, max_steps, speed_scale=SPEED_SCALE, control_every=1, dt=1, max_dt=1, nav=None):
+    # Step-for-step copy of GAVisualTrainer.run_loop, with swept collision.
+    # With control_every > 1 the robot senses and decides only every N steps
+    # and holds that command in between (a cheap low-fidelity episode).
+    # With dt > 1 each move integrates dt held steps at once and relies on the
+    # swept test (time of impact, per unit step while turning) instead of
+    # per-step checks. With max_dt > 1
+    # the number of steps per move adapts to sensor clearance instead (unit
+    # steps near walls). Steps are always counted in unit steps so fitness
+    # and step-based metrics stay comparable. nav steers by a wavefront
+    # navigation field (see goal_angle_error).
+    x, y, t = start
+    start_dist = math.hypot(goal[0] - x, goal[1] - y)
+    visited = set()
+    steps = 0
+    path_len = 0.0
+    smoothness = 0.0
+    decisions = 0
+    status = None
+    clearance = getattr(world, "clearance", None)
+    advance = getattr(world, "advance", None)  # worlds with moving obstacles
+
+    while status is None:
+        sensors = world.sense(x, y, t)
+        angle_err, goal_dist = goal_angle_error(x, y, t, goal, nav)
+
+        out = brain.compute(sensors, angle_err)
+        speed, turn = out[0] * speed_scale, out[1]
+        decisions += 1
+
+        move_dt = dt
+        if max_dt > 1:
+            room = clearance(x, y) if clearance else None
+            move_dt = max(dt, adaptive_step_count(sensors, speed, turn, goal_dist, max_dt, room))
+
+        for _ in range(control_every):
+            k = max(1, min(move_dt, max_steps - steps))
+            new_x, new_y, new_t = held_command_pose(x, y, t, speed, turn, k)
+            impact = held_move_impact(world, x, y, t, speed, turn, k)
+
+            if impact is not None:
+                # Large steps: keep the whole unit steps completed before impact
+                k = impact
+                status = "COLLISION"
+            elif math.hypot(goal[0] - x, goal[1] - y) < GOAL_RADIUS:
+                status = "GOAL"; break
+            elif steps >= max_steps:
+                status = "TIMEOUT"; break
+            elif k > 1:
+                # Don't jump over the goal disc: stop where the move enters it
+                u = segment_circle_entry(x, y, new_x, new_y, goal[0], goal[1], GOAL_RADIUS)
+                if u is not None: k = max(1, math.ceil(u * k))
+
+            if k == 0: break
+            if k > 1 or status is not None:
+                new_x, new_y, new_t = held_command_pose(x, y, t, speed, turn, k)
+                for i in range(1, k):
+                    vx, vy, _ = held_command_pose(x, y, t, speed, turn, i)
+                    visited.add((int(vx//10), int(vy//10)))
+            x, y, t = new_x, new_y, new_t
+            visited.add((int(new_x//10), int(new_y//10)))
+            steps += k
+            if advance is not None: advance(k)
+            path_len += speed * k
+            smoothness += abs(turn) * k
+            if status is not None: break
+
+    final_dist = math.hypot(goal[0] - x, goal[1] - y)
+    fitness = episode_fitness(start_dist, final_dist, status, steps, len(visited), max_steps)
+    return {
+        "fitness": fitness, "status": status, "steps": steps,
+        "x": x, "y": y, "t": t,
+        "path_len": path_len, "smoothness": smoothness, "decisions": decisions
+    }
\ No newline at end of file
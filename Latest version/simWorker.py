@@ -0,0 +1,134 @@
+import time
+import queue
+import threading
+
+# ==========================================
+# BACKGROUND SIMULATION WORKER
+# ==========================================
+# The GUIs run physics and fuzzy inference here, on a daemon thread, and keep
+# the Tk main loop for drawing only:
+#   - step() advances the simulation and returns False when there is nothing
+#     to do (paused, finished); snapshot() returns an immutable view of the
+#     state for drawing. Only the worker thread calls either.
+#   - Snapshots go through a bounded queue. When the UI falls behind, the
+#     oldest snapshot is dropped, so the simulation never waits on rendering.
+#   - Buttons send call(fn, *args); fn runs on the worker between two steps,
+#     so simulation state is only ever touched by one thread.
+#     request(fn, *args) does the same from any thread and returns fn's result
+#     (the control socket, controlSocket.py).
+#   - The UI polls latest() every frame and draws only the newest snapshot.
+
+FRAME_MS = 33      # UI poll period (~30 fps)
+IDLE_WAIT = 0.05   # how long an idle worker waits for a command (s)
+
+
+class SimWorker:
+    def __init__(self, step, snapshot, period=0.0, maxsize=2):
+        # period: seconds between steps (0 = as fast as the simulation runs)
+        self.step = step
+        self.snapshot = snapshot
+        self.period = period
+        self.snapshots = queue.Queue(maxsize)
+        self.commands = queue.Queue()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="sim-worker", daemon=True)
+        self.steps = 0
+        self.dropped = 0
+
+    def start(self):
+        self.publish(self.snapshot())
+        self.thread.start()
+        return self
+
+    def call(self, fn, *args):
+        self.commands.put((fn, args))
+
+    def request(self, fn, *args, timeout=None):
+        # From another thread: like call(), but waits for fn's result (or exception).
+        # On timeout fn is withdrawn, so it never runs later; once it has
+        # started, the result is awaited instead
+        if threading.current_thread() is self.thread: return fn(*args)
+        done, out, lock, claimed = threading.Event(), [], threading.Lock(), []
+        def run():
+            with lock:
+                if claimed: return
+                claimed.append("worker")
+            try: out.append((fn(*args), None))
+            except Exception as e: out.append((None, e))
+            done.set()
+        self.call(run)
+        if not done.wait(timeout):
+            with lock:
+                if not claimed:
+                    claimed.append("caller")
+                    raise TimeoutError("the simulation worker did not answer in time; the command was not applied")
+            done.wait()
+        result, error = out[0]
+        if error is not None: raise error
+        return result
+
+    def stop(self, wait=True):
+        self.stopped.set()
+        if wait and self.thread.is_alive() and threading.current_thread() is not self.thread:
+            self.thread.join(1.0)
+
+    def run_commands(self, timeout=None):
+        # Runs every pending command; with a timeout, first waits that long for one
+        try: fn, args = self.commands.get(timeout=timeout) if timeout else self.commands.get_nowait()
+        except queue.Empty: return False
+        fn(*args)
+        while True:
+            try: fn, args = self.commands.get_nowait()
+            except queue.Empty: return True
+            fn(*args)
+
+    def run(self):
+        next_t = time.perf_counter()
+        while not self.stopped.is_set():
+            changed = self.run_commands()
+            if self.run_step(next_t):
+                self.steps += 1
+                changed = True
+            elif not changed:
+                # Idle: sleep until a command arrives instead of spinning
+                if self.run_commands(IDLE_WAIT): self.publish(self.snapshot())
+                next_t = time.perf_counter()
+                continue
+            if changed: self.publish(self.snapshot())
+            if self.period > 0:
+                next_t += self.period
+                delay = next_t - time.perf_counter()
+                if delay <= 0:
+                    next_t = self.reschedule(next_t)
+                    delay = next_t - time.perf_counter()
+                # Commands arriving during the wait run at once, not a period later
+                while delay > 0 and not self.stopped.is_set():
+                    if self.run_commands(min(delay, IDLE_WAIT)): self.publish(self.snapshot())
+                    delay = next_t - time.perf_counter()
+
+    def run_step(self, release):
+        # release: when this step was due (realtimeLoop.py times steps against it)
+        return self.step()
+
+    def reschedule(self, missed):
+        # Running behind: start the next step now, don't try to catch up
+        return time.perf_counter()
+
+    def publish(self, snap):
+        while True:
+            try:
+                self.snapshots.put_nowait(snap)
+                return
+            except queue.Full:
+                try:
+                    self.snapshots.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def latest(self):
+        # UI thread: newest snapshot since the last call, or None
+        snap = None
+        while True:
+            try: snap = self.snapshots.get_nowait()
+            except queue.Empty: return snap
\ No newline at end of file
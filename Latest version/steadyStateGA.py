@@ -0,0 +1,109 @@
+import time
+import queue
+import argparse
+import multiprocessing as mp
+
+from sharedMap import SharedMapPool
+from trainFuzzyGA import random_genes, make_child, breed_population, OBS_COMPLEX, GOAL, START_POSE, MAX_STEPS, POP_SIZE
+
+# ==========================================
+# GENERATIONAL vs STEADY-STATE EVOLUTION
+# ==========================================
+# Generational mode waits for the whole population (the slowest episode)
+# before breeding. Steady-state mode keeps every worker busy: each finished
+# evaluation is merged into the scored pool and immediately replaced by a
+# child bred from the current top 4.
+#
+# Both return a timeline of (seconds, evaluations, best_fitness).
+
+
+def run_generational(pool, budget, pop_size=POP_SIZE):
+    population = [random_genes() for _ in range(pop_size)]
+    timeline = []
+    evals, best, gen = 0, 0.0, 0
+    t0 = time.perf_counter()
+
+    while evals < budget:
+        gen += 1
+        scores = pool.evaluate(population, generation=gen)
+        evals += len(population)
+        best = max(best, max(scores))
+        timeline.append((time.perf_counter() - t0, evals, best))
+        population = breed_population(list(zip(scores, population)), pop_size)
+    return timeline
+
+
+def run_steady_state(pool, budget, pop_size=POP_SIZE, in_flight=None):
+    in_flight = in_flight or pool.processes * 2
+    results = queue.Queue()
+    scored = []  # best pop_size (fitness, genes), sorted descending
+    timeline = []
+    submitted, done = 0, 0
+    t0 = time.perf_counter()
+
+    def spawn():
+        # First pop_size individuals are random, like generation 1
+        if submitted < pop_size or len(scored) < 4: genes = random_genes()
+        else: genes = make_child([g for _, g in scored[:4]])
+        pool.submit(genes, lambda f, g=genes: results.put((f, g)), error_callback=lambda e: results.put((e, None)))
+
+    while submitted < min(in_flight, budget):
+        spawn()
+        submitted += 1
+
+    while done < budget:
+        fitness, genes = results.get()
+        if isinstance(fitness, BaseException): raise fitness
+        done += 1
+
+        scored.append((fitness, genes))
+        scored.sort(key=lambda x: x[0], reverse=True)
+        del scored[pop_size:]
+        timeline.append((time.perf_counter() - t0, done, scored[0][0]))
+
+        if submitted < budget:
+            spawn()
+            submitted += 1
+    return timeline
+
+
+def best_at(timeline, seconds):
+    best = 0.0
+    for t, _, b in timeline:
+        if t > seconds: break
+        best = b
+    return best
+
+
+def print_comparison(gen_tl, ss_tl):
+    gen_t, gen_n = gen_tl[-1][0], gen_tl[-1][1]
+    ss_t, ss_n = ss_tl[-1][0], ss_tl[-1][1]
+    print(f"{'mode':<14}{'evals':>8}{'time (s)':>10}{'evals/s':>10}{'best':>10}")
+    print(f"{'generational':<14}{gen_n:>8}{gen_t:>10.2f}{gen_n / gen_t:>10.1f}{gen_tl[-1][2]:>10.1f}")
+    print(f"{'steady-state':<14}{ss_n:>8}{ss_t:>10.2f}{ss_n / ss_t:>10.1f}{ss_tl[-1][2]:>10.1f}")
+
+    print("\nBest fitness over time:")
+    horizon = max(gen_t, ss_t)
+    for frac in (0.1, 0.25, 0.5, 0.75, 1.0):
+        sec = horizon * frac
+        print(f"  t={sec:6.2f}s  generational={best_at(gen_tl, sec):8.1f}  steady-state={best_at(ss_tl, sec):8.1f}")
+
+
+if __name__ == "__main__":
+    from mapFile import add_map_argument, resolve_map
+    from resultsStore import add_db_argument, open_store
+
+    parser = argparse.ArgumentParser(description="Compare generational and steady-state GA throughput")
+    parser.add_argument("--workers", type=int, default=mp.cpu_count())
+    parser.add_argument("--budget", type=int, default=POP_SIZE * 10, help="evaluations per mode")
+    add_map_argument(parser)
+    add_db_argument(parser)
+    args = parser.parse_args()
+    obstacles, start, goal, distance = resolve_map(args.map, OBS_COMPLEX, START_POSE, GOAL)
+
+    store = open_store(args.db)
+    with SharedMapPool(obstacles, [start], goal, MAX_STEPS, args.workers, distance, store=store, label="steadyStateGA") as pool:
+        gen_tl = run_generational(pool, args.budget)
+        ss_tl = run_steady_state(pool, args.budget)
+    if store is not None: store.close()
+    print_comparison(gen_tl, ss_tl)
\ No newline at end of file
@@ -0,0 +1,241 @@
+import math
+import time
+import random
+import argparse
+import multiprocessing as mp
+import numpy as np
+
+from trainFuzzyGA import random_genes, breed_population, OBS_COMPLEX, GOAL, START_POSE, MAX_STEPS, POP_SIZE
+
+try:
+    from sklearn.ensemble import RandomForestRegressor
+except ImportError:
+    RandomForestRegressor = None
+
+# ==========================================
+# 1. SURROGATE MODELS (gene vector -> fitness)
+# ==========================================
+MAX_HISTORY = 300  # GP fit is O(n^3), keep the most recent evaluations only
+
+
+def rank_correlation(a, b):
+    # Spearman's rho with average ranks for ties
+    def ranks(v):
+        v = np.asarray(v, dtype=float)
+        order = np.argsort(v, kind="mergesort")
+        r = np.empty(len(v))
+        r[order] = np.arange(len(v))
+        for val in np.unique(v):
+            mask = v == val
+            if mask.sum() > 1: r[mask] = r[mask].mean()
+        return r
+
+    if len(a) < 2: return 1.0
+    ra, rb = ranks(a), ranks(b)
+    if ra.std() == 0 or rb.std() == 0: return 0.0
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+class GaussianProcessSurrogate:
+    # NumPy-only GP regression with an RBF kernel; scores by mean + kappa*std
+    def __init__(self, kappa=0.5):
+        self.kappa = kappa
+
+    def fit(self, X, y):
+        X, y = np.asarray(X, float), np.asarray(y, float)
+        self.lo, self.span = X.min(axis=0), np.maximum(X.max(axis=0) - X.min(axis=0), 1e-9)
+        self.X = (X - self.lo) / self.span
+        self.y_mean, self.y_std = y.mean(), max(y.std(), 1e-9)
+        yn = (y - self.y_mean) / self.y_std
+
+        d2 = ((self.X[:, None, :] - self.X[None, :, :]) ** 2).sum(axis=2)
+        med = np.median(d2[d2 > 0]) if np.any(d2 > 0) else 1.0
+        self.gamma = 1.0 / med
+        K = np.exp(-self.gamma * d2) + 1e-2 * np.eye(len(self.X))
+        self.L = np.linalg.cholesky(K)
+        self.alpha = np.linalg.solve(self.L.T, np.linalg.solve(self.L, yn))
+
+    def predict(self, X):
+        Xn = (np.asarray(X, float) - self.lo) / self.span
+        k = np.exp(-self.gamma * ((Xn[:, None, :] - self.X[None, :, :]) ** 2).sum(axis=2))
+        mean = k @ self.alpha
+        v = np.linalg.solve(self.L, k.T)
+        std = np.sqrt(np.maximum(1.0 - (v ** 2).sum(axis=0), 0.0))
+        return (mean + self.kappa * std) * self.y_std + self.y_mean
+
+
+class KNNSurrogate:
+    # NumPy-only inverse-distance-weighted k nearest neighbours
+    def __init__(self, k=5):
+        self.k = k
+
+    def fit(self, X, y):
+        X = np.asarray(X, float)
+        self.lo, self.span = X.min(axis=0), np.maximum(X.max(axis=0) - X.min(axis=0), 1e-9)
+        self.X, self.y = (X - self.lo) / self.span, np.asarray(y, float)
+
+    def predict(self, X):
+        Xn = (np.asarray(X, float) - self.lo) / self.span
+        d = np.sqrt(((Xn[:, None, :] - self.X[None, :, :]) ** 2).sum(axis=2))
+        k = min(self.k, len(self.X))
+        idx = np.argsort(d, axis=1)[:, :k]
+        w = 1.0 / (np.take_along_axis(d, idx, axis=1) + 1e-6)
+        return (w * self.y[idx]).sum(axis=1) / w.sum(axis=1)
+
+
+class ForestSurrogate:
+    def __init__(self):
+        self.model = RandomForestRegressor(n_estimators=50, min_samples_leaf=2)
+
+    def fit(self, X, y):
+        self.model.fit(np.asarray(X, float), np.asarray(y, float))
+
+    def predict(self, X):
+        return self.model.predict(np.asarray(X, float))
+
+
+def make_surrogate(kind="gp"):
+    if kind == "gp": return GaussianProcessSurrogate()
+    if kind == "rf" and RandomForestRegressor is not None: return ForestSurrogate()
+    return KNNSurrogate()
+
+# ==========================================
+# 2. PRE-SCREENING
+# ==========================================
+class SurrogateScreen:
+    def __init__(self, model, keep_fraction=0.4, min_history=2 * POP_SIZE,
+                 revalidate_every=5, audit_size=6, min_rank_corr=0.3, min_checked=8):
+        self.model = model
+        self.keep_fraction = keep_fraction
+        self.min_history = min_history
+        self.revalidate_every = revalidate_every
+        self.audit_size = audit_size
+        self.min_rank_corr = min_rank_corr
+        self.min_checked = min_checked  # prediction/fitness pairs needed to judge the ranking
+
+        self.history_X, self.history_y = [], []
+        self.audit_pred, self.audit_true = [], []
+        self.disabled_until = 0
+        self.last_rank_corr = None
+
+    def record(self, genes, fitness, predicted=None):
+        self.history_X.append(list(genes))
+        self.history_y.append(fitness)
+        del self.history_X[:-MAX_HISTORY], self.history_y[:-MAX_HISTORY]
+        if predicted is not None:
+            self.audit_pred.append(predicted)
+            self.audit_true.append(fitness)
+
+    def active(self, generation):
+        return len(self.history_y) >= self.min_history and generation >= self.disabled_until
+
+    def screen(self, candidates, generation):
+        # Returns (indices to simulate, {index: predicted fitness} for the rest,
+        # {index: predicted fitness} for every simulated child: the kept ones,
+        # plus a few rejects audited every revalidate_every generations so the
+        # rank correlation also covers the low predictions)
+        n = len(candidates)
+        if n == 0 or not self.active(generation): return list(range(n)), {}, {}
+
+        self.model.fit(self.history_X, self.history_y)
+        pred = self.model.predict(candidates)
+        order = list(np.argsort(-pred))
+        keep = max(1, int(math.ceil(n * self.keep_fraction)))
+        simulate, rejected = order[:keep], order[keep:]
+
+        audit = {}
+        if generation % self.revalidate_every == 0 and rejected:
+            for i in random.sample(rejected, min(self.audit_size, len(rejected))):
+                audit[int(i)] = float(pred[i])
+        skipped = {int(i): float(pred[i]) for i in rejected if int(i) not in audit}
+        simulate = [int(i) for i in simulate] + list(audit)
+        checked = {i: float(pred[i]) for i in simulate}
+        return simulate, skipped, checked
+
+    def revalidate(self, generation):
+        # Compare checked predictions to true fitness; turn screening off for a
+        # while if the surrogate no longer ranks candidates well. Pairs pile up
+        # over generations until there are enough for a meaningful correlation.
+        if len(self.audit_true) < self.min_checked: return None
+        self.last_rank_corr = rank_correlation(self.audit_pred, self.audit_true)
+        if self.last_rank_corr < self.min_rank_corr:
+            self.disabled_until = generation + self.revalidate_every
+        self.audit_pred, self.audit_true = [], []
+        return self.last_rank_corr
+
+
+def plan_generation(next_gen, known, screen, generation):
+    # Split a freshly bred generation into individuals to simulate and ones
+    # already scored (elites and repeats, by their known fitness).
+    # Screened-out children are dropped: their predicted fitness is optimistic
+    # (mean + kappa*std for the GP) and must not win an elite slot.
+    prescored, children = [], []
+    for genes in next_gen:
+        key = tuple(genes)
+        if key in known: prescored.append((known[key], genes))
+        else: children.append(genes)
+
+    simulate_idx, _, checked = screen.screen(children, generation)
+    to_simulate = [children[i] for i in simulate_idx]
+    audit_preds = {tuple(children[i]): p for i, p in checked.items()}
+    return to_simulate, prescored, audit_preds
+
+# ==========================================
+# 3. HEADLESS SURROGATE-ASSISTED GA
+# ==========================================
+def run_ga(evaluate, generations, screen=None, pop_size=POP_SIZE):
+    # Returns per-generation (simulated episodes, best true fitness)
+    population = [random_genes() for _ in range(pop_size)]
+    known = {}
+    report = []
+    best = 0.0
+
+    for gen in range(1, generations + 1):
+        if screen is None: to_simulate, prescored, audit = population, [], {}
+        else: to_simulate, prescored, audit = plan_generation(population, known, screen, gen)
+
+        scores = evaluate(to_simulate, generation=gen)
+        scored = list(prescored)
+        for genes, fitness in zip(to_simulate, scores):
+            scored.append((fitness, genes))
+            known[tuple(genes)] = fitness
+            if screen is not None: screen.record(genes, fitness, audit.get(tuple(genes)))
+            best = max(best, fitness)
+        if screen is not None and audit: screen.revalidate(gen)
+
+        report.append((len(to_simulate), best))
+        population = breed_population(scored, pop_size)
+    return report
+
+
+if __name__ == "__main__":
+    from sharedMap import SharedMapPool
+    from mapFile import add_map_argument, resolve_map
+    from resultsStore import add_db_argument, open_store
+
+    parser = argparse.ArgumentParser(description="Compare plain and surrogate-assisted GA")
+    parser.add_argument("--workers", type=int, default=mp.cpu_count())
+    parser.add_argument("--generations", type=int, default=20)
+    parser.add_argument("--model", choices=["gp", "rf", "knn"], default="gp")
+    parser.add_argument("--keep", type=float, default=0.4, help="fraction of children simulated")
+    add_map_argument(parser)
+    add_db_argument(parser)
+    args = parser.parse_args()
+    obstacles, start, goal, distance = resolve_map(args.map, OBS_COMPLEX, START_POSE, GOAL)
+
+    store = open_store(args.db)
+    with SharedMapPool(obstacles, [start], goal, MAX_STEPS, args.workers, distance, store=store, label="surrogateGA") as pool:
+        t0 = time.perf_counter()
+        plain = run_ga(pool.evaluate, args.generations)
+        t1 = time.perf_counter()
+        screen = SurrogateScreen(make_surrogate(args.model), keep_fraction=args.keep)
+        assisted = run_ga(pool.evaluate, args.generations, screen)
+        t2 = time.perf_counter()
+    if store is not None: store.close()
+
+    for name, rep, dt in (("plain", plain, t1 - t0), ("surrogate", assisted, t2 - t1)):
+        sims = [n for n, _ in rep]
+        print(f"{name:<10} episodes/gen: first {sims[0]:>3}  mean {sum(sims) / len(sims):5.1f}  "
+              f"total {sum(sims):>4} | best {rep[-1][1]:8.1f} | {dt:.2f}s")
+    if screen.last_rank_corr is not None:
+        print(f"Last surrogate rank correlation: {screen.last_rank_corr:.2f}")
\ No newline at end of file
@@ -0,0 +1,146 @@
+import os
+import json
+import random
+import argparse
+
+from trainFuzzyGA import GENE_RANGES, POP_SIZE, random_genes
+from paramRegistry import BEST_PARAMS
+
+# ==========================================
+# WARM-START POPULATIONS
+# ==========================================
+# Instead of POP_SIZE random vectors, generation 1 is built from what earlier
+# training left behind:
+#   - best_params.json (the last saved best),
+#   - the top-k distinct genes in the results store (resultsStore.py), from
+#     any map, so a retrain after a map change starts near the old optimum,
+#   - Latin-hypercube samples in a small box around each of those seeds.
+# Fitness already stored for the same evaluation context (map, goal,
+# scenarios, step limit) is reused instead of simulating those genes again.
+# With no archive at all the population is random, as before.
+
+WARM_TOP_K = 5       # distinct genes taken from earlier runs
+WARM_SPREAD = 0.1    # half-width of the box around a seed, as a fraction of the gene's range
+
+
+def read_best_params(path=BEST_PARAMS):
+    if not os.path.exists(path): return None
+    try:
+        with open(path, "r") as f: data = json.load(f)
+        if isinstance(data, dict): data = [data["close_max"], data["med_min"], data["med_max"], data["far_min"]]
+        genes = [float(g) for g in data]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Ignoring unreadable {path}: {e}")
+        return None
+    return genes if len(genes) == len(GENE_RANGES) else None
+
+
+def latin_hypercube(n, dims, rng=random):
+    # n points in [0, 1)^dims with exactly one point in each of the n strata
+    # of every axis
+    columns = []
+    for _ in range(dims):
+        strata = list(range(n))
+        rng.shuffle(strata)
+        columns.append([(s + rng.random()) / n for s in strata])
+    return [list(p) for p in zip(*columns)]
+
+
+def seed_genes(store=None, path=BEST_PARAMS, top_k=WARM_TOP_K):
+    seeds, seen = [], set()
+    candidates = [read_best_params(path)]
+    if store is not None: candidates += [genes for _, genes, _ in store.best(top_k)]
+    for genes in candidates:
+        if genes is None or tuple(genes) in seen: continue
+        seen.add(tuple(genes))
+        seeds.append(list(genes))
+    return seeds
+
+
+def initial_population(pop_size=POP_SIZE, store=None, path=BEST_PARAMS, top_k=WARM_TOP_K, spread=WARM_SPREAD, rng=random):
+    seeds = seed_genes(store, path, top_k)[:max(1, pop_size // 2)]
+    if not seeds: return [random_genes() for _ in range(pop_size)]
+    population = [list(s) for s in seeds]
+    for i, u in enumerate(latin_hypercube(pop_size - len(population), len(GENE_RANGES), rng)):
+        seed = seeds[i % len(seeds)]
+        population.append([a + v * (b - a) for v, (a, b) in zip(u, sample_box(seed, spread))])
+    return population
+
+
+def sample_box(seed, spread=WARM_SPREAD):
+    # Per gene, the box around the seed intersected with GENE_RANGES (a seed
+    # outside a range collapses to that range's nearest bound)
+    box = []
+    for g, (lo, hi) in zip(seed, GENE_RANGES):
+        half = spread * (hi - lo)
+        a, b = max(lo, g - half), min(hi, g + half)
+        if a > b: a = b = min(max(g, lo), hi)
+        box.append((a, b))
+    return box
+
+
+def known_fitness(store, context, scenarios=1):
+    # {tuple(genes): mean fitness} already simulated under this context
+    if store is None or context is None: return {}
+    return {tuple(json.loads(key)): f for key, f in store.known(context, scenarios).items()}
+
+
+def split_known(population, known):
+    # (genes to simulate, [(fitness, genes)] already scored)
+    to_simulate, prescored = [], []
+    for genes in population:
+        if tuple(genes) in known: prescored.append((known[tuple(genes)], genes))
+        else: to_simulate.append(genes)
+    return to_simulate, prescored
+
+
+def compare(obstacles, start, goal, generations, workers, store, seeds=3):
+    # Cold (random) vs warm start on the same map: how many generations each
+    # needs to match what the cold start reaches in `generations`
+    from liveTrainer import TrainingRun
+    from sharedMap import SharedMapPool
+    from trainFuzzyGA import MAX_STEPS
+
+    curves = {"cold": [], "warm": []}
+    with SharedMapPool(obstacles, [start], goal, MAX_STEPS, workers) as pool:
+        for seed in range(seeds):
+            for mode in curves:
+                random.seed(seed)
+                population = initial_population(store=store) if mode == "warm" else None
+                run = TrainingRun(pool, obstacles, start, goal, generations, population=population, save=False)
+                while run.step(): pass
+                curves[mode].append(([best for best, _ in run.history], run.evals))
+    target = sum(c[-1] for c, _ in curves["cold"]) / seeds
+    print(f"target: {target:.1f} (mean best of the cold start after {generations} generations)")
+    for mode, runs in curves.items():
+        reached = [next((g + 1 for g, best in enumerate(c) if best >= target), None) for c, _ in runs]
+        print(f"  {mode}: best after gen 1 {sum(c[0] for c, _ in runs) / seeds:8.1f} | final "
+              f"{sum(c[-1] for c, _ in runs) / seeds:8.1f} | generations to target {reached} | "
+              f"{sum(e for _, e in runs) / seeds:.0f} episodes simulated per run")
+
+
+if __name__ == "__main__":
+    import multiprocessing as mp
+    from resultsStore import add_db_argument, open_store
+    from mapFile import add_map_argument, resolve_map
+    from trainFuzzyGA import OBS_COMPLEX, START_POSE, GOAL
+
+    parser = argparse.ArgumentParser(description="Show the warm-start population, or compare it with a random start")
+    parser.add_argument("--compare", action="store_true", help="train cold and warm on the map and compare convergence")
+    parser.add_argument("--generations", type=int, default=10)
+    parser.add_argument("--seeds", type=int, default=3, help="repetitions per start in --compare")
+    parser.add_argument("--workers", type=int, default=mp.cpu_count())
+    add_map_argument(parser)
+    add_db_argument(parser)
+    args = parser.parse_args()
+    obstacles, start, goal, _ = resolve_map(args.map, OBS_COMPLEX, START_POSE, GOAL)
+    store = open_store(args.db)
+
+    if args.compare:
+        compare(obstacles, start, goal, args.generations, args.workers, store, args.seeds)
+    else:
+        seeds = seed_genes(store)
+        print(f"{len(seeds)} seed(s) from {BEST_PARAMS}" + (f" and {args.db}" if store else ""))
+        for genes in initial_population(store=store):
+            print(("  seed " if genes in seeds else "  lhs  ") + str([round(g, 2) for g in genes]))
+    if store is not None: store.close()
\ No newline at end of file